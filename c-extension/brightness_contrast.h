@@ -5,6 +5,7 @@
 
 #include "definitions.h"
 #include "helper_func.h"
+#include "lookup_table.h"
 #include "math_func_eval.h"
 
 /**
@@ -35,25 +36,23 @@ static inline float enhance_contrast(float value, float factor)
 }
 
 /**
- * Enhance brightness and contrast of an image.
+ * Create the lookup table to enhance brightness and contrast of an image.
  *
- * @param data Image pixel data to update.
- * @param size Total size of the data.
+ * As brightness and contrast map each R/G/B value independently, all 256 possible
+ * values are computed once and the image is updated using the lookup table.
+ *
+ * @param lut Lookup table of LUT_SIZE values to fill.
  * @param brightness Factor to enhance brightness by.
  * @param contrast Factor to enhance contrast by.
  */
-static void enhance_bc_c(U_CHAR* data, const int size, float brightness, float contrast)
+static void brightness_contrast_lut_c(U_CHAR* lut, float brightness, float contrast)
 {
     float value;
 
-    for (int pixel = 0; pixel < size; pixel++) {
-        /* Skip alpha channel */
-        if (pixel % 4 != ALPHA_CHANNEL) {
-            value = ((float) data[pixel]) / 255.;
-            value = enhance_brightness(value, brightness);
-            value = enhance_contrast(value, contrast);
-            value = pixel_value(value);
-            data[pixel] = value;
-        }
+    for (int i = 0; i < LUT_SIZE; i++) {
+        value = ((float) i) / 255.;
+        value = enhance_brightness(value, brightness);
+        value = enhance_contrast(value, contrast);
+        lut[i] = pixel_value(value);
     }
 }
@@ -0,0 +1,33 @@
+/*******************************************************************************
+*                           C extension for vimiv
+* Functions to apply per-channel lookup tables to an image.
+*******************************************************************************/
+
+#ifndef lookup_table_h__
+#define lookup_table_h__
+
+#include "definitions.h"
+
+#define LUT_SIZE 256
+
+/**
+ * Map each R/G/B value of an image to the value given by a lookup table.
+ *
+ * The alpha channel is left untouched.
+ *
+ * @param data Image pixel data to update.
+ * @param size Total size of the data.
+ * @param lut Lookup table with one new value for each of the 256 possible values.
+ */
+static void apply_lut_c(U_CHAR* data, const int size, const U_CHAR* lut)
+{
+    int channels = 4; // RGBA channels
+
+    for (int pixel = 0; pixel < size; pixel += channels) {
+        data[pixel + R_CHANNEL] = lut[data[pixel + R_CHANNEL]];
+        data[pixel + G_CHANNEL] = lut[data[pixel + G_CHANNEL]];
+        data[pixel + B_CHANNEL] = lut[data[pixel + B_CHANNEL]];
+    }
+}
+
+#endif  // ifndef lookup_table_h__
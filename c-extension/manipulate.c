@@ -1,14 +1,18 @@
 /*******************************************************************************
 *                           C extension for vimiv
 * Simple add-on to manipulate brightness and contrast of an image on the pixel
-* scale.
+* scale. The functions operate in place on any writable buffer, e.g. a memoryview
+* of the QImage data, to avoid copying the pixel data. The GIL is released while
+* manipulating so multiple bands of the same image can be processed in parallel.
 *******************************************************************************/
 
+#define PY_SSIZE_T_CLEAN
 #include <Python.h>
 #include <stdio.h>
 
 #include "brightness_contrast.h"
 #include "hue_saturation_lightness.h"
+#include "lookup_table.h"
 
 /*****************************
 *  Generate python functions *
@@ -18,53 +22,84 @@ static PyObject *
 manipulate_bc(PyObject *self, PyObject *args)
 {
     /* Receive arguments from python */
-    PyObject *py_data;
+    Py_buffer view;
     float brightness;
     float contrast;
-    if (!PyArg_ParseTuple(args, "Off",
-                          &py_data, &brightness, &contrast))
+    if (!PyArg_ParseTuple(args, "w*ff",
+                          &view, &brightness, &contrast))
         return NULL;
 
-    /* Convert python bytes to U_CHAR* for pixel data */
-    if (!PyBytes_Check(py_data)) {
-        PyErr_SetString(PyExc_TypeError, "Expected bytes");
+    /* Enhance brightness and contrast in place without holding the GIL */
+    U_CHAR lut[LUT_SIZE];
+    Py_BEGIN_ALLOW_THREADS
+    brightness_contrast_lut_c(lut, brightness, contrast);
+    apply_lut_c((U_CHAR*) view.buf, (int) view.len, lut);
+    Py_END_ALLOW_THREADS
+
+    PyBuffer_Release(&view);
+    Py_RETURN_NONE;
+}
+
+static PyObject *
+manipulate_bc_lut(PyObject *self, PyObject *args)
+{
+    /* Receive arguments from python */
+    float brightness;
+    float contrast;
+    if (!PyArg_ParseTuple(args, "ff", &brightness, &contrast))
+        return NULL;
+
+    /* Create the lookup table and return it as python bytes */
+    U_CHAR lut[LUT_SIZE];
+    brightness_contrast_lut_c(lut, brightness, contrast);
+    return PyBytes_FromStringAndSize((char*) lut, LUT_SIZE);
+}
+
+static PyObject *
+manipulate_lut(PyObject *self, PyObject *args)
+{
+    /* Receive arguments from python */
+    Py_buffer view;
+    Py_buffer lut;
+    if (!PyArg_ParseTuple(args, "w*y*", &view, &lut))
+        return NULL;
+
+    if (lut.len != LUT_SIZE) {
+        PyBuffer_Release(&view);
+        PyBuffer_Release(&lut);
+        PyErr_Format(PyExc_ValueError, "Lookup table must have %d values", LUT_SIZE);
         return NULL;
     }
-    U_CHAR* data = (U_CHAR*) PyBytes_AsString(py_data);
-    const int size = PyBytes_Size(py_data);
 
-    /* Run the C function to enhance brightness and contrast */
-    enhance_bc_c(data, size, brightness, contrast);
+    /* Map the data in place without holding the GIL */
+    Py_BEGIN_ALLOW_THREADS
+    apply_lut_c((U_CHAR*) view.buf, (int) view.len, (U_CHAR*) lut.buf);
+    Py_END_ALLOW_THREADS
 
-    /* Return python bytes of updated data */
-    return PyBytes_FromStringAndSize((char*) data, size);
+    PyBuffer_Release(&view);
+    PyBuffer_Release(&lut);
+    Py_RETURN_NONE;
 }
 
 static PyObject *
 manipulate_hsl(PyObject *self, PyObject *args)
 {
     /* Receive arguments from python */
-    PyObject *py_data;
+    Py_buffer view;
     float hue;
     float saturation;
     float lightness;
-    if (!PyArg_ParseTuple(args, "Offf",
-                          &py_data, &hue, &saturation, &lightness))
+    if (!PyArg_ParseTuple(args, "w*fff",
+                          &view, &hue, &saturation, &lightness))
         return NULL;
 
-    /* Convert python bytes to U_CHAR* for pixel data */
-    if (!PyBytes_Check(py_data)) {
-        PyErr_SetString(PyExc_TypeError, "Expected bytes");
-        return NULL;
-    }
-    U_CHAR* data = (U_CHAR*) PyBytes_AsString(py_data);
-    const int size = PyBytes_Size(py_data);
-
-    /* Run the C function to enhance brightness and contrast */
-    enhance_hsl_c(data, size, hue, saturation, lightness);
+    /* Enhance hue, saturation and lightness in place without holding the GIL */
+    Py_BEGIN_ALLOW_THREADS
+    enhance_hsl_c((U_CHAR*) view.buf, (int) view.len, hue, saturation, lightness);
+    Py_END_ALLOW_THREADS
 
-    /* Return python bytes of updated data */
-    return PyBytes_FromStringAndSize((char*) data, size);
+    PyBuffer_Release(&view);
+    Py_RETURN_NONE;
 }
 
 /*****************************
@@ -73,6 +108,8 @@ manipulate_hsl(PyObject *self, PyObject *args)
 
 static PyMethodDef ManipulateMethods[] = {
     {"brightness_contrast", manipulate_bc, METH_VARARGS, "Manipulate brightness and contrast"},
+    {"brightness_contrast_lut", manipulate_bc_lut, METH_VARARGS, "Create lookup table for brightness and contrast"},
+    {"lut", manipulate_lut, METH_VARARGS, "Map R/G/B values using a lookup table"},
     {"hue_saturation_lightness", manipulate_hsl, METH_VARARGS, "Manipulate hue, saturation and lightness"},
     {NULL, NULL, 0, NULL}  /* Sentinel */
 };
@@ -71,6 +71,22 @@ Feature: Run search in different modes.
         # Matches: 12, 13, 14
         Then there should be 3 search matches
 
+    Scenario: Search using regular expressions
+        Given I open a directory with 15 paths
+        When I run set search.mode regex
+        And I search for 1[0-2]$
+        # Matches: 10, 11, 12
+        Then the library row should be 10
+        And there should be 3 search matches
+
+    Scenario: Fuzzy search selects the best match
+        Given I open a directory with 15 paths
+        When I run set search.mode fuzzy
+        And I search for d1
+        # Matches: 01, 10, 11, 12, 13, 14, 15 where _01 skips a character
+        Then the library row should be 10
+        And there should be 7 search matches
+
     Scenario: Reset search when working directory changed
         Given I open a directory with 5 paths
         When I search for 1
@@ -94,3 +110,17 @@ Feature: Run search in different modes.
         When I search for *
         And I press '<escape>'
         Then there should be 0 search matches
+
+    Scenario: Error on metadata search without value
+        Given I open a directory with 5 paths
+        When I run search --metadata Model
+        Then the message
+            'search: Metadata search must be of the form key=value'
+            should be displayed
+
+    Scenario: Error on metadata search for key that is not indexed
+        Given I open a directory with 5 paths
+        When I run search --metadata NotAKey=value
+        Then the message
+            'search: Metadata key 'NotAKey' is not indexed'
+            should be displayed
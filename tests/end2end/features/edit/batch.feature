@@ -0,0 +1,68 @@
+Feature: Process a batch of images.
+
+    Scenario: Apply transformations to marked images
+        Given I open 3 images
+        When I run mark image_02.jpg image_03.jpg
+        And I run rescale 0.5
+        And I run apply-to-marked
+        And I wait for the images to be processed
+        Then the image image_02.jpg should have the size 150x150
+        And the image image_03.jpg should have the size 150x150
+
+    Scenario: Apply rotation to marked images
+        Given I open any image of size 300x200
+        When I run mark %
+        And I run rotate
+        And I run apply-to-marked
+        And I wait for the images to be processed
+        Then the image image.jpg should have the size 200x300
+
+    Scenario: Error applying edits without marked images
+        Given I open any image
+        When I run rotate
+        And I run apply-to-marked
+        Then the message
+            'apply-to-marked: No marked images'
+            should be displayed
+
+    Scenario: Error applying edits without any edits
+        Given I open any image
+        When I run mark %
+        And I run apply-to-marked
+        Then the message
+            'apply-to-marked: No edits to apply'
+            should be displayed
+
+    Scenario: Export scaled copies of all images
+        Given I open 2 images
+        When I run export --size=100 --format=png exported
+        And I wait for the images to be processed
+        Then the image exported/image_01.png should have the size 100x100
+        And the image exported/image_02.png should have the size 100x100
+
+    Scenario: Export only marked images
+        Given I open 3 images
+        When I run mark image_02.jpg
+        And I run export exported
+        And I wait for the images to be processed
+        Then the file exported/image_02.jpg should exist
+        And the file exported/image_01.jpg should not exist
+
+    Scenario: Do not scale up small images on export
+        Given I open any image of size 300x200
+        When I run export --size=1000 exported
+        And I wait for the images to be processed
+        Then the image exported/image.jpg should have the size 300x200
+
+    Scenario: Do not overwrite the original images on export
+        Given I open any image
+        When I run export .
+        And I wait for the images to be processed
+        Then 1 image should have failed to process
+
+    Scenario: Error exporting to unsupported format
+        Given I open any image
+        When I run export --format=abc exported
+        Then the message
+            'export: Unsupported image format 'abc''
+            should be displayed
@@ -46,6 +46,17 @@ Feature: Manipulate an image.
         And I run next-tab
         Then the current manipulation should be hue
 
+    Scenario: Refine manipulate preview
+        When I enter manipulate mode
+        And I apply any manipulation
+        Then the manipulate preview should be refined
+
+    Scenario: Do not refine manipulate preview after leaving manipulate
+        When I enter manipulate mode
+        And I apply any manipulation
+        And I run discard
+        Then the manipulate preview should not be refined
+
     Scenario: Store manipulation change
         When I enter manipulate mode
         And I apply any manipulation
@@ -70,7 +81,49 @@ Feature: Manipulate an image.
         When I enter manipulate mode
         And I apply any manipulation
         And I run accept
+        And I wait for the manipulations to be accepted
         Then there should be 0 stored changes
+        And the mode should be image
+
+    Scenario: Accept stored manipulation changes
+        When I enter manipulate mode
+        And I apply any manipulation
+        And I run next-tab
+        And I run accept
+        And I wait for the manipulations to be accepted
+        Then the mode should be image
+
+    Scenario: Cancel accepting manipulations
+        When I enter manipulate mode
+        And I apply any manipulation
+        And I run accept
+        And I run discard
+        And I wait for the manipulations to be accepted
+        Then the mode should be manipulate
+        And there should be 1 stored changes
+
+    Scenario: Redo accepted manipulations without snapshot in the background
+        When I run set image.undo_memory 0
+        And I enter manipulate mode
+        And I apply any manipulation
+        And I run accept
+        And I wait for the manipulations to be accepted
+        And I run undo
+        And I run redo
+        And I wait for the edits to be replayed
+        Then the image should be manipulated
+
+    Scenario: Undo manipulations while redoing them
+        When I run set image.undo_memory 0
+        And I enter manipulate mode
+        And I apply any manipulation
+        And I run accept
+        And I wait for the manipulations to be accepted
+        And I run undo
+        And I run redo
+        And I run undo
+        And I wait for the edits to be replayed
+        Then the image should not be manipulated
 
     Scenario: Do not allow entering manipulate when read_only is active
         When I run set read_only true
@@ -28,6 +28,16 @@ Feature: Straighten an image.
         Then there should be 0 straighten widgets
         And the image size should not be 300x200
 
+    Scenario: Undo and redo accepted straightening
+        When I run straighten
+        And I straighten by 1 degree
+        And I press '<return>' in the straighten widget
+        Then there should be 0 straighten widgets
+        When I run undo
+        Then the image size should be 300x200
+        When I run redo
+        Then the image size should not be 300x200
+
     Scenario: Straighten image using keybindings
         When I run straighten
         And I press 'l' in the straighten widget
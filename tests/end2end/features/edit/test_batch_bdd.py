@@ -0,0 +1,28 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+import pytest_bdd as bdd
+
+from vimiv.qt.gui import QImageReader
+
+from vimiv.imutils import batch
+
+
+bdd.scenarios("batch.feature")
+
+
+@bdd.when("I wait for the images to be processed")
+def wait_for_batch(qtbot):
+    batch.BatchProcessor.pool.waitForDone()
+    qtbot.waitUntil(lambda: not batch.BatchProcessor.instance.running)
+
+
+@bdd.then(bdd.parsers.parse("the image {name} should have the size {size}"))
+def check_image_size(name, size):
+    image_size = QImageReader(name).size()
+    assert f"{image_size.width()}x{image_size.height()}" == size
+
+
+@bdd.then(bdd.parsers.parse("{number:d} image should have failed to process"))
+@bdd.then(bdd.parsers.parse("{number:d} images should have failed to process"))
+def check_failed(number):
+    assert batch.BatchProcessor.instance._failed == number
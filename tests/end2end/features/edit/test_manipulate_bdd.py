@@ -3,6 +3,7 @@
 import pytest
 import pytest_bdd as bdd
 
+import vimiv.imutils.edit_handler
 import vimiv.imutils.immanipulate
 
 bdd.scenarios("manipulate.feature", "manipulate_segfault.feature")
@@ -24,6 +25,29 @@ def apply_any_manipulation(manipulator, qtbot):
         manipulator.goto(10)
 
 
+@bdd.when("I wait for the manipulations to be accepted")
+def wait_for_accept(manipulator, qtbot):
+    qtbot.waitUntil(lambda: manipulator._progress is None)
+    manipulator.pool.waitForDone()
+
+
+@bdd.when("I wait for the edits to be replayed")
+def wait_for_replay(manipulator, qtbot):
+    edit_handler = vimiv.imutils.edit_handler.EditHandler.instance
+    qtbot.waitUntil(lambda: edit_handler._replaying is None)
+    manipulator.pool.waitForDone()
+
+
+@bdd.then("the image should be manipulated")
+def check_manipulated():
+    assert vimiv.imutils.edit_handler.EditHandler.instance._manipulated
+
+
+@bdd.then("the image should not be manipulated")
+def check_not_manipulated():
+    assert not vimiv.imutils.edit_handler.EditHandler.instance._manipulated
+
+
 @bdd.then(bdd.parsers.parse("The current value should be {value:d}"))
 def check_current_manipulation_value(manipulation, value):
     assert manipulation.value == value  # Actual value
@@ -37,3 +61,17 @@ def check_current_manipulation_name(manipulation, name):
 @bdd.then(bdd.parsers.parse("There should be {n_changes:d} stored changes"))
 def check_stored_changes(manipulator, n_changes):
     assert len(manipulator._changes) == n_changes
+
+
+@bdd.then("the manipulate preview should be refined")
+def check_preview_refined(manipulator, qtbot):
+    def refined(pixmap):
+        return pixmap.size() == manipulator._image.size()
+
+    with qtbot.waitSignal(manipulator.updated, check_params_cb=refined):
+        pass
+
+
+@bdd.then("the manipulate preview should not be refined")
+def check_preview_not_refined(manipulator):
+    assert not manipulator._refine_timer.isActive()
@@ -21,6 +21,19 @@ Feature: Transform an image.
         When I run 3rotate --counter-clockwise
         Then the orientation should be landscape
 
+    Scenario: Rotate image four times
+        Given I open any image of size 300x200
+        When I run 4rotate --counter-clockwise
+        Then the orientation should be landscape
+        And the image should not be edited
+
+    Scenario: Rotate and flip image
+        Given I open any image of size 300x200
+        When I run rotate
+        And I run flip
+        Then the orientation should be portrait
+        And the image size should be 200x300
+
     Scenario: Rescale image
         Given I open any image of size 300x200
         When I run rescale 2
@@ -47,6 +60,27 @@ Feature: Transform an image.
         And I run undo-transformations
         Then the image size should be 300x200
 
+    Scenario: Undo the last transformation
+        Given I open any image of size 300x200
+        When I run resize 150
+        And I run rotate
+        And I run undo
+        Then the image size should be 150x100
+
+    Scenario: Redo the undone transformation
+        Given I open any image of size 300x200
+        When I run rotate
+        And I run undo
+        And I run redo
+        Then the orientation should be portrait
+
+    Scenario: Undo all transformations
+        Given I open any image of size 300x200
+        When I run resize 150
+        And I run 2undo
+        Then the image size should be 300x200
+        And the image should not be edited
+
     Scenario: Do not allow transforming when read_only is active
         Given I open any image of size 300x200
         When I run set read_only true
@@ -9,5 +9,8 @@ bdd.scenarios("imagetitle.feature")
 
 
 @bdd.then("the image name should be in the window title")
-def image_name_in_title(mainwindow):
-    assert filelist.basename() in mainwindow.windowTitle()
+def image_name_in_title(qtbot, mainwindow):
+    def check():
+        assert filelist.basename() in mainwindow.windowTitle()
+
+    qtbot.waitUntil(check, timeout=100)
@@ -29,10 +29,17 @@ def check_metadata_widget_not_visible(metadatawidget):
 
 
 @bdd.then(bdd.parsers.parse("the metadata text should contain '{text}'"))
-def check_text_in_metadata(metadatawidget, text):
-    assert text in metadatawidget.text()
+def check_text_in_metadata(qtbot, metadatawidget, text):
+    def check():
+        assert text in metadatawidget.text()
+
+    qtbot.waitUntil(check, timeout=1000)
 
 
 @bdd.then(bdd.parsers.parse("the metadata text should not contain '{text}'"))
-def check_text_not_in_metadata(metadatawidget, text):
+def check_text_not_in_metadata(qtbot, metadatawidget, text):
+    def check():
+        assert metadatawidget.text() != "Reading metadata..."
+
+    qtbot.waitUntil(check, timeout=1000)
     assert text not in metadatawidget.text()
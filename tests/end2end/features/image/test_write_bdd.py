@@ -2,6 +2,8 @@
 
 import pytest_bdd as bdd
 
+from vimiv.qt.gui import QImageReader
+
 try:
     import piexif
 except ImportError:
@@ -21,6 +23,27 @@ def write_image(handler, name):
     )
 
 
+@bdd.when(bdd.parsers.parse("I write the edited image to {name}"))
+def write_edited_image(handler, name):
+    handler._write_current(name, original_path=handler._path, parallel=False)
+
+
+@bdd.then(
+    bdd.parsers.parse("the image {name} should have the exif orientation {value:d}")
+)
+def check_exif_orientation(name, value):
+    exif_dict = piexif.load(name)
+    assert exif_dict["0th"][piexif.ImageIFD.Orientation] == value
+
+
+@bdd.then(bdd.parsers.parse("the image {name} should be displayed with size {size}"))
+def check_displayed_size(name, size):
+    reader = QImageReader(name)
+    reader.setAutoTransform(True)
+    image = reader.read()
+    assert f"{image.width()}x{image.height()}" == size
+
+
 @bdd.then(bdd.parsers.parse("the image {name} should contain exif information"))
 def check_exif_information(exif_content, name):
     exif_dict = piexif.load(name)
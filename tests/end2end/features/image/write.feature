@@ -18,6 +18,31 @@ Feature: Write an image to disk
         And I write the image to new_path.jpg
         Then the image new_path.jpg should contain exif information
 
+    @metadata
+    Scenario: Write rotated image updating only the exif orientation
+        Given I open any image of size 300x200
+        When I add exif information
+        And I run rotate
+        And I write the edited image to new_path.jpg
+        Then the image new_path.jpg should have the exif orientation 6
+        And the image new_path.jpg should be displayed with size 200x300
+
+    @metadata
+    Scenario: Write rotated and flipped image updating only the exif orientation
+        Given I open any image of size 300x200
+        When I add exif information
+        And I run rotate
+        And I run flip
+        And I write the edited image to new_path.jpg
+        Then the image new_path.jpg should have the exif orientation 5
+        And the image new_path.jpg should be displayed with size 200x300
+
+    Scenario: Write rotated image to different format
+        Given I open any image of size 300x200
+        When I run rotate
+        And I write the edited image to new_path.png
+        Then the image new_path.png should be displayed with size 200x300
+
     Scenario: Prompt for writing edited image
         Given I open any image
         When I run rotate
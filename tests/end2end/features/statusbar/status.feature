@@ -22,6 +22,14 @@ Feature: Display status information in the statusbar
         # No current path selected
         Then the left status should include N/A
 
+    Scenario: Update filesize when selecting another path
+        Given I open a directory with 2 paths
+        When I create the directory 'child_02/child'
+        And I run set statusbar.left {filesize}
+        Then the left status should include 0
+        When I run scroll down
+        Then the left status should include 1
+
     Scenario: Do not crash when showing filesize in command moe
         Given I start vimiv
         When I run set statusbar.left {filesize}
@@ -7,5 +7,5 @@ bdd.scenarios("status.feature")
 
 
 @bdd.then("the image should have mouse tracking")
-def check_image_tracks_mouse(image):
-    assert image.hasMouseTracking()
+def check_image_tracks_mouse(qtbot, image):
+    qtbot.waitUntil(image.hasMouseTracking, timeout=100)
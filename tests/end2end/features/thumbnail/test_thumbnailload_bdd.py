@@ -0,0 +1,32 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+import pytest_bdd as bdd
+
+from vimiv.gui.thumbnail import ThumbnailItem
+
+
+bdd.scenarios("thumbnailload.feature")
+
+
+@bdd.given("I wait for the thumbnails to be created")
+@bdd.when("I wait for the thumbnails to be created")
+def wait_for_thumbnails(qtbot, thumbnail):
+    qtbot.waitUntil(lambda: not thumbnail._pending, timeout=5000)
+
+
+@bdd.then("no thumbnails should be pending")
+def check_no_thumbnails_pending(thumbnail):
+    assert not thumbnail._pending
+
+
+@bdd.then("all thumbnails should be created")
+def check_thumbnails_created(thumbnail):
+    default = ThumbnailItem.default_image().cacheKey()
+    assert sorted(thumbnail._created) == sorted(thumbnail.pathlist())
+    assert all(item.image.cacheKey() != default for item in thumbnail)
+
+
+@bdd.then("no thumbnail should show the default image")
+def check_no_default_thumbnails(thumbnail):
+    default = ThumbnailItem.default_image().cacheKey()
+    assert all(item.image.cacheKey() != default for item in thumbnail)
@@ -14,3 +14,8 @@ def check_thumbnail_size(thumbnail, size):
     assert api.settings.thumbnail.size.value == size
     # Check actual value
     assert thumbnail.iconSize().width() == size
+
+
+@bdd.then(bdd.parsers.parse("the thumbnails should be created in size {size:d}"))
+def check_thumbnail_creation_size(thumbnail, size):
+    assert thumbnail._manager.size == size
@@ -0,0 +1,32 @@
+Feature: Load thumbnails.
+
+    Background:
+        Given I open 5 images
+        And I enter thumbnail mode
+        And I wait for the thumbnails to be created
+
+    Scenario: Re-use thumbnails when reversing the image order
+        When I run set sort.reverse!
+        Then no thumbnails should be pending
+        And all thumbnails should be created
+
+    Scenario: Re-use thumbnails when shuffling the images
+        When I run set sort.shuffle!
+        Then no thumbnails should be pending
+        And all thumbnails should be created
+
+    Scenario: Only create thumbnails of new images
+        When I run delete image_04.jpg
+        And I wait for the working directory handler
+        And I run undelete image_04.jpg
+        And I wait for the working directory handler
+        And I wait for the thumbnails to be created
+        Then there should be 5 thumbnails
+        And all thumbnails should be created
+
+    Scenario: Keep thumbnails that are re-created in a larger size when reordering
+        When I run zoom in
+        And I run set sort.reverse!
+        Then no thumbnail should show the default image
+        When I wait for the thumbnails to be created
+        Then all thumbnails should be created
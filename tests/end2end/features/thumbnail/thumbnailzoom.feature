@@ -27,3 +27,14 @@ Feature: Zoom thumbnails.
         # 64
         And I run zoom out
         Then the thumbnail size should be 64
+
+    Scenario: Create larger thumbnails when zooming beyond their size.
+        When I run zoom in
+        And I run zoom in
+        Then the thumbnails should be created in size 512
+
+    Scenario: Keep larger thumbnails when zooming out.
+        When I run zoom in
+        And I run zoom in
+        And I run zoom out
+        Then the thumbnails should be created in size 512
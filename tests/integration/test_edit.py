@@ -4,10 +4,12 @@
 
 import pytest
 
+from vimiv.qt.core import QRect, QSize
 from vimiv.qt.gui import QPixmap, QColor
 
+from vimiv import api
 from vimiv.config import styles
-from vimiv.imutils import edit_handler
+from vimiv.imutils import edit_handler, imtransform
 
 
 WIDTH = 300
@@ -49,19 +51,137 @@ def test_transform_applied(edit, transform):
     assert edit.pixmap.height() == WIDTH
 
 
-def test_manipulate_applied(edit, manipulate):
+def accept(manipulate, qtbot):
+    with qtbot.waitSignal(manipulate.accepted):
+        manipulate.accept()
+
+
+def test_manipulate_applied(qtbot, edit, manipulate):
+    manipulate.increase(10)
+    accept(manipulate, qtbot)
+    assert current_color(edit.pixmap) != COLOR
+
+
+def test_manipulate_stored_changes_applied(qtbot, edit, manipulate):
     manipulate.increase(10)
-    manipulate.accept()
+    manipulate.focus_group_index(1)
+    accept(manipulate, qtbot)
     assert current_color(edit.pixmap) != COLOR
 
 
-def test_manipulate_and_transform_iteratively(edit, transform, manipulate):
+def test_manipulate_and_transform_iteratively(qtbot, edit, transform, manipulate):
     transform.rotate_command()
     manipulate.increase(10)
-    manipulate.accept()
+    accept(manipulate, qtbot)
     assert edit.pixmap.width() == HEIGHT
     assert edit.pixmap.height() == WIDTH
     assert current_color(edit.pixmap) != COLOR
     transform.rotate_command()
     assert edit.pixmap.height() == HEIGHT
     assert edit.pixmap.width() == WIDTH
+
+
+def test_undo_and_redo_transform(edit, transform):
+    transform.rotate_command()
+    edit.undo()
+    assert edit.pixmap.width() == WIDTH
+    assert not edit.changed
+    edit.redo()
+    assert edit.pixmap.width() == HEIGHT
+    assert edit.changed
+
+
+def crop(transform, rect, qtbot):
+    with qtbot.waitSignal(transform.processed):
+        transform.crop(rect)
+
+
+def test_crop_applied_in_background(qtbot, edit, transform):
+    crop(transform, QRect(0, 0, 100, 50), qtbot)
+    assert edit.pixmap.size() == QSize(100, 50)
+    assert not transform.processing
+
+
+def test_crop_cancelled(qtbot, edit, transform):
+    transform.crop(QRect(0, 0, 100, 50))
+    transform.cancel()
+    transform.pool.waitForDone()
+    qtbot.wait(10)  # Process the queued result
+    assert edit.pixmap.size() == QSize(WIDTH, HEIGHT)
+
+
+def test_straighten_previewed_on_proxy(mocker, qtbot, edit, transform):
+    screen = mocker.patch.object(imtransform.QApplication, "primaryScreen")
+    screen.return_value.geometry.return_value = QRect(0, 0, 150, 100)
+    with qtbot.waitSignal(transform.previewed) as blocker:
+        transform.straighten(angle=5, original_size=QSize(WIDTH, HEIGHT))
+    preview, scale = blocker.args
+    assert preview.width() < 150
+    assert scale.mapRect(preview.rect()).size() == transform._straightened.size()
+    assert edit.pixmap.size() == QSize(WIDTH, HEIGHT)  # Only previewed
+
+
+def test_accept_straighten(qtbot, edit, transform):
+    transform.straighten(angle=5, original_size=QSize(WIDTH, HEIGHT))
+    rect = transform._straightened
+    with qtbot.waitSignal(transform.processed):
+        transform.accept_straighten()
+    assert edit.pixmap.size() == rect.size()
+
+
+def test_undo_crop(qtbot, edit, transform):
+    crop(transform, QRect(0, 0, 100, 50), qtbot)
+    transform.rotate_command()
+    edit.undo()
+    assert edit.pixmap.size() == QSize(100, 50)
+    edit.undo()
+    assert edit.pixmap.size() == QSize(WIDTH, HEIGHT)
+
+
+def test_undo_manipulate(qtbot, edit, transform, manipulate):
+    manipulate.increase(10)
+    accept(manipulate, qtbot)
+    edit.undo()
+    assert current_color(edit.pixmap) == COLOR
+    assert not edit.changed
+    edit.redo()
+    assert current_color(edit.pixmap) != COLOR
+    assert edit.changed
+
+
+def test_redo_manipulate_without_snapshot(monkeypatch, qtbot, edit, manipulate):
+    monkeypatch.setattr(api.settings.image.undo_memory, "value", 0)
+    manipulate.increase(10)
+    accept(manipulate, qtbot)
+    manipulated = current_color(edit.pixmap)
+    edit.undo()
+    edit.redo()
+    assert current_color(edit.pixmap) == COLOR  # Replayed in the background
+    qtbot.waitUntil(lambda: edit._replaying is None)
+    assert current_color(edit.pixmap) == manipulated
+
+
+def test_undo_cancels_redo_in_background(monkeypatch, qtbot, edit, manipulate):
+    monkeypatch.setattr(api.settings.image.undo_memory, "value", 0)
+    manipulate.increase(10)
+    accept(manipulate, qtbot)
+    edit.undo()
+    edit.redo()
+    edit.undo()
+    manipulate.pool.waitForDone()
+    qtbot.wait(10)
+    assert current_color(edit.pixmap) == COLOR
+    assert not edit.changed
+
+
+def test_new_edit_discards_redo(edit, transform):
+    transform.rotate_command()
+    edit.undo()
+    transform.flip()
+    with pytest.raises(api.commands.CommandError, match="Nothing to redo"):
+        edit.redo()
+
+
+def test_nothing_to_undo(edit):
+    with pytest.raises(api.commands.CommandError, match="Nothing to undo"):
+        edit.undo()
@@ -111,6 +111,19 @@ def test_step_thumbnail_size(start, up, expected):
     assert t.value == expected
 
 
+@pytest.mark.parametrize("value", ("glob", "regex", "fuzzy"))
+def test_set_search_mode_setting(value):
+    s = settings.SearchModeSetting("search", "glob")
+    s.value = value
+    assert s.value == value
+
+
+def test_fail_set_search_mode_setting():
+    s = settings.SearchModeSetting("search", "glob")
+    with pytest.raises(ValueError, match="must be one of"):
+        s.value = "any"
+
+
 def test_set_str_setting():
     s = settings.StrSetting("string", "default")
     s.value = "new"
@@ -4,6 +4,8 @@
 
 import pytest
 
+from vimiv.qt.core import QObject, Signal
+
 from vimiv.api import status
 
 
@@ -39,3 +41,74 @@ def test_fail_add_status_module():
 def test_evaluate_unknown_module():
     name = "{unknown-module}"
     assert status.evaluate(f"Dummy: {name}") == "Dummy: "
+
+
+class Invalidator(QObject):
+    """QObject with a signal to invalidate status modules."""
+
+    signal = Signal()
+
+
+@pytest.fixture()
+def counting_module():
+    """Fixture to create a status module counting its evaluations."""
+    name = "{counting}"
+    invalidator = Invalidator()
+    calls = []
+
+    @status.module(name, invalidated_by=[invalidator.signal])
+    def counting_method():
+        calls.append(name)
+        return str(len(calls))
+
+    yield name, invalidator.signal, calls
+
+    del status._modules[name]
+
+
+def test_memoize_status_module(counting_module):
+    name, _, calls = counting_module
+    assert status.evaluate(name) == "1"
+    assert status.evaluate(f"Again: {name}") == "Again: 1"
+    assert len(calls) == 1
+
+
+def test_invalidate_status_module(counting_module):
+    name, signal, calls = counting_module
+    status.evaluate(name)
+    signal.emit()
+    assert status.evaluate(name) == "2"
+    assert len(calls) == 2
+
+
+def test_evaluate_volatile_status_module(dummy_module):
+    name, content = dummy_module
+    status.evaluate(name)
+    assert status.evaluate(f"{name}{name}") == content * 2
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("", (("", ""),)),
+        ("text", (("text", ""),)),
+        ("{a} b{c}", (("", "{a}"), (" b", "{c}"), ("", ""))),
+    ],
+)
+def test_compile_status_text(text, expected):
+    assert status._compile(text) == expected
+
+
+def test_collapse_status_updates(qtbot):
+    updates = []
+
+    def count_update():
+        updates.append(True)
+
+    status.signals.update.connect(count_update)
+    with qtbot.waitSignal(status.signals.update):
+        for i in range(3):
+            status.update(f"reason {i}")
+    qtbot.wait(10)
+    status.signals.update.disconnect(count_update)
+    assert len(updates) == 1
@@ -2,22 +2,117 @@
 
 """Tests for vimiv.commands.search"""
 
+import pytest
+
 from vimiv.commands import search
 
 
+@pytest.fixture
+def index():
+    paths = ["/dir/image_01.jpg", "/dir/IMAGE_02.jpg", "/dir/other_1.png", "/dir/a[1]"]
+    yield search.BasenameIndex(paths)
+
+
 def test_clear_search():
     search.search._text = "Something"
     search.search.clear()
     assert search.search._text == ""
 
 
-def test_sort_for_search():
-    testlist = [1, 2, 3]
-    updated_list = search._sort_for_search(testlist, 1, False)
-    assert updated_list == [2, 3, 1]
+def test_order_for_search():
+    updated_list = search._order_for_search([0, 1, 2], 1, False)
+    assert updated_list == [1, 2, 0]
+
+
+def test_order_for_search_reverse():
+    updated_list = search._order_for_search([0, 1, 2], 1, True)
+    assert updated_list == [1, 0, 2]
+
+
+def test_order_for_search_skips_non_matching_current():
+    assert search._order_for_search([0, 4, 7], 5, False) == [7, 0, 4]
+    assert search._order_for_search([0, 4, 7], 5, True) == [4, 0, 7]
+
+
+@pytest.mark.parametrize(
+    "text, ignore_case, expected",
+    [
+        ("image", False, [0]),
+        ("image", True, [0, 1]),
+        ("1", False, [0, 2, 3]),
+        ("_0?.jpg", True, [0, 1]),
+        ("1*png", False, [2]),
+        ("_[!0]", False, [2]),
+        ("[1]", False, [0, 2, 3]),
+        ("a[", False, [3]),
+        ("*", False, [0, 1, 2, 3]),
+    ],
+)
+def test_index_glob_matches(index, text, ignore_case, expected):
+    pattern = search.compile_pattern(text, "glob", ignore_case)
+    assert index.glob_matches(pattern, ignore_case) == expected
+
+
+def test_index_matches_across_chunks(mocker):
+    mocker.patch.object(search.BasenameIndex, "CHUNK_SIZE", 2)
+    index = search.BasenameIndex([f"image_{i}" for i in range(7)])
+    pattern = search.compile_pattern("[135]", "glob", False)
+    assert index.glob_matches(pattern, False) == [1, 3, 5]
+    pattern = search.compile_pattern("[135]", "regex", False)
+    assert index.regex_matches(pattern) == [1, 3, 5]
+
+
+def test_index_matches_cancelled(index):
+    pattern = search.compile_pattern("image", "glob", False)
+    with pytest.raises(search.SearchCancelled):
+        index.glob_matches(pattern, False, cancelled=lambda: True)
+
+
+@pytest.mark.parametrize(
+    "text, ignore_case, expected",
+    [
+        (r"^image_\d", False, [0]),
+        (r"^image_\d", True, [0, 1]),
+        (r"1\]?$", False, [3]),
+        (r"jpg|png", False, [0, 1, 2]),
+    ],
+)
+def test_index_regex_matches(index, text, ignore_case, expected):
+    pattern = search.compile_pattern(text, "regex", ignore_case)
+    assert index.regex_matches(pattern) == expected
+
+
+def test_index_fuzzy_matches_ranked():
+    index = search.BasenameIndex(["IMG_1x2345.CR2", "IMG_2345.CR2", "IMG_12345.CR2"])
+    pattern = search.compile_pattern("img2345", "fuzzy", True)
+    costs = index.fuzzy_matches(pattern, True)
+    assert sorted(costs, key=costs.__getitem__) == [1, 2, 0]
+
+
+def test_index_fuzzy_matches_no_match(index):
+    pattern = search.compile_pattern("xyz", "fuzzy", False)
+    assert not index.fuzzy_matches(pattern, False)
+
+
+def test_index_fuzzy_matches_every_basename_once(mocker):
+    mocker.patch.object(search.BasenameIndex, "CHUNK_SIZE", 2)
+    index = search.BasenameIndex(["abab", "xab", "ba", "ab"])
+    pattern = search.compile_pattern("ab", "fuzzy", False)
+    costs = index.fuzzy_matches(pattern, False)
+    assert costs == {0: (2, 0, 4), 1: (2, 1, 3), 3: (2, 0, 2)}
+
+
+def test_index_fuzzy_matches_tightest_span():
+    index = search.BasenameIndex(["aXXXXab", "aXXb", "AbXaXb"])
+    pattern = search.compile_pattern("ab", "fuzzy", True)
+    costs = index.fuzzy_matches(pattern, True)
+    assert costs == {0: (2, 5, 7), 1: (4, 0, 4), 2: (2, 0, 6)}
+    assert sorted(costs, key=costs.__getitem__) == [2, 0, 1]
+
+
+def test_index_position(index):
+    assert index.position("/dir/other_1.png") == 2
 
 
-def test_sort_for_search_reverse():
-    testlist = [1, 2, 3]
-    updated_list = search._sort_for_search(testlist, 1, True)
-    assert updated_list == [2, 1, 3]
+def test_index_position_of_unknown_path(index):
+    assert index.position("/dir/unknown.jpg") == 0
@@ -5,22 +5,73 @@
 import pytest
 
 from vimiv.qt.core import QSize
-from vimiv.qt.gui import QIcon
+from vimiv.qt.gui import QImage
 
-from vimiv.gui.thumbnail import ThumbnailItem
+from vimiv.gui.thumbnail import ThumbnailItem, PixmapCache
 
 
 @pytest.fixture()
 def item(mocker):
     """Fixture to retrieve a vanilla ThumbnailItem."""
-    ThumbnailItem._default_icon = None
-    mocker.patch.object(ThumbnailItem, "create_default_icon", return_value=QIcon())
+    ThumbnailItem._default_image = None
+    mocker.patch.object(ThumbnailItem, "create_default_image", return_value=QImage())
     yield ThumbnailItem
 
 
+@pytest.fixture()
+def cache(qapp, mocker):
+    """Fixture to retrieve a pixmap cache that fits two 16x16 pixmaps."""
+    mocker.patch.object(PixmapCache, "MAXBYTES", 2 * 16 * 16 * 4)
+    yield PixmapCache()
+
+
+def create_image(size=16):
+    image = QImage(size, size, QImage.Format.Format_ARGB32)
+    image.fill(0)
+    return image
+
+
 def test_create_default_pixmap_once(item):
-    """Ensure the default thumbnail icon is only created once."""
+    """Ensure the default thumbnail image is only created once."""
     size_hint = QSize(128, 128)
     for index in range(5):
         item(None, index, size_hint=size_hint)
-    item.create_default_icon.assert_called_once()
+    item.create_default_image.assert_called_once()
+
+
+SIZE = QSize(16, 16)
+
+
+def test_pixmap_cache_converts_once(cache):
+    image = create_image()
+    pixmap = cache.get(image, SIZE)
+    assert pixmap.size() == image.size()
+    assert cache.get(image, SIZE).cacheKey() == pixmap.cacheKey()
+
+
+@pytest.mark.parametrize("ratio", (1.0, 2.0))
+def test_pixmap_cache_scales_to_size(cache, ratio):
+    image = QImage(64, 32, QImage.Format.Format_ARGB32)
+    pixmap = cache.get(image, SIZE, ratio)
+    assert pixmap.size() == QSize(16, 8) * ratio
+    assert pixmap.devicePixelRatio() == ratio
+
+
+def test_pixmap_cache_rescales_on_size_change(cache):
+    image = create_image(32)
+    first = cache.get(image, SIZE)
+    second = cache.get(image, SIZE * 2)
+    assert len(cache) == 1
+    assert first.size() == SIZE
+    assert second.size() == SIZE * 2
+
+
+def test_pixmap_cache_evicts_least_recently_used(cache):
+    first, second, third = create_image(), create_image(), create_image()
+    first_pixmap = cache.get(first, SIZE)
+    second_pixmap = cache.get(second, SIZE)
+    cache.get(first, SIZE)
+    cache.get(third, SIZE)
+    assert len(cache) == 2
+    assert cache.get(first, SIZE).cacheKey() == first_pixmap.cacheKey()
+    assert cache.get(second, SIZE).cacheKey() != second_pixmap.cacheKey()
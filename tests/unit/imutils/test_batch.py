@@ -0,0 +1,94 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+"""Tests for vimiv.imutils.batch."""
+
+import pytest
+
+from vimiv.qt.gui import QImage
+
+from vimiv.imutils import batch, metadata, _file_handler
+
+
+@pytest.fixture(autouse=True)
+def log(mocker):
+    """Fixture to record error messages instead of logging them."""
+    yield mocker.patch.object(batch, "log")
+
+
+@pytest.mark.parametrize(
+    "error",
+    (
+        ValueError("cannot read"),
+        PermissionError("permission denied"),
+        _file_handler.WriteError("cannot write"),
+    ),
+)
+def test_process_reports_failure(mocker, log, error):
+    processor = mocker.Mock()
+    function = mocker.Mock(side_effect=error)
+    batch.BatchProcessor._process(processor, "image.jpg", function)
+    processor.processed.emit.assert_called_once_with(False)
+    log.error.assert_called_once()
+
+
+def test_process_reports_failure_on_unexpected_error(mocker):
+    processor = mocker.Mock()
+    function = mocker.Mock(side_effect=RuntimeError)
+    with pytest.raises(RuntimeError):
+        batch.BatchProcessor._process(processor, "image.jpg", function)
+    processor.processed.emit.assert_called_once_with(False)
+
+
+def test_process_reports_success(mocker):
+    processor = mocker.Mock()
+    batch.BatchProcessor._process(processor, "image.jpg", mocker.Mock())
+    processor.processed.emit.assert_called_once_with(True)
+
+
+def test_export_destinations():
+    paths = ("a/image.jpg", "b/other.jpg")
+    assert batch.export_destinations(paths, "dest", None) == {
+        "a/image.jpg": "dest/image.jpg",
+        "b/other.jpg": "dest/other.jpg",
+    }
+
+
+@pytest.mark.parametrize(
+    "paths, file_format",
+    (
+        (("a/image.jpg", "b/image.jpg", "c/image.jpg"), None),
+        (("a/image.jpg", "a/image.png", "a/image.webp"), "png"),
+    ),
+)
+def test_export_destinations_are_unique(paths, file_format):
+    destinations = batch.export_destinations(paths, "dest", file_format)
+    assert len(set(destinations.values())) == len(paths)
+
+
+def test_export_destinations_skip_taken_suffix():
+    paths = ("a/image.jpg", "a/image_1.jpg", "b/image.jpg")
+    destinations = batch.export_destinations(paths, "dest", None)
+    assert destinations["b/image.jpg"] == "dest/image_2.jpg"
+
+
+@pytest.mark.parametrize("size, expected", ((2, (2, 1)), (16, (4, 2))))
+def test_export_only_scales_down(tmp_path, size, expected):
+    path, dest = str(tmp_path / "image.png"), str(tmp_path / "copy.png")
+    image = QImage(4, 2, QImage.Format.Format_RGB32)
+    image.fill(0)
+    image.save(path)
+    options = _file_handler.EncoderOptions(-1, {}, False)
+    batch.export_path(path, {path: dest}, size, options)
+    copy = QImage(dest)
+    assert (copy.width(), copy.height()) == expected
+
+
+def test_export_does_not_store_metadata(mocker, tmp_path):
+    handler = mocker.patch.object(metadata, "MetadataHandler")
+    path, dest = str(tmp_path / "image.png"), str(tmp_path / "copy.png")
+    image = QImage(4, 4, QImage.Format.Format_RGB32)
+    image.fill(0)
+    image.save(path)
+    options = _file_handler.EncoderOptions(-1, {}, False)
+    batch.export_path(path, {path: dest}, None, options)
+    handler.assert_called_once_with(path, store=False)
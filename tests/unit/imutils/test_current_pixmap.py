@@ -0,0 +1,53 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+"""Tests for vimiv.imutils.current_pixmap."""
+
+import pytest
+
+from vimiv.qt.core import Qt, QSize
+from vimiv.qt.gui import QImage, QPixmap, QTransform
+
+from vimiv.imutils import current_pixmap
+
+
+def permutations():
+    for angle in (0, 90, 180, 270):
+        for dx, dy in ((1, 1), (-1, 1), (1, -1)):
+            yield QTransform().rotate(angle).scale(dx, dy)
+            yield QTransform().scale(dx, dy).rotate(angle)
+
+
+@pytest.fixture
+def pixmap(qtbot):
+    image = QImage(5, 3, QImage.Format.Format_RGB32)
+    for x in range(5):
+        for y in range(3):
+            image.setPixel(x, y, 0xFF000000 + 16 * x + y)
+    yield QPixmap.fromImage(image)
+
+
+@pytest.mark.parametrize("transform", permutations())
+def test_transformed_permutation_is_exact(pixmap, transform):
+    assert current_pixmap.is_permutation(transform)
+    expected = pixmap.toImage().transformed(
+        transform, mode=Qt.TransformationMode.FastTransformation
+    )
+    transformed = current_pixmap.transformed(pixmap, transform).toImage()
+    assert transformed.convertToFormat(expected.format()) == expected
+
+
+@pytest.mark.parametrize(
+    "transform", [QTransform().rotate(45), QTransform().scale(2, 2)]
+)
+def test_is_not_permutation(transform):
+    assert not current_pixmap.is_permutation(transform)
+
+
+def test_transform_is_applied_lazily(mocker, pixmap):
+    transformed = mocker.spy(current_pixmap, "transformed")
+    current = current_pixmap.CurrentPixmap()
+    current.transform(pixmap, QTransform().rotate(90))
+    assert current.size == QSize(3, 5)
+    transformed.assert_not_called()
+    assert current.pixmap.size() == QSize(3, 5)
+    transformed.assert_called_once()
@@ -0,0 +1,113 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+"""Tests for vimiv.imutils.edit_history."""
+
+import pytest
+
+from vimiv.qt.core import QRect
+from vimiv.qt.gui import QImage, QPixmap
+
+from vimiv import api
+from vimiv.imutils import edit_history
+
+ROTATED = (0.0, 1.0, 0.0, -1.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+
+
+@pytest.fixture
+def history(qtbot):
+    history = edit_history.EditHistory()
+    history.reset(QPixmap(300, 200))
+    yield history
+
+
+def crop(history, rect, state):
+    record = edit_history.CropRecord(rect)
+    state = record.replay(state)
+    history.push(record, state)
+    return state
+
+
+def test_undo_and_redo_transform(history):
+    history.push(edit_history.TransformRecord(ROTATED), None)
+    state = history.undo()
+    assert state.current().size() == history._base.original.size()
+    assert history.can_redo
+    assert history.redo().current().width() == 200
+
+
+def test_transform_records_are_not_stored_as_snapshot(history):
+    history.push(edit_history.TransformRecord(ROTATED), None)
+    assert not history._snapshots
+
+
+def test_push_discards_redo(history):
+    history.push(edit_history.TransformRecord(ROTATED), None)
+    history.undo()
+    history.push(edit_history.TransformRecord(edit_history.IDENTITY), None)
+    assert not history.can_redo
+
+
+def test_undo_count_is_clamped(history):
+    history.push(edit_history.TransformRecord(ROTATED), None)
+    history.undo(5)
+    assert not history.can_undo
+
+
+def test_prune_snapshots_over_budget(monkeypatch, history):
+    monkeypatch.setattr(api.settings.image.undo_memory, "value", 0)
+    state = edit_history.State(history._base.original, edit_history.IDENTITY)
+    state = crop(history, QRect(0, 0, 200, 100), state)
+    crop(history, QRect(0, 0, 100, 50), state)
+    assert list(history._snapshots) == [2]  # The current state is always kept
+
+
+def test_replay_dropped_snapshot(monkeypatch, history):
+    monkeypatch.setattr(api.settings.image.undo_memory, "value", 0)
+    state = edit_history.State(history._base.original, edit_history.IDENTITY)
+    state = crop(history, QRect(0, 0, 200, 100), state)
+    crop(history, QRect(0, 0, 100, 50), state)
+    assert history.undo().current().size() == QRect(0, 0, 200, 100).size()
+
+
+def test_steps_combine_transformations(history):
+    history.push(edit_history.TransformRecord(edit_history.IDENTITY), None)
+    history.push(edit_history.TransformRecord(ROTATED), None)
+    (step,) = history.steps()
+    assert step.map(1.0, 0.0) == (0.0, 1.0)
+
+
+def test_steps_split_at_manipulations(history):
+    record = edit_history.ManipulateRecord(["changes"], lambda pixmap, *_: pixmap)
+    history.push(edit_history.TransformRecord(ROTATED), None)
+    history.push(record, None)
+    assert history.steps()[1:] == [("changes",)]
+
+
+def test_steps_exclude_undone_records(history):
+    history.push(edit_history.TransformRecord(ROTATED), None)
+    history.undo()
+    assert not history.steps()
+
+
+def test_steps_fail_for_crop(history):
+    state = edit_history.State(history._base.original, edit_history.IDENTITY)
+    crop(history, QRect(0, 0, 200, 100), state)
+    with pytest.raises(ValueError, match="Cannot apply crop"):
+        history.steps()
+
+
+def test_replay_on_images_reuses_unchanged_pixmaps(history):
+    pixmaps = {}
+    start = edit_history.to_images(history._base, pixmaps)
+    assert isinstance(start.original, QImage) and start.pixmap is start.original
+    records = [
+        edit_history.TransformRecord(ROTATED),
+        edit_history.ManipulateRecord(["changes"], lambda image, *_: image.copy()),
+        edit_history.CropRecord(QRect(0, 0, 100, 100)),
+    ]
+    state, snapshots = edit_history.replay(0, start, records)
+    state = edit_history.to_pixmaps(state, pixmaps)
+    assert isinstance(state.current(), QPixmap)
+    assert state.current().size() == QRect(0, 0, 100, 100).size()
+    assert state.original is edit_history.to_pixmaps(snapshots[2], pixmaps).original
+    assert edit_history.to_pixmaps(start, pixmaps).original is history._base.original
@@ -0,0 +1,154 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+"""Tests for vimiv.imutils._file_handler."""
+
+import os
+import threading
+import time
+
+import pytest
+
+from vimiv.qt.gui import QColor, QImage, QTransform
+
+from vimiv import api
+from vimiv.imutils import _file_handler, metadata
+
+
+@pytest.fixture
+def image():
+    image = QImage(64, 64, QImage.Format.Format_RGB32)
+    for y in range(64):
+        for x in range(64):
+            image.setPixelColor(x, y, QColor((x * 37) % 256, (y * 91) % 256, x ^ y))
+    yield image
+
+
+@pytest.fixture
+def written(monkeypatch):
+    """Fixture to record the jobs written instead of writing them to disk."""
+    jobs = []
+    running = set()
+    overlapping = []
+    lock = threading.Lock()
+
+    def write_image(image, path, *_args):
+        with lock:
+            overlapping.append(path in running)
+            running.add(path)
+        time.sleep(0.05)
+        with lock:
+            running.discard(path)
+            jobs.append((image, path))
+
+    monkeypatch.setattr(_file_handler, "write_image", write_image)
+    yield jobs, overlapping
+
+
+@pytest.fixture
+def queue(qtbot):
+    yield _file_handler.WriteQueue()
+
+
+def test_write_image_with_quality(tmp_path, image):
+    sizes = []
+    for quality in (10, 95):
+        path = str(tmp_path / f"image_{quality}.jpg")
+        _file_handler.write_image(image, path, path, quality=quality)
+        sizes.append(os.path.getsize(path))
+    assert sizes[0] < sizes[1]
+
+
+def test_write_image_logs_os_error(mocker):
+    mocker.patch.object(_file_handler, "save_image", side_effect=PermissionError)
+    log = mocker.patch.object(_file_handler, "log")
+    _file_handler.write_image(QImage(), "image.jpg", "image.jpg")
+    log.error.assert_called_once()
+
+
+@pytest.mark.parametrize("name", ("image.jpg", "copy.jpg"))
+def test_write_orientation_copies_only_to_new_path(mocker, tmp_path, image, name):
+    original = str(tmp_path / "image.jpg")
+    image.save(original)
+    set_orientation = mocker.patch.object(
+        metadata.MetadataHandler, "set_orientation", return_value=True
+    )
+    copyfile = mocker.spy(_file_handler.shutil, "copyfile")
+    path = str(tmp_path / name)
+    assert _file_handler._write_orientation(path, original, QTransform().rotate(90))
+    set_orientation.assert_called_once_with(metadata.ExifOrientation.Rotation90)
+    assert copyfile.called == (path != original)
+    assert os.path.isfile(path)
+
+
+@pytest.mark.parametrize(
+    "path, quality", (("image.jpg", 80), ("image.JPEG", 80), ("image.png", 50))
+)
+def test_encoder_options_per_format(monkeypatch, path, quality):
+    monkeypatch.setattr(api.settings.image.write_quality, "value", 50)
+    monkeypatch.setattr(api.settings.image.write_quality_jpg, "value", 80)
+    options = _file_handler.EncoderOptions.from_settings()
+    assert options.for_path(path) == (quality, False)
+
+
+def test_encoder_options_override_quality(monkeypatch):
+    monkeypatch.setattr(api.settings.image.write_quality_jpg, "value", 80)
+    options = _file_handler.EncoderOptions.from_settings(quality=20)
+    assert options.for_path("image.jpg") == (20, False)
+
+
+def test_write_queue_serializes_writes_per_path(queue, written):
+    for i in range(3):
+        queue.put(_file_handler.WriteJob(i, "image.jpg", "image.jpg"))
+    queue.flush()
+    jobs, overlapping = written
+    assert not any(overlapping)
+    assert jobs[-1] == (2, "image.jpg")
+
+
+def test_write_queue_replaces_waiting_job_of_path(monkeypatch, qtbot, queue):
+    written = []
+    release = threading.Event()
+
+    def write_image(image, *_args):
+        release.wait(5)
+        written.append(image)
+
+    monkeypatch.setattr(_file_handler, "write_image", write_image)
+    queue.put(_file_handler.WriteJob(0, "image.jpg", "image.jpg"))
+    qtbot.waitUntil(lambda: "image.jpg" in queue._running)
+    for i in (1, 2):
+        queue.put(_file_handler.WriteJob(i, "image.jpg", "image.jpg"))
+    release.set()
+    queue.flush()
+    assert written == [0, 2]
+
+
+def test_write_queue_writes_different_paths(queue, written):
+    for i in range(4):
+        queue.put(_file_handler.WriteJob(i, f"image_{i}.jpg", f"image_{i}.jpg"))
+    queue.flush()
+    assert sorted(image for image, _ in written[0]) == list(range(4))
+
+
+def test_write_queue_flush_writes_jobs_never_started(monkeypatch, queue, written):
+    monkeypatch.setattr(_file_handler, "asyncrun", lambda *_args, **_kwargs: None)
+    queue.put(_file_handler.WriteJob(0, "image.jpg", "image.jpg"))
+    queue.flush()
+    assert written[0] == [(0, "image.jpg")]
+
+
+def test_write_queue_job_waits_for_reserved_path(qtbot, queue, written):
+    jobs, _ = written
+    with queue.reserve("image.jpg"):
+        queue.put(_file_handler.WriteJob(0, "image.jpg", "image.jpg"))
+        queue._pool.waitForDone()
+        assert not jobs
+    qtbot.waitUntil(lambda: jobs == [(0, "image.jpg")])
+
+
+def test_write_queue_reserve_waits_for_running_job(qtbot, queue, written):
+    jobs, _ = written
+    queue.put(_file_handler.WriteJob(0, "image.jpg", "image.jpg"))
+    qtbot.waitUntil(lambda: "image.jpg" in queue._running)
+    with queue.reserve("image.jpg"):
+        assert jobs == [(0, "image.jpg")]
@@ -0,0 +1,179 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+"""Tests for vimiv.imutils.immanipulate."""
+
+import pytest
+
+from vimiv.qt.gui import QColor, QImage
+
+from vimiv import api
+from vimiv.imutils import immanipulate, _c_manipulate
+
+
+@pytest.fixture
+def manipulations(qtbot):
+    yield immanipulate.Manipulations()
+
+
+@pytest.fixture
+def image():
+    image = QImage(4, 4, QImage.Format.Format_ARGB32)
+    image.fill(QColor(100, 100, 100))
+    yield image
+
+
+def pixel(image):
+    return QColor(image.pixel(0, 0)).getRgb()
+
+
+def changes(manipulations):
+    return [group.snapshot() for group in manipulations.groups]
+
+
+def test_c_extension_manipulates_buffer_in_place():
+    data = bytearray([100, 100, 100, 255] * 4)
+    assert _c_manipulate.brightness_contrast(data, 0.2, 0.0) is None
+    assert data[:4] != bytearray([100, 100, 100, 255])
+    assert data[3] == 255  # Alpha channel is untouched
+
+
+def test_c_extension_rejects_read_only_buffer():
+    with pytest.raises(TypeError):
+        _c_manipulate.brightness_contrast(bytes(16), 0.2, 0.0)
+
+
+def test_apply_changes_does_not_modify_original(manipulations, image):
+    manipulations[0].value = 50
+    manipulated = manipulations.apply_changes(image, *changes(manipulations))
+    assert pixel(image) == (100, 100, 100, 255)
+    assert pixel(manipulated) != (100, 100, 100, 255)
+
+
+def test_apply_changes_chains_changes(manipulations, image):
+    brightness, _, _, _, lightness = manipulations
+    brightness.value = lightness.value = 20
+    expected = manipulations.apply(manipulations.apply(image, brightness), lightness)
+    assert pixel(manipulations.apply_changes(image, *changes(manipulations))) == pixel(
+        expected
+    )
+
+
+def test_apply_changes_converts_format(manipulations):
+    image = QImage(4, 4, QImage.Format.Format_Grayscale8)
+    image.fill(QColor(100, 100, 100))
+    manipulations[0].value = 50
+    manipulated = manipulations.apply_changes(image, *changes(manipulations))
+    assert manipulated.format() == QImage.Format.Format_ARGB32
+    assert image.format() == QImage.Format.Format_Grayscale8
+
+
+def test_snapshot_stores_parameters_only(manipulations):
+    group = manipulations.groups[0]
+    group.manipulations[0].value = 20
+    snapshot = group.snapshot()
+    group.manipulations[0].reset()
+    assert snapshot == (group, (("brightness", 20), ("contrast", 0)))
+
+
+@pytest.mark.parametrize(
+    "n_bands, expected", [(0, 1), (1, 1), (3, 3), (4, 4), (16, 10)]
+)
+def test_split_bands(n_bands, expected):
+    data = memoryview(bytearray(range(10)) * 4)
+    bands = immanipulate._split_bands(data, 10, 4, n_bands)
+    assert len(bands) == expected
+    assert b"".join(bytes(band) for band in bands) == bytes(data)
+    assert all(len(band) % 4 == 0 for band in bands)
+
+
+def test_apply_changes_in_bands(monkeypatch, mocker, manipulations):
+    mocker.patch.object(immanipulate.Manipulations, "MIN_BAND_ROWS", 1)
+    image = QImage(4, 8, QImage.Format.Format_ARGB32)
+    for y in range(8):
+        for x in range(4):
+            image.setPixelColor(x, y, QColor(30 * x, 20 * y, 100))
+    manipulations[0].value = manipulations[3].value = 30
+    results = []
+    for threads in (1, 4):
+        monkeypatch.setattr(api.settings.image.manipulate_threads, "value", threads)
+        results.append(manipulations.apply_changes(image, *changes(manipulations)))
+    assert results[0] == results[1]
+
+
+class InvertGroup(immanipulate.LUTGroup):
+    """Lookup table group to invert the image if the manipulation is changed."""
+
+    def __init__(self):
+        super().__init__(immanipulate.Manipulation("invert"))
+
+    @property
+    def title(self):
+        return "Invert"
+
+    def _lut(self, invert):
+        return bytes(255 - i for i in range(256))
+
+
+def test_c_extension_lut_matches_brightness_contrast():
+    data = bytearray(range(256))
+    expected = bytearray(data)
+    _c_manipulate.brightness_contrast(expected, 0.2, -0.1)
+    _c_manipulate.lut(data, _c_manipulate.brightness_contrast_lut(0.2, -0.1))
+    assert data == expected
+
+
+def test_compile_fuses_lookup_tables(qtbot):
+    first, second = immanipulate.BriConGroup(), InvertGroup()
+    first.manipulations[0].value = second.manipulations[0].value = 20
+    hsl = immanipulate.HSLGroup()
+    hsl.manipulations[0].value = 10
+    first, second, hsl = first.snapshot(), second.snapshot(), hsl.snapshot()
+    steps = immanipulate._compile([first, None, second, hsl, first])
+    first_lut, second_lut = first[0].lut(first[1]), second[0].lut(second[1])
+    assert steps == [first_lut.translate(second_lut), hsl, first_lut]
+
+
+def test_compile_skips_unchanged_groups(qtbot):
+    unchanged = [immanipulate.BriConGroup().snapshot(), InvertGroup().snapshot()]
+    assert not immanipulate._compile(unchanged)
+
+
+def test_apply_lookup_table_group(qtbot, image):
+    group = InvertGroup()
+    group.manipulations[0].value = 1
+    manipulated = immanipulate.Manipulations().apply_changes(image, group.snapshot())
+    assert pixel(manipulated) == (155, 155, 155, 255)
+
+
+def test_apply_changes_progress(mocker, manipulations, image):
+    mocker.patch.object(immanipulate.Manipulations, "MIN_BAND_ROWS", 1)
+    progress = []
+    manipulations[0].value = 10
+    manipulations.apply_changes(
+        image, *changes(manipulations), progress=progress.append
+    )
+    assert sorted(progress)[-1] == 100
+
+
+def test_apply_changes_cancelled(manipulations, image):
+    manipulations[0].value = 10
+    with pytest.raises(immanipulate.ManipulationCancelled):
+        manipulations.apply_changes(
+            image, *changes(manipulations), cancelled=lambda: True
+        )
+
+
+def test_manipulate_image_converts_format(manipulations):
+    image = QImage(4, 4, QImage.Format.Format_Grayscale8)
+    image.fill(QColor(100, 100, 100))
+    manipulations[0].value = 50
+    manipulated = immanipulate.manipulate_image(image, *changes(manipulations))
+    assert manipulated.format() == QImage.Format.Format_ARGB32
+    assert QColor(manipulated.pixel(0, 0)).getRgb() != (100, 100, 100, 255)
+
+
+def test_manipulate_image_matches_apply_changes(manipulations, image):
+    manipulations[0].value = manipulations[3].value = 30
+    expected = manipulations.apply_changes(image, *changes(manipulations))
+    manipulated = immanipulate.manipulate_image(image, *changes(manipulations))
+    assert manipulated == expected
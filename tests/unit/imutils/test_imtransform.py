@@ -6,6 +6,7 @@ import functools
 
 import pytest
 
+from vimiv.qt.core import QRect
 from vimiv.qt.gui import QPixmap
 
 from vimiv.imutils import current_pixmap, imtransform
@@ -47,3 +48,27 @@ def test_change_and_reset(action, transform):
 def test_rotate_angle(transform, angle):
     transform.rotate(angle)
     assert transform.angle == pytest.approx(angle)
+
+
+@pytest.mark.parametrize("count", (4, 5, 6, 9))
+@pytest.mark.parametrize("counter_clockwise", (True, False))
+def test_rotate_count_is_permutation(transform, count, counter_clockwise):
+    transform.rotate_command(counter_clockwise=counter_clockwise, count=count)
+    assert current_pixmap.is_permutation(transform)
+    angle = 90 * count * (-1 if counter_clockwise else 1)
+    assert transform.angle == pytest.approx(angle % 360)
+
+
+@pytest.mark.parametrize("reset", ("original", "reset"))
+def test_discard_processed_crop_after_reset(qtbot, mocker, transform, reset):
+    transformed = mocker.Mock()
+    transform.transformed.connect(transformed)
+    transform.crop(QRect(0, 0, 100, 100))
+    if reset == "original":
+        transform.original = QPixmap(200, 200)
+    else:
+        transform.reset()
+    transform.pool.waitForDone()
+    qtbot.wait(10)
+    transformed.assert_not_called()
+    assert not transform.processing
@@ -0,0 +1,121 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+"""Tests for vimiv.imutils.metadata."""
+
+import os
+
+import pytest
+
+from vimiv.qt.gui import QTransform
+
+from vimiv.imutils import metadata
+
+
+class CountingPlugin(metadata.MetadataPlugin):
+    """Metadata plugin counting how often a file is parsed."""
+
+    parsed = []
+
+    def __init__(self, path):
+        self.parsed.append(path)
+        self._path = path
+
+    @staticmethod
+    def name():
+        return "counting"
+
+    @staticmethod
+    def version():
+        return ""
+
+    def get_metadata(self, _keys):
+        return {}
+
+    def get_keys(self):
+        return iter([])
+
+    def get_date_time(self):
+        return self._path
+
+
+@pytest.fixture(autouse=True)
+def plugin(monkeypatch):
+    """Fixture to register only the counting plugin on a clean cache."""
+    monkeypatch.setattr(metadata, "_registry", [CountingPlugin])
+    monkeypatch.setattr(metadata, "_cache", metadata.MetadataCache())
+    CountingPlugin.parsed = []
+    yield CountingPlugin
+
+
+@pytest.fixture
+def image(tmp_path):
+    path = tmp_path / "image.jpg"
+    path.write_bytes(b"content")
+    yield str(path)
+
+
+def test_parse_once_per_version(plugin, image):
+    for _ in range(3):
+        assert metadata.MetadataHandler(image).get_date_time() == image
+    assert plugin.parsed == [image]
+
+
+def test_parse_again_when_file_changed(plugin, image):
+    metadata.MetadataHandler(image).get_date_time()
+    with open(image, "ab") as f:
+        f.write(b"more")
+    metadata.MetadataHandler(image).get_date_time()
+    assert plugin.parsed == [image, image]
+    assert len(metadata._cache) == 1
+
+
+def test_evict_least_recently_used(mocker, plugin, tmp_path):
+    mocker.patch.object(metadata.MetadataCache, "MAXSIZE", 2)
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / name
+        path.write_bytes(b"content")
+        paths.append(str(path))
+    first, second, third = paths
+    metadata.MetadataHandler(first).get_date_time()
+    metadata.MetadataHandler(second).get_date_time()
+    metadata.MetadataHandler(first).get_date_time()  # first is now most recent
+    metadata.MetadataHandler(third).get_date_time()  # evicts second
+    metadata.MetadataHandler(first).get_date_time()
+    metadata.MetadataHandler(second).get_date_time()
+    assert plugin.parsed == [first, second, third, second]
+
+
+def test_do_not_cache_missing_file(plugin, tmp_path):
+    path = str(tmp_path / "missing.jpg")
+    assert not os.path.exists(path)
+    metadata.MetadataHandler(path).get_date_time()
+    metadata.MetadataHandler(path).get_date_time()
+    assert plugin.parsed == [path, path]
+    assert not metadata._cache
+
+
+def test_prefetch_parses_into_cache(plugin, image):
+    assert not metadata.MetadataHandler(image).parsed
+    metadata.prefetch(image)
+    handler = metadata.MetadataHandler(image)
+    assert handler.parsed
+    handler.get_date_time()
+    assert plugin.parsed == [image]
+
+
+@pytest.mark.parametrize("orientation", range(1, 9))
+def test_orientation_from_transform(orientation):
+    transform = metadata.ExifOrientation.transform(orientation)
+    assert metadata.ExifOrientation.from_transform(transform) == orientation
+
+
+def test_orientation_from_composed_transform():
+    transform = metadata.ExifOrientation.transform(metadata.ExifOrientation.Rotation90)
+    transform *= QTransform().rotate(90)
+    orientation = metadata.ExifOrientation.from_transform(transform)
+    assert orientation == metadata.ExifOrientation.Rotation180
+
+
+def test_no_orientation_from_transform():
+    assert metadata.ExifOrientation.from_transform(QTransform().rotate(45)) is None
@@ -0,0 +1,151 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+"""Tests for vimiv.imutils.metadata_index."""
+
+import os
+import re
+
+import pytest
+
+from vimiv import api
+from vimiv.imutils import metadata, metadata_index
+from vimiv.utils import xdg
+
+KEYS = ["Exif.Photo.DateTimeOriginal", "Exif.Image.Model"]
+
+
+class ContentPlugin(metadata.MetadataPlugin):
+    """Metadata plugin returning the file content as date and counting reads."""
+
+    parsed = []
+
+    def __init__(self, path):
+        self.parsed.append(path)
+        with open(path, "r", encoding="utf-8") as f:
+            self._date = f.read()
+
+    @staticmethod
+    def name():
+        return "content"
+
+    @staticmethod
+    def version():
+        return ""
+
+    def get_metadata(self, keys):
+        values = {"Exif.Photo.DateTimeOriginal": self._date, "Exif.Image.Model": "Cam"}
+        return {key: (key, value) for key, value in values.items() if key in keys}
+
+    def get_keys(self):
+        return iter([])
+
+
+@pytest.fixture(autouse=True)
+def plugin(monkeypatch, tmp_path):
+    """Fixture to register only the content plugin and store index files in tmp."""
+    monkeypatch.setattr(metadata, "_registry", [ContentPlugin])
+    monkeypatch.setattr(metadata, "_cache", metadata.MetadataCache())
+    monkeypatch.setattr(xdg, "basedir", str(tmp_path / "xdg"))
+    ContentPlugin.parsed = []
+    yield ContentPlugin
+
+
+@pytest.fixture
+def images(tmp_path):
+    """Fixture to create images with the capture date as content."""
+    directory = tmp_path / "images"
+    directory.mkdir()
+    dates = "2021:05:01 10:00:00", "", "2020:01:01 08:00:00"
+    paths = []
+    for i, date in enumerate(dates):
+        path = directory / f"image_{i}.jpg"
+        path.write_text(date)
+        paths.append(str(path))
+    yield paths
+
+
+@pytest.fixture
+def index():
+    yield metadata_index.MetadataIndex()
+
+
+def run_index(index, images, entries=None):
+    index._index(index._generation, os.path.dirname(images[0]), images, KEYS, entries)
+
+
+def test_index_and_order_by_date(index, images):
+    run_index(index, images)
+    first, undated, second = images
+    assert sorted(images, key=index.date_order) == [second, first, undated]
+
+
+def test_finish_once_after_all_chunks(mocker, index, images):
+    mocker.patch.object(metadata_index.MetadataIndex, "CHUNK_SIZE", 1)
+    finished = mocker.Mock()
+    index.finished.connect(finished)
+    run_index(index, images)
+    finished.assert_called_once()
+    assert all(index.values(path) for path in images)
+
+
+def test_index_is_stored(plugin, index, images):
+    run_index(index, images)
+    run_index(metadata_index.MetadataIndex(), images)
+    assert plugin.parsed == images
+
+
+def test_index_only_outdated_images(plugin, index, images):
+    run_index(index, images)
+    with open(images[1], "w", encoding="utf-8") as f:
+        f.write("2022:02:02 12:00:00")
+    run_index(index, images, dict(index._entries))
+    assert plugin.parsed == [*images, images[1]]
+    assert index.date(images[1]) == "2022:02:02 12:00:00"
+
+
+def test_do_not_read_index_for_different_keys(images):
+    directory = os.path.dirname(images[0])
+    metadata_index._write(directory, KEYS, {images[0]: (0, 0, {})})
+    assert metadata_index._read(directory, KEYS)
+    assert not metadata_index._read(directory, KEYS[:1])
+
+
+def test_write_removes_temporary_file_on_failure(mocker, images):
+    directory = os.path.dirname(images[0])
+    cache = os.path.dirname(metadata_index._index_file(directory))
+    xdg.makedirs(cache)
+    stored = os.listdir(cache)
+    mocker.patch.object(metadata_index.json, "dump", side_effect=TypeError)
+    with pytest.raises(TypeError):
+        metadata_index._write(directory, KEYS, {images[0]: (0, 0, {})})
+    assert os.listdir(cache) == stored
+
+
+def test_add_order_types(monkeypatch):
+    setting = api.settings.sort.image_order
+    monkeypatch.setattr(setting, "order_types", dict(setting.ORDER_TYPES))
+    with pytest.raises(ValueError):
+        setting.convert("exif-date")
+    metadata_index.add_order_types()
+    assert setting.convert("exif-date") == "exif-date"
+
+
+@pytest.mark.parametrize(
+    "key, expected",
+    [
+        ("Exif.Image.Model", "Exif.Image.Model"),
+        ("model", "Exif.Image.Model"),
+        ("Make", None),
+    ],
+)
+def test_resolve_key(mocker, index, key, expected):
+    mocker.patch.object(metadata_index.MetadataIndex, "keys", KEYS)
+    assert index.resolve_key(key) == expected
+
+
+def test_matches(index, images):
+    run_index(index, images)
+    pattern = re.compile("2021")
+    assert index.matches(images, KEYS[0], pattern) == [0]
+    pattern = re.compile("cam")
+    assert index.matches(images, KEYS[1], pattern, casefold=True) == [0, 1, 2]
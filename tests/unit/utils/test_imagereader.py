@@ -0,0 +1,60 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+"""Tests for vimiv.utils.imagereader."""
+
+import pytest
+
+from vimiv.qt.core import QThread, QSize
+from vimiv.qt.gui import QImage, QPixmap
+
+from vimiv import utils
+from vimiv.utils import imagereader
+
+
+@pytest.fixture
+def threads(monkeypatch):
+    """Fixture to register an external format recording the threads it loads in."""
+    threads = []
+
+    def load_pixmap(_path):
+        threads.append(QThread.currentThread())
+        pixmap = QPixmap(4, 2)
+        pixmap.fill()
+        return pixmap
+
+    monkeypatch.setitem(imagereader.external_handler, "fmt", load_pixmap)
+    yield threads
+
+
+def get_image_in_worker(qtbot, reader):
+    """Return the image of reader scaled to 2 or the error retrieved in a worker."""
+    results = []
+
+    def get_image():
+        try:
+            results.append(reader.get_image(2))
+        except ValueError as e:
+            results.append(e)
+
+    pool = utils.Pool.get(globalinstance=False)
+    utils.asyncrun(get_image, pool=pool)
+    qtbot.waitUntil(lambda: len(results) == 1)
+    return results[0]
+
+
+def test_external_reader_loads_pixmap_only_in_gui_thread(qtbot, threads):
+    reader = imagereader.ExternalReader("path", "fmt")
+    assert not reader.threadsafe
+    assert isinstance(get_image_in_worker(qtbot, reader), ValueError)
+    assert not threads
+    assert reader.get_image(2).size() == QSize(2, 1)
+    assert threads == [QThread.currentThread()]
+
+
+def test_external_reader_uses_image_handler(qtbot, monkeypatch, threads):
+    image = QImage(4, 2, QImage.Format.Format_RGB32)
+    monkeypatch.setitem(imagereader.external_image_handler, "fmt", lambda _: image)
+    reader = imagereader.ExternalReader("path", "fmt")
+    assert reader.threadsafe
+    assert get_image_in_worker(qtbot, reader).size() == QSize(2, 1)
+    assert not threads
@@ -6,18 +6,18 @@ import os
 import pytest
 
 from vimiv.api import settings
-from vimiv.qt.gui import QPixmap
-from vimiv.utils import thumbnail_manager
+from vimiv.qt.core import QThread
+from vimiv.qt.gui import QImage, QPixmap
+from vimiv.utils import imagereader, thumbnail_manager, thumbnail_pack, xdg
 
 
 @pytest.fixture
 def manager(qtbot, tmp_path, mocker):
     """Fixture to create a thumbnail manager with relevant methods mocked."""
-    # Mock directory in which the thumbnails are created
-    tmp_cache_dir = tmp_path / "cache"
-    mocker.patch("vimiv.utils.xdg.user_cache_dir", return_value=str(tmp_cache_dir))
+    # Mock directory in which the thumbnails and thumbnail packs are created
+    mocker.patch.object(xdg, "basedir", str(tmp_path / "xdg"))
     # Create thumbnail manager and yield the instance
-    yield thumbnail_manager.ThumbnailManager(None)
+    yield thumbnail_manager.ThumbnailManager(QImage())
 
 
 def test_thumbnail_save_disabled(monkeypatch, qtbot, tmp_path, manager):
@@ -63,6 +63,79 @@ def test_create_thumbnails_for_non_image_path(qtbot, tmp_path, manager):
     check_thumbails_created(qtbot, manager, 0)
 
 
+def test_created_emits_image(qtbot, tmp_path, manager):
+    filename = str(tmp_path / "image.jpg")
+    QPixmap(300, 300).save(filename, "jpg")
+    with qtbot.waitSignal(manager.created) as blocker:
+        manager.create_thumbnails_async([filename], indices=[3])
+    index, path, image = blocker.args
+    assert (index, path) == (3, filename)
+    assert isinstance(image, QImage)
+    assert image.size().width() == 256
+
+
+def test_read_thumbnails_from_pack(monkeypatch, qtbot, tmp_path, manager, mocker):
+    monkeypatch.setattr(settings.thumbnail.save, "value", True)
+    filenames = [str(tmp_path / f"image_{i}.jpg") for i in range(3)]
+    for filename in filenames:
+        QPixmap(300, 300).save(filename, "jpg")
+    manager.create_thumbnails_async(filenames)
+    check_thumbails_created(qtbot, manager, len(filenames))
+    manager.write_packs()
+    manager.pack_pool.waitForDone()
+    assert len(thumbnail_pack.ThumbnailPack(str(tmp_path), manager.flavor)) == 3
+
+    spy = mocker.spy(thumbnail_manager.ThumbnailCreator, "_maybe_recreate_thumbnail")
+    with qtbot.waitSignals([manager.created] * len(filenames)):
+        manager.create_thumbnails_async(filenames)
+    check_thumbails_created(qtbot, manager, len(filenames))
+    spy.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "size, flavor",
+    (
+        (64, "normal"),
+        (128, "normal"),
+        (200, "large"),
+        (512, "x-large"),
+        (2048, "xx-large"),
+    ),
+)
+def test_select_freedesktop_size(manager, size, flavor):
+    manager.set_size(size)
+    assert manager.flavor == flavor
+    assert manager.directory == os.path.join(manager.cache_directory, flavor)
+
+
+def test_derive_thumbnail_from_larger_size(qtbot, tmp_path, manager, mocker):
+    filename = str(tmp_path / "image.jpg")
+    QPixmap(600, 300).save(filename, "jpg")
+    manager.set_size(512)
+    manager.create_thumbnails_async([filename])
+    check_thumbails_created(qtbot, manager, 1)
+
+    manager.set_size(128)
+    spy = mocker.spy(thumbnail_manager.imagereader, "get_reader")
+    with qtbot.waitSignal(manager.created) as blocker:
+        manager.create_thumbnails_async([filename])
+    check_thumbails_created(qtbot, manager, 1)
+    spy.assert_not_called()
+    image = blocker.args[2]
+    assert (image.width(), image.height()) == (128, 64)
+    assert image.text(thumbnail_manager.KEY_URI) == f"file://{filename}"
+
+
+def test_upscale_thumbnail_of_small_image(qtbot, tmp_path, manager):
+    filename = str(tmp_path / "image.jpg")
+    QPixmap(100, 50).save(filename, "jpg")
+    manager.set_size(1024)
+    with qtbot.waitSignal(manager.created) as blocker:
+        manager.create_thumbnails_async([filename])
+    image = blocker.args[2]
+    assert (image.width(), image.height()) == (1024, 512)
+
+
 def test_do_not_create_thumbnail_for_thumbnail(qtbot, manager):
     filename = os.path.join(
         manager.directory, hashlib.md5(b"thumbnail").hexdigest() + ".png"
@@ -72,6 +145,25 @@ def test_do_not_create_thumbnail_for_thumbnail(qtbot, manager):
     check_thumbails_created(qtbot, manager, 1)
 
 
+def test_read_pixmap_only_format_in_gui_thread(monkeypatch, qtbot, tmp_path, manager):
+    threads = []
+
+    def load_pixmap(_path):
+        threads.append(QThread.currentThread())
+        return QPixmap(300, 150)
+
+    monkeypatch.setitem(imagereader.external_handler, "fmt", load_pixmap)
+    monkeypatch.setattr(
+        imagereader, "get_reader", lambda path: imagereader.ExternalReader(path, "fmt")
+    )
+    filename = str(tmp_path / "image.fmt")
+    QPixmap(300, 150).save(filename, "png")
+    with qtbot.waitSignal(manager.created) as blocker:
+        manager.create_thumbnails_async([filename])
+    assert blocker.args[2].width() == 256
+    assert threads == [QThread.currentThread()]
+
+
 def check_thumbails_created(qtbot, manager, n_paths):
     def wait_thread():
         assert not manager.pool.activeThreadCount()
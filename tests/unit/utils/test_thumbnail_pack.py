@@ -0,0 +1,148 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+"""Tests for vimiv.utils.thumbnail_pack."""
+
+import json
+import os
+
+import pytest
+
+from vimiv.qt.gui import QImage
+
+from vimiv.utils import thumbnail_pack, xdg
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(monkeypatch, tmp_path):
+    """Fixture to store pack files in tmp."""
+    monkeypatch.setattr(xdg, "basedir", str(tmp_path / "xdg"))
+
+
+@pytest.fixture
+def thumbnails(qapp, tmp_path):
+    """Fixture to create images with a thumbnail in the freedesktop cache."""
+    directory = tmp_path / "images"
+    directory.mkdir()
+    thumbnails = {}
+    for i, fmt in enumerate((QImage.Format.Format_RGB32, QImage.Format.Format_RGB888)):
+        path = str(directory / f"image_{i}.jpg")
+        thumbnail_path = str(tmp_path / f"thumbnail_{i}.png")
+        image = QImage(16 + i, 8, fmt)
+        image.fill(0xFF102030 + i)
+        image.save(path)
+        image.save(thumbnail_path)
+        stat = os.stat(path)
+        thumbnails[path] = ((stat.st_mtime_ns, stat.st_size, thumbnail_path), image)
+    yield str(directory), thumbnails
+
+
+def test_read_written_pack(thumbnails):
+    directory, images = thumbnails
+    thumbnail_pack.write(directory, "large", images)
+    pack = thumbnail_pack.ThumbnailPack(directory, "large")
+    assert len(pack) == len(images)
+    for path, (_, image) in images.items():
+        packed = pack.get(path, os.stat(path))
+        assert packed.size() == image.size()
+        assert packed.pixel(1, 1) == image.pixel(1, 1)
+
+
+def test_pack_per_thumbnail_size(thumbnails):
+    directory, images = thumbnails
+    thumbnail_pack.write(directory, "large", images)
+    assert not thumbnail_pack.ThumbnailPack(directory, "normal")
+
+
+def test_ignore_changed_image(thumbnails):
+    directory, images = thumbnails
+    thumbnail_pack.write(directory, "large", images)
+    path, ((mtime, *_), _) = next(iter(images.items()))
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+    pack = thumbnail_pack.ThumbnailPack(directory, "large")
+    assert pack.get(path, os.stat(path)) is None
+
+
+@pytest.mark.parametrize("remove", (1, 4, 16 * 8 * 4 + 1))
+def test_ignore_truncated_pack(thumbnails, remove):
+    directory, images = thumbnails
+    thumbnail_pack.write(directory, "large", images)
+    filename = thumbnail_pack.pack_file(directory, "large")
+    os.truncate(filename, os.path.getsize(filename) - remove)
+    pack = thumbnail_pack.ThumbnailPack(directory, "large")
+    assert not pack
+    for path in images:
+        assert pack.get(path, os.stat(path)) is None
+
+
+@pytest.mark.parametrize("field, value", ((2, -1), (5, 4), (6, 3), (6, -1)))
+def test_ignore_pack_with_invalid_entry(thumbnails, field, value):
+    directory, images = thumbnails
+    thumbnail_pack.write(directory, "large", images)
+    filename = thumbnail_pack.pack_file(directory, "large")
+    with open(filename, "rb") as f:
+        content = f.read()
+    _, _, length = thumbnail_pack.HEADER.unpack_from(content)
+    start = thumbnail_pack.HEADER.size
+    index = json.loads(content[start : start + length])
+    entry = next(iter(index["entries"].values()))
+    entry[field] = value
+    encoded = json.dumps(index).encode()
+    header = thumbnail_pack.HEADER.pack(
+        thumbnail_pack.MAGIC, thumbnail_pack.VERSION, len(encoded)
+    )
+    with open(filename, "wb") as f:
+        f.write(header + encoded + content[start + length :])
+    assert not thumbnail_pack.ThumbnailPack(directory, "large")
+
+
+def test_skip_thumbnails_not_in_freedesktop_cache(thumbnails):
+    directory, images = thumbnails
+    path, ((_, _, thumbnail_path), _) = next(iter(images.items()))
+    os.remove(thumbnail_path)
+    thumbnail_pack.write(directory, "large", images)
+    pack = thumbnail_pack.ThumbnailPack(directory, "large")
+    assert len(pack) == len(images) - 1
+    assert pack.get(path, os.stat(path)) is None
+
+
+def test_keep_valid_entries_when_writing(thumbnails):
+    directory, images = thumbnails
+    first, second = images
+    thumbnail_pack.write(directory, "large", {first: images[first]})
+    thumbnail_pack.write(directory, "large", {second: images[second]})
+    pack = thumbnail_pack.ThumbnailPack(directory, "large")
+    assert len(pack) == 2
+    for path in images:
+        packed, image = pack.get(path, os.stat(path)), images[path][1]
+        assert packed.size() == image.size()
+        assert packed.pixel(1, 1) == image.pixel(1, 1)
+
+
+def test_drop_removed_images_when_writing(thumbnails):
+    directory, images = thumbnails
+    first, second = images
+    thumbnail_pack.write(directory, "large", {first: images[first]})
+    os.remove(first)
+    thumbnail_pack.write(directory, "large", {second: images[second]})
+    assert len(thumbnail_pack.ThumbnailPack(directory, "large")) == 1
+
+
+def test_outdated_once_written(thumbnails):
+    directory, images = thumbnails
+    pack = thumbnail_pack.ThumbnailPack(directory, "large")
+    assert not pack.outdated
+    thumbnail_pack.write(directory, "large", images)
+    assert pack.outdated
+
+
+@pytest.mark.parametrize("content", (b"", b"invalid", b"VIMIVTPK\x63\x00\x00\x00"))
+def test_ignore_invalid_pack(thumbnails, content):
+    directory, images = thumbnails
+    filename = thumbnail_pack.pack_file(directory, "large")
+    xdg.makedirs(os.path.dirname(filename))
+    with open(filename, "wb") as f:
+        f.write(content)
+    pack = thumbnail_pack.ThumbnailPack(directory, "large")
+    assert not pack
+    path = next(iter(images))
+    assert pack.get(path, os.stat(path)) is None
@@ -3,8 +3,8 @@
 """`Utilities to interact with the application`."""
 
 import os
-from typing import List, Iterable, Callable, BinaryIO
-from vimiv.qt.gui import QPixmap
+from typing import List, Iterable, Callable, BinaryIO, Optional
+from vimiv.qt.gui import QImage, QPixmap
 
 from vimiv.utils import files, imagereader, imageheader
 
@@ -82,6 +82,7 @@ def add_external_format(
     file_format: str,
     test_func: imageheader.CheckFuncT,
     load_func: Callable[[str], QPixmap],
+    image_func: Optional[Callable[[str], QImage]] = None,
 ) -> None:
     """Add support for new fileformat.
 
@@ -89,8 +90,16 @@ def add_external_format(
         file_format: String value of the file type
         test_func: Function returning True if load_func supports this type.
         load_func: Function to load a QPixmap from the passed path.
+        image_func: Function to load a QImage from the passed path. It is called in
+            worker threads, e.g. to create thumbnails, and must not create any QPixmap.
+            If not given, the format is only read in the GUI thread. Thumbnails are
+            then loaded in the GUI thread and batch processing the format fails.
     """
     # Prioritize external formats over all default formats, to ensure that on signature
     # collision, the explicitly registered handler is used.
     imageheader.register(file_format, test_func, priority=True)
     imagereader.external_handler[file_format] = load_func
+    if image_func is not None:
+        imagereader.external_image_handler[file_format] = image_func
+    else:
+        imagereader.external_image_handler.pop(file_format, None)
@@ -274,13 +274,23 @@ def pwd() -> str:
     return wd
 
 
-@api.status.module("{filesize}")
+# Signals after which status modules of the current path must be evaluated again
+_CURRENT_PATH_CHANGED = (
+    api.signals.new_image_opened,
+    api.signals.all_images_cleared,
+    api.signals.image_changed,
+    api.signals.path_selected,
+    *(mode.entered for mode in api.modes.ALL),
+)
+
+
+@api.status.module("{filesize}", invalidated_by=_CURRENT_PATH_CHANGED)
 def filesize() -> str:
     """Size of the current image in bytes."""
     return files.get_size(api.current_path())
 
 
-@api.status.module("{modified}")
+@api.status.module("{modified}", invalidated_by=_CURRENT_PATH_CHANGED)
 def modified() -> str:
     """Modification date of the current image."""
     try:
@@ -291,7 +301,7 @@ def modified() -> str:
     return date_time.toString("yyyy-MM-dd HH:mm")
 
 
-@api.status.module("{read-only}")
+@api.status.module("{read-only}", invalidated_by=[api.settings.read_only.changed])
 def read_only() -> str:
     """Print ``[RO]`` if read_only is true."""
     if api.settings.read_only:
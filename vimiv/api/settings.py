@@ -336,6 +336,15 @@ class OrderSetting(Setting):
         if additional_order_types:
             self.order_types.update(additional_order_types)
 
+    def add_order_type(self, name: str, ordering: Callable[..., Any]) -> None:
+        """Add an ordering that is only available once its provider was loaded.
+
+        Args:
+            name: Name of the ordering as used for the setting value.
+            ordering: Key function to sort the values with.
+        """
+        self.order_types[name] = ordering
+
     def convert(self, value: str) -> str:
         if value not in self.order_types:
             raise ValueError(f"Option must be one of {', '.join(self.order_types)}")
@@ -366,6 +375,24 @@ class OrderSetting(Setting):
         return "Order"
 
 
+class SearchModeSetting(Setting):
+    """Stores the mode used to match search text against paths."""
+
+    typ = str
+    ALLOWED_VALUES = "glob", "regex", "fuzzy"
+
+    def convert(self, value: str) -> str:
+        if value not in self.ALLOWED_VALUES:
+            raise ValueError(f"Option must be one of {', '.join(self.ALLOWED_VALUES)}")
+        return value
+
+    def suggestions(self) -> List[str]:
+        return list(self.ALLOWED_VALUES)
+
+    def __str__(self) -> str:
+        return "SearchMode"
+
+
 # Initialize all settings
 monitor_fs = BoolSetting(
     "monitor_filesystem",
@@ -421,6 +448,11 @@ class search:  # pylint: disable=invalid-name
         True,
         desc="Automatically filter search results when typing",
     )
+    mode = SearchModeSetting(
+        "search.mode",
+        "glob",
+        desc="Match search text as unix-style glob, regular expression or fuzzily",
+    )
 
 
 class image:  # pylint: disable=invalid-name
@@ -436,6 +468,12 @@ class image:  # pylint: disable=invalid-name
         question_body="Do you want to write your changes to disk?",
         desc="Save images on changes",
     )
+    manipulate_threads = IntSetting(
+        "image.manipulate_threads",
+        0,
+        desc="Number of threads to apply manipulations with, 0 to use all cores",
+        min_value=0,
+    )
     overzoom = FloatSetting(
         "image.overzoom",
         1.0,
@@ -443,6 +481,45 @@ class image:  # pylint: disable=invalid-name
         suggestions=["1.0", "1.5", "2.0", "5.0"],
         min_value=1.0,
     )
+    undo_memory = IntSetting(
+        "image.undo_memory",
+        256,
+        desc="Memory in MiB to keep undo snapshots of expensive edits in",
+        min_value=0,
+    )
+    write_progressive = BoolSetting(
+        "image.write_progressive",
+        False,
+        desc="Write jpg images as progressive scan",
+    )
+    write_quality = IntSetting(
+        "image.write_quality",
+        -1,
+        desc="Quality to encode images with from 0 to 100, -1 for the format default",
+        min_value=-1,
+        max_value=100,
+    )
+    write_quality_jpg = IntSetting(
+        "image.write_quality_jpg",
+        -1,
+        desc="Quality to encode jpg images with, -1 to use image.write_quality",
+        min_value=-1,
+        max_value=100,
+    )
+    write_quality_png = IntSetting(
+        "image.write_quality_png",
+        -1,
+        desc="Quality to encode png images with, -1 to use image.write_quality",
+        min_value=-1,
+        max_value=100,
+    )
+    write_quality_webp = IntSetting(
+        "image.write_quality_webp",
+        -1,
+        desc="Quality to encode webp images with, -1 to use image.write_quality",
+        min_value=-1,
+        max_value=100,
+    )
     zoom_wheel_ctrl = BoolSetting(
         "image.zoom_wheel_ctrl",
         True,
@@ -503,6 +580,12 @@ class statusbar:  # pylint: disable=invalid-name
         desc="Time in ms until statusbar messages are removed",
         min_value=500,
     )
+    update_delay = IntSetting(
+        "statusbar.update_delay",
+        0,
+        desc="Time in ms to collect update requests before updating statusbar and title",
+        min_value=0,
+    )
     mark_indicator = StrSetting(
         "statusbar.mark_indicator",
         "<b>*</b>",
@@ -581,6 +664,12 @@ class metadata:  # pylint: disable=invalid-name
 
     keysets: Dict[int, str] = dict(enumerate(defaults, start=1))
 
+    index_keys = StrSetting(
+        "metadata.index_keys",
+        "Exif.Photo.DateTimeOriginal,Exif.Image.DateTime,Exif.Image.Model,Exif.Photo.LensModel,Xmp.xmp.Rating,Exif.GPSInfo.GPSLatitude,Exif.GPSInfo.GPSLongitude",  # pylint: disable=line-too-long,useless-suppression
+        desc="Metadata keys indexed for all images in the working directory",
+    )
+
 
 class sort:  # pylint: disable=invalid-name
     """Namespace for sorting related settings."""
@@ -3,7 +3,7 @@
 """Namespace for signals exposed via the api."""
 
 from vimiv.qt.core import QObject, Signal
-from vimiv.qt.gui import QPixmap, QMovie
+from vimiv.qt.gui import QPixmap, QMovie, QTransform
 
 
 class _SignalHandler(QObject):
@@ -21,10 +21,17 @@ class _SignalHandler(QObject):
         all_images_cleared: Emitted when there are no more paths in the filelist.
 
         image_changed: Emitted when the current image changed on disk.
+        path_selected: Emitted when a new path was selected in library or thumbnail
+            mode.
+            arg1: The selected path.
 
         pixmap_loaded: Emitted when the file handler loaded a new pixmap.
             arg1: The QPixmap loaded.
             arg2: True if it is only reloaded.
+        pixmap_transformed: Emitted when the current pixmap should be displayed
+            transformed without applying the transformation to the pixmap.
+            arg1: The untransformed QPixmap.
+            arg2: The QTransform to display the pixmap with.
         movie_loaded: Emitted when the file handler loaded a new animation.
             arg1: The QMovie loaded.
             arg2: True if it is only reloaded.
@@ -48,8 +55,12 @@ class _SignalHandler(QObject):
     # Emitted when the current image changed on disk
     image_changed = Signal()
 
+    # Emitted when the selection of library or thumbnail mode changed
+    path_selected = Signal(str)
+
     # Tell the image to get a new object to display
     pixmap_loaded = Signal(QPixmap, bool)
+    pixmap_transformed = Signal(QPixmap, QTransform)
     movie_loaded = Signal(QMovie, bool)
     svg_loaded = Signal(str, bool)
 
@@ -68,7 +79,9 @@ new_image_opened = _signal_handler.new_image_opened
 new_images_opened = _signal_handler.new_images_opened
 all_images_cleared = _signal_handler.all_images_cleared
 image_changed = _signal_handler.image_changed
+path_selected = _signal_handler.path_selected
 pixmap_loaded = _signal_handler.pixmap_loaded
+pixmap_transformed = _signal_handler.pixmap_transformed
 movie_loaded = _signal_handler.movie_loaded
 svg_loaded = _signal_handler.svg_loaded
 plugins_loaded = _signal_handler.plugins_loaded
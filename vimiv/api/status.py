@@ -24,17 +24,30 @@ by the text "user: " we run::
 The occurrence of '{username}' is then replaced by the outcome of the username()
 function defined earlier.
 
+By default modules are evaluated whenever the status is evaluated. Modules that only
+change in response to certain signals can declare these signals. Their value is then
+memoized until any of the signals is emitted::
+
+        @status.module("{image-count}", invalidated_by=[api.signals.new_images_opened])
+        def image_count():
+            return str(len(imutils.pathlist()))
+
+Status texts are compiled into templates once, so evaluating a text only evaluates the
+modules it contains.
+
 If any other object requires the status to be updated, they should call
 :func:`vimiv.api.status.update` passing the reason for the requested update as string.
+All updates requested within one iteration of the event loop, or within the
+``statusbar.update_delay`` setting, are collapsed into a single update.
 """
 
 import functools
 import re
-from typing import Callable, TypeVar, Any, Dict
+from typing import Callable, TypeVar, Any, Dict, Iterable, List, Optional, Tuple
 
-from vimiv.qt.core import Signal, QObject
+from vimiv.qt.core import BoundSignal, Signal, QObject, QTimer
 
-from vimiv.api import objreg
+from vimiv.api import objreg, settings
 from vimiv.utils import log
 
 
@@ -44,24 +57,47 @@ ModuleFunc = TypeVar("ModuleFunc", Callable[[], str], Callable[[Any], str])
 
 
 _modules: Dict[str, "_Module"] = {}  # Dictionary storing all status modules
-_module_expression = re.compile(r"\{.*?\}")  # Expression to match all status modules
+_module_expression = re.compile(r"(\{.*?\})")  # Expression to match all status modules
 _logger = log.module_logger(__name__)
 
 
 class _Module:
-    """Class to store function of one status module."""
+    """Class to store function of one status module.
+
+    Attributes:
+        _func: Function returning the status text of the module.
+        _volatile: True if no invalidating signals were declared.
+        _value: Memoized status text or None if the module must be evaluated.
+    """
 
-    def __init__(self, func: Callable[..., str]):
+    def __init__(
+        self, func: Callable[..., str], invalidated_by: Iterable[BoundSignal] = None
+    ):
         self._func = func
+        self._volatile = invalidated_by is None
+        self._value: Optional[str] = None
+        for signal in invalidated_by or ():
+            signal.connect(self.invalidate)
 
     def __call__(self) -> str:
-        return objreg._call_with_instance(self._func)
+        if self._value is not None:
+            return self._value
+        value = objreg._call_with_instance(self._func)
+        if not self._volatile:
+            self._value = value
+        return value
+
+    def invalidate(self, *_args: Any) -> None:
+        """Drop the memoized value so the module is evaluated again."""
+        self._value = None
 
     def __repr__(self) -> str:
         return f"StatusModule('{self._func.__name__}')"
 
 
-def module(name: str) -> Callable[[ModuleFunc], ModuleFunc]:
+def module(
+    name: str, invalidated_by: Iterable[BoundSignal] = None
+) -> Callable[[ModuleFunc], ModuleFunc]:
     """Decorator to register a function as status module.
 
     The decorated function must return a string that can be displayed as
@@ -72,6 +108,9 @@ def module(name: str) -> Callable[[ModuleFunc], ModuleFunc]:
         name: Name of the module as set in the config file. Must start with '{'
             and end with '}' to allow differentiating modules from ordinary
             text.
+        invalidated_by: Signals after which the module must be evaluated again. If
+            given, the return value is memoized until any of them is emitted.
+            Otherwise the function is called on every evaluation.
     """
 
     def decorator(function: ModuleFunc) -> ModuleFunc:
@@ -80,7 +119,7 @@ def module(name: str) -> Callable[[ModuleFunc], ModuleFunc]:
             raise ValueError(
                 f"Invalid name '{name}' for status module {function.__name__}"
             )
-        _modules[name] = _Module(function)
+        _modules[name] = _Module(function, invalidated_by)
         return function
 
     return decorator
@@ -102,14 +141,31 @@ def evaluate(text: str) -> str:
     Returns:
         The updated text.
     """
-    modules = _module_expression.findall(text)
-    for module_name in modules:
-        try:
-            text = text.replace(module_name, _modules[module_name]())
-        except KeyError:
-            text = text.replace(module_name, "")
-            _log_unknown_module(module_name)
-    return text
+    return "".join(
+        literal + _evaluate_module(module_name)
+        for literal, module_name in _compile(text)
+    )
+
+
+@functools.lru_cache(64)
+def _compile(text: str) -> Tuple[Tuple[str, str], ...]:
+    """Compile text into a template of literal text and module name pairs.
+
+    The module name following the last literal text is empty.
+    """
+    parts = _module_expression.split(text)
+    return tuple(zip(parts[::2], parts[1::2] + [""]))
+
+
+def _evaluate_module(module_name: str) -> str:
+    """Return the output of the module called module_name."""
+    if not module_name:
+        return ""
+    try:
+        return _modules[module_name]()
+    except KeyError:
+        _log_unknown_module(module_name)
+        return ""
 
 
 @functools.lru_cache(None)
@@ -126,7 +182,11 @@ def _log_unknown_module(module_name: str) -> None:
 
 
 class _Signals(QObject):
-    """Simple QObject containing the update signal.
+    """QObject containing the update signal and collapsing update requests.
+
+    Attributes:
+        _reasons: Reasons of all update requests since the last update.
+        _timer: Single shot timer to emit the update signal.
 
     Signals:
         update: Emitted when the status should be updated.
@@ -136,21 +196,40 @@ class _Signals(QObject):
     update = Signal()
     clear = Signal()
 
+    def __init__(self) -> None:
+        super().__init__()
+        self._reasons: List[str] = []
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._emit_update)
+
+    def request_update(self, reason: str) -> None:
+        """Schedule the update signal unless it is already pending."""
+        self._reasons.append(reason)
+        if not self._timer.isActive():
+            self._timer.start(settings.statusbar.update_delay.value)
+
+    def _emit_update(self) -> None:
+        _logger.debug("Updating status: %s", ", ".join(self._reasons))
+        self._reasons = []
+        self.update.emit()
+
 
 signals = _Signals()
 
 
 def update(reason: str) -> None:
-    """Emit signal to update the current status.
+    """Request an update of the current status.
 
     This function can be called when an update of the status is required. It
-    is, for example, always called after a command was run.
+    is, for example, always called after a command was run. The update signal is
+    emitted once control returns to the event loop, so multiple requests are collapsed
+    into a single update.
 
     Args:
         reason: Reason of the update for logging.
     """
-    _logger.debug("Updating status: %s", reason)
-    signals.update.emit()
+    signals.request_update(reason)
 
 
 def clear(reason: str) -> None:
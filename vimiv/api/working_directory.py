@@ -105,10 +105,10 @@ class WorkingDirectoryHandler(QFileSystemWatcher):
         self._directories: List[str] = []
 
         settings.monitor_fs.changed.connect(self._on_monitor_fs_changed)
-        settings.sort.image_order.changed.connect(self._reorder_directory)
-        settings.sort.directory_order.changed.connect(self._reorder_directory)
-        settings.sort.reverse.changed.connect(self._reorder_directory)
-        settings.sort.ignore_case.changed.connect(self._reorder_directory)
+        settings.sort.image_order.changed.connect(self.reorder)
+        settings.sort.directory_order.changed.connect(self.reorder)
+        settings.sort.reverse.changed.connect(self.reorder)
+        settings.sort.ignore_case.changed.connect(self.reorder)
 
         self.directoryChanged.connect(self._reload_directory)
         self.fileChanged.connect(self._on_file_changed)
@@ -228,8 +228,8 @@ class WorkingDirectoryHandler(QFileSystemWatcher):
         return self._order_paths(*files.supported(paths))
 
     @slot
-    def _reorder_directory(self) -> None:
-        """Reorder current files / directories."""
+    def reorder(self) -> None:
+        """Reorder current files / directories according to the ordering settings."""
         _logger.debug("Reloading working directory")
         self._emit_changes(*self._order_paths(self._images, self._directories))
 
@@ -6,12 +6,21 @@ Module Attributes:
     search: Instance of the Search class used.
 """
 
-import fnmatch
+import bisect
+import functools
+import itertools
 import os
+import re
+from typing import Dict, Iterator, List, Match, NamedTuple, Pattern, Sequence, Tuple
 
 from vimiv.qt.core import QObject, Signal
 
-from vimiv import api
+from vimiv import api, utils
+from vimiv.imutils import metadata_index
+from vimiv.utils import log
+
+
+_logger = log.module_logger(__name__)
 
 
 def use_incremental(mode):
@@ -26,46 +35,300 @@ def use_incremental(mode):
     return False
 
 
+class SearchCancelled(Exception):
+    """Raised by the index if a running search was superseded by a newer one."""
+
+
+class BasenameIndex:
+    """Index of basenames used to match search patterns against.
+
+    The basenames of all paths are joined by null characters, which cannot be part of a
+    filename, into one string. A compiled pattern can then find all matches in a single
+    regular expression scan instead of matching every path on its own.
+
+    Pathlists are replaced instead of modified in place when their content changes. The
+    index is therefore valid as long as its source is the current pathlist.
+
+    Class Attributes:
+        CHUNK_SIZE: Number of basenames scanned before checking for cancellation.
+
+    Attributes:
+        paths: Paths the index was created for.
+        source: The pathlist the index was created from.
+        basenames: Basenames of all paths.
+
+        _joined: Basenames joined by null characters.
+        _starts: Offset of each basename in the joined string.
+        _folded: Lazily created joined string and offsets of case-folded basenames.
+        _positions: Dictionary mapping paths to their index.
+    """
+
+    CHUNK_SIZE = 4096
+
+    def __init__(self, paths: Sequence[str] = ()):
+        self.paths = list(paths)
+        self.source = paths
+        self.basenames = [os.path.basename(path) for path in self.paths]
+        self._joined, self._starts = self._join(self.basenames)
+        self._folded = None
+        self._positions = {path: i for i, path in enumerate(self.paths)}
+
+    def position(self, path: str) -> int:
+        """Return the index of path, 0 if it is not part of the index."""
+        return self._positions.get(path, 0)
+
+    def glob_matches(
+        self, pattern: Pattern, ignore_case: bool, cancelled=None
+    ) -> List[int]:
+        """Return the sorted indices of all basenames matching a glob pattern.
+
+        Args:
+            pattern: Compiled pattern as returned by compile_pattern.
+            ignore_case: Match against the case-folded basenames.
+            cancelled: Optional callable returning True to abort the search.
+        """
+        if pattern.fullmatch(""):  # Pattern matches anything
+            return list(range(len(self.paths)))
+        return [index for index, _ in self._scan(pattern, ignore_case, cancelled)]
+
+    def regex_matches(self, pattern: Pattern, cancelled=None) -> List[int]:
+        """Return the sorted indices of all basenames matching a regular expression.
+
+        User-defined expressions may match the null separator, so they are searched in
+        each basename separately. This is still done in batches without a python loop
+        over the basenames.
+
+        Args:
+            pattern: Compiled pattern as returned by compile_pattern.
+            cancelled: Optional callable returning True to abort the search.
+        """
+        indices: List[int] = []
+        for first in range(0, len(self.paths), self.CHUNK_SIZE):
+            if cancelled is not None and cancelled():
+                raise SearchCancelled
+            chunk = self.basenames[first : first + self.CHUNK_SIZE]
+            indices.extend(
+                itertools.compress(
+                    range(first, first + len(chunk)), map(pattern.search, chunk)
+                )
+            )
+        return indices
+
+    def fuzzy_matches(
+        self, pattern: Pattern, ignore_case: bool, cancelled=None
+    ) -> Dict[int, Tuple[int, int, int]]:
+        """Return the indices of all basenames matching a fuzzy pattern and their cost.
+
+        The pattern matches at most once per basename. The cost of a match is a tuple of
+        the length of the tightest match, its position in the basename and the length of
+        the basename. Lower cost is a better match.
+
+        Args:
+            pattern: Compiled pattern as returned by compile_pattern.
+            ignore_case: Match against the case-folded basenames.
+            cancelled: Optional callable returning True to abort the search.
+        """
+        costs: Dict[int, Tuple[int, int, int]] = {}
+        joined, starts = (
+            self._case_folded() if ignore_case else (self._joined, self._starts)
+        )
+        for index, match in self._scan(pattern, ignore_case, cancelled):
+            length = len(self.basenames[index])
+            start, end = self._tightest(pattern, joined, match, starts[index] + length)
+            costs[index] = (end - start, start - starts[index], length)
+        return costs
+
+    @staticmethod
+    def _tightest(pattern: Pattern, joined: str, match: Match, endpos: int):
+        """Return the span of the tightest fuzzy match in the basename of match.
+
+        The lazy pattern finds the tightest match for its start position, which is the
+        leftmost one. Later starts may be tighter, so the search is retried from each
+        following start position until the end of the basename at endpos.
+        """
+        start, end = match.span(1)
+        while end - start > 1:
+            retry = pattern.search(joined, match.start(1) + 1, endpos)
+            if retry is None:
+                break
+            match = retry
+            if match.end(1) - match.start(1) < end - start:
+                start, end = match.span(1)
+        return start, end
+
+    def _scan(
+        self, pattern: Pattern, ignore_case: bool, cancelled
+    ) -> Iterator[Tuple[int, Match]]:
+        """Yield index of the basename and match for every match in the joined string.
+
+        The string is scanned in chunks of basenames and cancelled is checked before
+        every chunk.
+        """
+        joined, starts = (
+            self._case_folded() if ignore_case else (self._joined, self._starts)
+        )
+        for first in range(0, len(starts), self.CHUNK_SIZE):
+            if cancelled is not None and cancelled():
+                raise SearchCancelled
+            last = first + self.CHUNK_SIZE
+            endpos = starts[last] if last < len(starts) else len(joined)
+            for match in pattern.finditer(joined, starts[first], endpos):
+                yield bisect.bisect_right(starts, match.start()) - 1, match
+
+    def _case_folded(self):
+        """Return joined string and offsets of the case-folded basenames."""
+        if self._folded is None:
+            self._folded = self._join([name.casefold() for name in self.basenames])
+        return self._folded
+
+    @staticmethod
+    def _join(basenames: List[str]):
+        """Return basenames joined by null characters and the offset of each name."""
+        starts = list(
+            itertools.accumulate((len(name) + 1 for name in basenames), initial=0)
+        )
+        return "\0".join(basenames), starts[:-1]
+
+
+@functools.lru_cache(maxsize=64)
+def compile_pattern(text: str, mode: str, ignore_case: bool) -> Pattern:
+    """Compile search text into a pattern usable by the basename index.
+
+    Args:
+        text: The text to search for.
+        mode: One of the search modes, i.e. glob, regex or fuzzy.
+        ignore_case: Case-fold the text to match against the case-folded index.
+    Raises:
+        re.error if the text is not a valid regular expression in regex mode.
+    """
+    if mode == "regex":
+        return re.compile(text, re.IGNORECASE if ignore_case else 0)
+    if ignore_case:
+        text = text.casefold()
+    if mode == "fuzzy":
+        # Consume the remainder of the basename to match at most once per basename
+        body = "[^\0]*?".join(re.escape(char) for char in text)
+        return re.compile(f"({body})[^\0]*")
+    return _compile_glob(text)
+
+
+def _compile_glob(text: str) -> Pattern:
+    """Compile unix-style search text into a pattern for the basename index.
+
+    The text is matched anywhere in the basename, as if surrounded by asterisks. None of
+    the wildcards match the null separator of the index and the pattern consumes the
+    remainder of the basename, so there is at most one match per basename.
+    """
+    parts = []
+    i, n = 0, len(text)
+    while i < n:
+        char = text[i]
+        i += 1
+        if char == "*":
+            parts.append("[^\0]*")
+        elif char == "?":
+            parts.append("[^\0]")
+        elif char == "[":
+            end = i + 1 if i < n and text[i] == "!" else i
+            end = end + 1 if end < n and text[end] == "]" else end
+            end = text.find("]", end)
+            if end == -1:  # No closing bracket, treat as literal
+                parts.append(re.escape(char))
+                continue
+            content = text[i:end].replace("\\", "\\\\")
+            i = end + 1
+            if content.startswith("!"):
+                parts.append(f"[^\0{content[1:]}]")
+            elif content.startswith("^"):
+                parts.append(f"[\\{content}]")
+            else:
+                parts.append(f"[{content}]")
+        else:
+            parts.append(re.escape(char))
+    parts.append("[^\0]*")
+    return re.compile("".join(parts))
+
+
+class _Query(NamedTuple):
+    """Storage class for everything required to run one search."""
+
+    generation: int
+    index: BasenameIndex
+    pattern: Pattern
+    search_mode: str
+    ignore_case: bool
+    current: int
+    count: int
+    reverse: bool
+    mode: api.modes.Mode
+    incremental: bool
+    metadata_key: str
+
+
 class Search(QObject):
     """Command runner for searching.
 
     The class retrieves a list of paths and searches for a given string in the
-    paths. When results are found, the new_search signal is emitted with the
-    index to select and a list of search results.
+    basenames of the paths. When results are found, the new_search signal is emitted
+    with the index to select and the indices of all matches ranked by match quality.
+
+    Instead of the basenames, the value of an indexed metadata key can be searched by
+    passing ``key=value`` as text with metadata enabled.
+
+    Incremental searches are run in a worker thread. Starting a new search cancels any
+    search that is still running, so only the result of the latest search is emitted.
+
+    Class Attributes:
+        pool: QThreadPool to run incremental searches in.
 
     Attributes:
         _text: The string to search for.
         _reverse: Search in reverse mode.
+        _metadata: Search in the indexed metadata instead of the basenames.
+        _index: BasenameIndex of the last searched pathlist.
+        _generation: Number of the latest search used to discard outdated results.
 
     Signals:
         new_search: Emitted when a new search result is found.
             arg1: Integer of the index to select.
-            arg2: List of all search results.
+            arg2: List of the indices of all matches, best match first.
             arg3: Mode for which the search was performed.
             arg4: True if incremental search was performed.
         cleared: Emitted when the search was cleared.
+        finished: Emitted by the search worker when a search has completed.
+            arg1: Generation of the completed search.
+            arg2-5: Arguments of new_search.
     """
 
+    pool = utils.Pool.get(globalinstance=False)
+    pool.setMaxThreadCount(1)  # Superseded searches are cancelled anyway
+
     new_search = Signal(int, list, api.modes.Mode, bool)
     cleared = Signal()
+    finished = Signal(int, int, list, api.modes.Mode, bool)
 
     def __init__(self):
         super().__init__()
         self._text = ""
         self._reverse = False
+        self._metadata = False
+        self._index = BasenameIndex()
+        self._generation = 0
         api.signals.cancel.connect(self.clear)
+        self.finished.connect(self._on_finished)
 
     def __call__(
-        self, text, mode, count=0, reverse=False, incremental=False
+        self, text, mode, count=0, reverse=False, incremental=False, metadata=False
     ):  # pylint: disable=count-default-zero
         """Run search.
 
-        This method is called from the command line and stores text and reverse
-        for the search-next and search-prev commands.
+        This method is called from the command line and stores text, reverse and
+        metadata for the search-next and search-prev commands.
         """
         self._text = text
         self._reverse = reverse
-        self._run(text, mode, count, reverse, incremental)
+        self._metadata = metadata
+        self._run(text, mode, count, reverse, incremental, metadata)
 
     def repeat(self, count, reverse=False):
         """Repeat last search.
@@ -76,25 +339,99 @@ class Search(QObject):
         mode = api.modes.current()
         if not self._text:
             raise api.commands.CommandError("No search performed")
-        self._run(self._text, mode, count, reverse, False)
+        self._run(self._text, mode, count, reverse, False, self._metadata)
 
-    def _run(self, text, mode, count, reverse, incremental):
+    def _run(self, text, mode, count, reverse, incremental, metadata):
         """Implementation of running search."""
-        paths = api.pathlist(mode)
+        self._generation += 1
+        paths = mode.pathlist  # Not copied as it is only compared by identity
         if not paths:
             return
-        current_index = paths.index(api.current_path(mode))
-        basenames = [os.path.basename(path) for path in paths]
-        sorted_paths = _sort_for_search(basenames, current_index, reverse)
-        next_match, matches = _get_next_match(text, count, sorted_paths)
-        index = basenames.index(next_match)
+        if paths is not self._index.source:
+            self._index = BasenameIndex(paths)
+        metadata_key = ""
+        if metadata:
+            key, _, text = text.partition("=")
+            metadata_key = metadata_index.index.resolve_key(key) or ""
+            if not metadata_key:  # Removed from the index keys in the meantime
+                return
+        search_mode = api.settings.search.mode.value
+        ignore_case = api.settings.search.ignore_case.value
+        try:
+            pattern = compile_pattern(text, search_mode, ignore_case)
+        except re.error as e:
+            if not incremental:  # Incomplete expressions are common while typing
+                log.error("Invalid regular expression '%s': %s", text, e)
+            return
+        query = _Query(
+            generation=self._generation,
+            index=self._index,
+            pattern=pattern,
+            search_mode=search_mode,
+            ignore_case=ignore_case,
+            current=self._index.position(mode.current_path),
+            count=count,
+            reverse=reverse,
+            mode=mode,
+            incremental=incremental,
+            metadata_key=metadata_key,
+        )
+        if incremental:
+            self.pool.clear()
+            utils.asyncrun(self._search, query, pool=self.pool)
+        else:
+            self._search(query)
+
+    def _search(self, query: "_Query") -> None:
+        """Search the index and emit the finished signal with the ranked results.
+
+        This may run in the worker thread and is aborted as soon as a newer search was
+        started. Fuzzy matches of basenames are ranked by their cost, all other matches
+        are equally good and only ordered relative to the current index.
+        """
+
+        def cancelled():
+            return query.generation != self._generation
+
+        index, pattern = query.index, query.pattern
+        try:
+            if query.metadata_key:
+                casefold = query.ignore_case and query.search_mode != "regex"
+                indices = metadata_index.index.matches(
+                    index.paths, query.metadata_key, pattern, casefold
+                )
+                ordered = _order_for_search(indices, query.current, query.reverse)
+            elif query.search_mode == "fuzzy":
+                costs = index.fuzzy_matches(pattern, query.ignore_case, cancelled)
+                ordered = _order_for_search(list(costs), query.current, query.reverse)
+                ordered.sort(key=costs.__getitem__)  # Stable, keeps order for ties
+            elif query.search_mode == "regex":
+                indices = index.regex_matches(pattern, cancelled)
+                ordered = _order_for_search(indices, query.current, query.reverse)
+            else:
+                indices = index.glob_matches(pattern, query.ignore_case, cancelled)
+                ordered = _order_for_search(indices, query.current, query.reverse)
+        except SearchCancelled:
+            _logger.debug("Search %d cancelled", query.generation)
+            return
+        next_index = ordered[query.count % len(ordered)] if ordered else query.current
+        self.finished.emit(
+            query.generation, next_index, ordered, query.mode, query.incremental
+        )
+
+    def _on_finished(self, generation, index, matches, mode, incremental):
+        """Emit new_search unless the search was superseded in the meantime."""
+        if generation != self._generation:
+            return
         self.new_search.emit(index, matches, mode, incremental)
         api.status.update("new search")
 
     def clear(self):
         """Clear search string."""
+        self._generation += 1
         self._text = ""
         self._reverse = False
+        self._metadata = False
         self.cleared.emit()
 
     def connect_signals(self):
@@ -110,12 +447,30 @@ class Search(QObject):
     def _on_directory_changed(self, _images, _directories):
         """Re-run search, when the working directory changed."""
         if self._text:
-            self(self._text, api.modes.current())
+            self(self._text, api.modes.current(), metadata=self._metadata)
 
 
 search = Search()
 
 
+def metadata_search(text: str, mode: api.modes.Mode, reverse: bool = False) -> None:
+    """Search the indexed metadata of the current paths.
+
+    Args:
+        text: Text of the form key=value where key is an indexed metadata key.
+        mode: Mode for which the search is performed.
+        reverse: Search in reverse.
+    Raises:
+        api.commands.CommandError if text is invalid or the key is not indexed.
+    """
+    key, sep, _ = text.partition("=")
+    if not sep:
+        raise api.commands.CommandError("Metadata search must be of the form key=value")
+    if metadata_index.index.resolve_key(key) is None:
+        raise api.commands.CommandError(f"Metadata key '{key}' is not indexed")
+    search(text, mode, reverse=reverse, metadata=True)
+
+
 @api.keybindings.register("N", "search-next")
 @api.commands.register(hide=True)
 def search_next(count: int = 1):
@@ -140,42 +495,19 @@ def search_prev(count: int = 1):
     search.repeat(count, reverse=True)
 
 
-def _sort_for_search(paths, index, reverse):
-    """Sort list of paths so the order is usable by search.
+def _order_for_search(indices: List[int], current: int, reverse: bool) -> List[int]:
+    """Order sorted match indices so the order is usable by search.
 
-    This moves the currently selected image to end of the list and the next
-    index to the very front.
+    This moves the first match at or after the currently selected index to the very
+    front and wraps around at the end.
 
     Args:
-        paths: List of paths to sort.
-        index: The currently selected index.
-        reverse: If True sort for reverse search, reversing the list.
+        indices: Sorted list of matching indices.
+        current: The currently selected index.
+        reverse: If True order for reverse search, starting at or before current.
     """
     if reverse:
-        return paths[index::-1] + paths[-1:index:-1]
-    return paths[index:] + paths[:index]
-
-
-def _get_next_match(text, count, paths):
-    """Return the next match from a list of paths.
-
-    Args:
-        text: The string to search for.
-        count: Defines how many matches to jump forward.
-        paths: List of paths to search in.
-    """
-    matches = [path for path in paths if _matches(path, text)]
-    if matches:
-        count = count % len(matches)
-        return matches[count], matches
-    return paths[0], []
-
-
-def _matches(path, pattern):
-    """Return True if path matches pattern.
-
-    This uses fnmatch to perform unix-style filename pattern matching.
-    """
-    if api.settings.search.ignore_case.value:
-        return fnmatch.fnmatchcase(path.lower(), f"*{pattern.lower()}*")
-    return fnmatch.fnmatchcase(path, f"*{pattern}*")
+        split = bisect.bisect_right(indices, current)
+        return indices[:split][::-1] + indices[split:][::-1]
+    split = bisect.bisect_left(indices, current)
+    return indices[split:] + indices[:split]
@@ -6,6 +6,7 @@ from vimiv.qt.core import Qt
 from vimiv.qt.widgets import QWidget, QSizePolicy, QVBoxLayout
 
 from vimiv import api
+from vimiv.commands import search
 from vimiv.completion import completer
 from vimiv.gui import commandline, completionwidget
 
@@ -59,15 +60,25 @@ class CommandWidget(QWidget):
     @api.keybindings.register("?", "search --reverse")
     @api.keybindings.register("/", "search")
     @api.commands.register(hide=True, store=False)
-    def search(self, reverse: bool = False):
+    def search(self, reverse: bool = False, metadata: str = ""):
         """Start a search.
 
-        **syntax:** ``:search [--reverse]``
+        **syntax:** ``:search [--reverse] [--metadata=KEY=VALUE]``
+
+        Example::
+            ``:search --metadata=Model=Canon`` selects the images taken with a camera
+            model matching Canon.
 
         optional arguments:
             * ``--reverse``: Search in reverse direction.
+            * ``--metadata``: Directly search the value of an indexed metadata key of
+              the images in the working directory instead of the basenames. The key
+              must be part of ``metadata.index_keys``, its last part, e.g. ``Model``,
+              is sufficient.
         """
-        if reverse:
+        if metadata:
+            search.metadata_search(metadata, api.modes.current(), reverse=reverse)
+        elif reverse:
             self._enter_command_mode("?")
         else:
             self._enter_command_mode("/")
@@ -89,10 +89,11 @@ class CropWidget(TransformWidget):
         self.update_selected_rect()
         api.status.update("crop widget resized")
 
+    def _accept(self):
+        self.transform.crop(self.crop_rect())
+
     def leave(self, accept: bool = False):
-        """Override leave to crop the image on accept."""
-        if accept:
-            self.transform.crop(self.crop_rect())
+        """Override leave to remove the overlay."""
         self._overlay.deleteLater()
         super().leave(accept)
 
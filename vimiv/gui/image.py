@@ -14,7 +14,7 @@ from vimiv.qt.widgets import (
     QGraphicsPixmapItem,
     QLabel,
 )
-from vimiv.qt.gui import QMovie, QPixmap
+from vimiv.qt.gui import QMovie, QPixmap, QTransform
 from vimiv.qt.svg import QtSvg
 
 from vimiv import api, imutils, utils
@@ -89,6 +89,7 @@ class ScrollableImage(eventhandler.EventHandlerMixin, QGraphicsView):
         self.setOptimizationFlags(QGraphicsView.OptimizationFlag.DontSavePainterState)
 
         api.signals.pixmap_loaded.connect(self._load_pixmap)
+        api.signals.pixmap_transformed.connect(self._load_transformed_pixmap)
         api.signals.movie_loaded.connect(self._load_movie)
         if QtSvg is not None:
             api.signals.svg_loaded.connect(self._load_svg)
@@ -121,6 +122,19 @@ class ScrollableImage(eventhandler.EventHandlerMixin, QGraphicsView):
         item.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
         self._update_scene(item, item.boundingRect(), keep_zoom)
 
+    def _load_transformed_pixmap(self, pixmap: QPixmap, transform: QTransform) -> None:
+        """Load new pixmap into the graphics scene displaying it transformed.
+
+        The transformation is moved such that the transformed pixmap starts at the
+        origin of the scene just like the pixmap transformed by the edit handler.
+        """
+        item = QGraphicsPixmapItem()
+        item.setPixmap(pixmap)
+        item.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
+        rect = transform.mapRect(item.boundingRect())
+        item.setTransform(transform * QTransform.fromTranslate(-rect.x(), -rect.y()))
+        self._update_scene(item, QRectF(0, 0, rect.width(), rect.height()), True)
+
     def _load_movie(self, movie: QMovie, keep_zoom: bool) -> None:
         """Load new movie into the graphics scene."""
         movie.jumpToFrame(0)
@@ -362,7 +376,8 @@ class ScrollableImage(eventhandler.EventHandlerMixin, QGraphicsView):
             return ""
         return self.transformation_module()  # pylint: disable=not-callable
 
-    @api.status.module("{cursor-position}")
+    # Volatile as the cursor position changes without any signal to invalidate it
+    @api.status.module("{cursor-position}", invalidated_by=None)
     def cursor_position(self) -> str:
         """Current cursor position in image coordinates."""
         # Initialize mouse tracking on first call
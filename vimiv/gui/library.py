@@ -5,7 +5,7 @@
 import contextlib
 import math
 import os
-from typing import List, Optional, Dict, NamedTuple, cast
+from typing import List, Optional, Dict, NamedTuple, Set, cast
 
 from vimiv.qt.core import Qt, Slot
 from vimiv.qt.widgets import QStyledItemDelegate, QSizePolicy, QStyle, QWidget
@@ -112,13 +112,13 @@ class Library(
 
     @Slot(int, list, api.modes.Mode, bool)
     def _on_new_search(
-        self, index: int, _matches: List[str], mode: api.modes.Mode, _incremental: bool
+        self, index: int, _matches: List[int], mode: api.modes.Mode, _incremental: bool
     ):
         """Select search result after new search.
 
         Args:
             index: Index to select.
-            _matches: List of all matches of the search.
+            _matches: List of the indices of all matches of the search.
             mode: Mode for which the search was performed.
             _incremental: True if incremental search was performed.
         """
@@ -357,6 +357,7 @@ class Library(
         super()._select_row(row)
         _logger.debug("Selecting library row %d", row)
         current = self.current()
+        api.signals.path_selected.emit(current)
         if emit:
             synchronize.signals.new_library_path_selected.emit(current)
         if open_selected_image and not os.path.isdir(current):
@@ -382,13 +383,13 @@ class LibraryModel(QStandardItemModel):
     Attributes:
         paths: List of currently open paths in the library.
 
-        _highlighted: List of indices that are highlighted as search results.
+        _highlighted: Set of indices that are highlighted as search results.
         _library: Main library object to interact with.
     """
 
     def __init__(self, library: Library):
         super().__init__()
-        self._highlighted: List[int] = []
+        self._highlighted: Set[int] = set()
         self._library = library
         self.paths: List[str] = []
         search.search.new_search.connect(self._on_new_search)
@@ -402,13 +403,19 @@ class LibraryModel(QStandardItemModel):
     def _update_content(self, images: List[str], directories: List[str]):
         """Update library content with new images and directories.
 
+        Search results stay highlighted at the new index of their path.
+
         Args:
             images: Images in the current directory.
             directories: Directories in the current directory.
         """
+        highlighted = {self.paths[i] for i in self._highlighted if i < len(self.paths)}
         self.remove_all_rows()
         self._add_rows(directories, are_directories=True)
         self._add_rows(images, are_directories=False)
+        self._highlighted = {
+            i for i, path in enumerate(self.paths) if path in highlighted
+        }
         self._library.load_directory()
 
     @Slot(list, list)
@@ -422,27 +429,23 @@ class LibraryModel(QStandardItemModel):
 
     @Slot(int, list, api.modes.Mode, bool)
     def _on_new_search(
-        self, _index: int, matches: List[str], mode: api.modes.Mode, _incremental: bool
+        self, _index: int, matches: List[int], mode: api.modes.Mode, _incremental: bool
     ):
-        """Store list of indices to highlight on new search.
+        """Store set of indices to highlight on new search.
 
         Args:
             _index: Index to select.
-            matches: List of all matches of the search.
+            matches: List of the indices of all matches of the search.
             mode: Mode for which the search was performed.
             _incremental: True if incremental search was performed.
         """
         if mode == api.modes.LIBRARY:
-            self._highlighted = [
-                i
-                for i, path in enumerate(self.paths)
-                if os.path.basename(path) in matches
-            ]
+            self._highlighted = set(matches)
 
     @utils.slot
     def _on_search_cleared(self):
         """Reset highlighted when the search results were cleared."""
-        self._highlighted = []
+        self._highlighted = set()
 
     def _mark_highlight(self, path: str, marked: bool = True):
         """(Un-)Highlight a path if it was (un-)marked.
@@ -462,10 +465,11 @@ class LibraryModel(QStandardItemModel):
         """Remove all rows from the model.
 
         This is implemented as a replacement for clear() which does not remove
-        formatting.
+        formatting. The list of paths is replaced, so users of the pathlist such as
+        search can detect changes by identity.
         """
         self.removeRows(0, self.rowCount())
-        self.paths.clear()
+        self.paths = []
 
     def is_highlighted(self, index):
         """Return True if the index is highlighted as search result."""
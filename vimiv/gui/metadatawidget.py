@@ -3,12 +3,12 @@
 """Overlay widget to display image metadata."""
 
 import itertools
-from typing import Optional
+from typing import List, Optional
 
-from vimiv.qt.core import Qt
+from vimiv.qt.core import Qt, Signal
 from vimiv.qt.widgets import QLabel, QSizePolicy, QWidget
 
-from vimiv import api, utils
+from vimiv import api, utils, imutils
 from vimiv.imutils import metadata
 from vimiv.config import styles
 
@@ -19,8 +19,13 @@ class MetadataWidget(QLabel):
     """Overlay widget to display image metadata.
 
     The display of the widget can be toggled by command. It is filled with
-    metadata information of the current image.
+    metadata information of the current image. Metadata that has not been parsed yet is
+    read in a worker thread while a placeholder is displayed. When a new image is opened
+    while the widget is visible, the metadata of its neighbours in the filelist is
+    prefetched so browsing with the open widget does not have to wait for parsing.
 
+    Class Attributes:
+        pool: QThreadPool to read metadata in.
 
     Attributes:
         _mainwindow_bottom: y-coordinate of the bottom of the mainwindow.
@@ -28,8 +33,19 @@ class MetadataWidget(QLabel):
         _path: Absolute path of the current image to load metadata of.
         _current_set: Holds a string of the currently selected keyset.
         _handler: MetadataHandler for _path or None. Use its property for access.
+
+    Signals:
+        fetched: Emitted by the worker when the metadata text was created.
+            arg1: Path of the image the metadata belongs to.
+            arg2: Keyset the metadata was read for.
+            arg3: The formatted metadata text.
     """
 
+    pool = utils.Pool.get(globalinstance=False)
+    pool.setMaxThreadCount(1)  # Current image is read first, followed by neighbours
+
+    fetched = Signal(str, str, str)
+
     STYLESHEET = """
     QLabel {
         font: {statusbar.font};
@@ -56,6 +72,7 @@ class MetadataWidget(QLabel):
 
         api.signals.new_image_opened.connect(self._on_image_opened)
         api.settings.metadata.current_keyset.changed.connect(self._update_text)
+        self.fetched.connect(self._on_fetched)
 
         self.hide()
 
@@ -145,27 +162,49 @@ class MetadataWidget(QLabel):
 
     def _update_text(self):
         """Update the metadata text if the current image has not been loaded."""
-        if self._current_set == api.settings.metadata.current_keyset.value:
+        keyset = api.settings.metadata.current_keyset.value
+        if self._current_set == keyset:
+            return
+        self._current_set = keyset
+        keys = [e.strip() for e in keyset.split(",")]
+        if self.handler.parsed:
+            self._set_text(_format_metadata(self.handler, keys))
             return
         _logger.debug(
-            "%s: reading metadata of %s", self.__class__.__qualname__, self._path
+            "%s: reading metadata of %s in worker",
+            self.__class__.__qualname__,
+            self._path,
         )
-        keys = [
-            e.strip() for e in api.settings.metadata.current_keyset.value.split(",")
-        ]
-        _logger.debug(f"Extracting metadata for keys: {keys}")
-        try:
-            data = self.handler.get_metadata(keys)
-            if data:
-                # Sort data according to order provided in config
-                sorted_data = [data[key] for key in keys if key in data]
-                self.setText(utils.format_html_table(sorted_data))
-            else:
-                self.setText("No matching metadata found")
-        except metadata.MetadataError as e:
-            self.setText(str(e))
+        self._set_text("Reading metadata...")
+        self.pool.clear()
+        utils.asyncrun(self._fetch, self._path, keyset, keys, pool=self.pool)
+
+    def _fetch(self, path: str, keyset: str, keys: List[str]) -> None:
+        """Read and format metadata of path in the worker thread."""
+        text = _format_metadata(metadata.MetadataHandler(path), keys)
+        self.fetched.emit(path, keyset, text)
+
+    @utils.slot
+    def _on_fetched(self, path: str, keyset: str, text: str):
+        """Display the text read by the worker unless it is outdated."""
+        if path == self._path and keyset == self._current_set:
+            self._set_text(text)
+
+    def _set_text(self, text: str) -> None:
+        """Display the formatted metadata text and resize the widget to fit it."""
+        self.setText(text)
         self._update_geometry()
-        self._current_set = api.settings.metadata.current_keyset.value
+
+    def _prefetch_neighbours(self) -> None:
+        """Parse the metadata of the previous and next image in the worker."""
+        paths = imutils.pathlist()
+        try:
+            index = paths.index(self._path)
+        except ValueError:
+            return
+        neighbours = {paths[(index + step) % len(paths)] for step in (1, -1)}
+        neighbours.discard(self._path)
+        utils.asyncrun(metadata.prefetch, *neighbours, pool=self.pool)
 
     @utils.slot
     def _on_image_opened(self, path: str):
@@ -175,3 +214,18 @@ class MetadataWidget(QLabel):
         self._handler = None
         if self.isVisible():
             self._update_text()
+            self._prefetch_neighbours()
+
+
+def _format_metadata(handler: metadata.MetadataHandler, keys: List[str]) -> str:
+    """Return the metadata of keys formatted as html table."""
+    _logger.debug(f"Extracting metadata for keys: {keys}")
+    try:
+        data = handler.get_metadata(keys)
+    except metadata.MetadataError as e:
+        return str(e)
+    if not data:
+        return "No matching metadata found"
+    # Sort data according to order provided in config
+    sorted_data = [data[key] for key in keys if key in data]
+    return utils.format_html_table(sorted_data)
@@ -84,6 +84,9 @@ class StraightenWidget(transformwidget.TransformWidget):
         self.transform.straighten(angle=self.angle, original_size=self._init_size)
         self.update_geometry()
 
+    def _accept(self):
+        self.transform.accept_straighten()
+
     def update_geometry(self):
         """Update geometry of the grid to overlay the image."""
         self.setGeometry(self.image_rect)
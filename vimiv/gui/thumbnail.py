@@ -2,14 +2,15 @@
 
 """Thumbnail widget."""
 
+import collections
 import contextlib
 import math
 import os
-from typing import List, Optional, Iterator, cast
+from typing import Dict, List, Optional, Iterator, Set, cast
 
 from vimiv.qt.core import Qt, QSize, QRect, Slot
 from vimiv.qt.widgets import QListWidget, QListWidgetItem, QStyle, QStyledItemDelegate
-from vimiv.qt.gui import QColor, QIcon
+from vimiv.qt.gui import QColor, QImage, QPixmap
 
 from vimiv import api, utils, imutils, widgets
 from vimiv.commands import argtypes, search, number_for_command
@@ -37,8 +38,12 @@ class ThumbnailView(
     """Thumbnail widget.
 
     Attributes:
+        _created: Set of paths whose thumbnail was created in the current size.
+        _highlighted: Set of indices that are highlighted as search results.
+        _indices: Dictionary mapping every loaded path to its index.
         _manager: ThumbnailManager class to create thumbnails asynchronously.
         _paths: Last paths loaded to avoid duplicate loading.
+        _pending: Set of paths whose thumbnail is being created.
     """
 
     STYLESHEET = """
@@ -80,14 +85,20 @@ class ThumbnailView(
         QListWidget.__init__(self)
 
         self._paths: List[str] = []
+        self._indices: Dict[str, int] = {}
+        self._created: Set[str] = set()
+        self._pending: Set[str] = set()
+        self._highlighted: Set[int] = set()
 
-        fail_pixmap = create_pixmap(
+        fail_image = create_pixmap(
             color=styles.get("thumbnail.error.bg"),
             frame_color=styles.get("thumbnail.frame.fg"),
             size=256,
             frame_size=10,
+        ).toImage()
+        self._manager = thumbnail_manager.ThumbnailManager(
+            fail_image, self._device_size(api.settings.thumbnail.size.value)
         )
-        self._manager = thumbnail_manager.ThumbnailManager(fail_pixmap)
 
         self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
         self.setViewMode(QListWidget.ViewMode.IconMode)
@@ -145,12 +156,21 @@ class ThumbnailView(
     def clear(self):
         """Override clear to also empty paths."""
         self._paths = []
+        self._indices = {}
+        self._created = set()
+        self._pending = set()
         super().clear()
 
     @Slot(list)
     def _on_new_images_opened(self, paths: List[str]):
         """Load new paths into thumbnail widget.
 
+        Thumbnails of paths that were loaded before are moved to their new index without
+        touching the filesystem. Only thumbnails of new paths and of paths whose thumbnail
+        is still being created are requested from the manager, which validates them
+        against the image in its worker threads. Current thumbnails are kept until they
+        are replaced. This keeps e.g. re-ordering the filelist cheap.
+
         Args:
             paths: List of new paths to load.
         """
@@ -158,60 +178,95 @@ class ThumbnailView(
             _logger.debug("No new images to load")
             return
         _logger.debug("Updating thumbnails...")
-        removed = set(self._paths) - set(paths)
-        for path in removed:
-            _logger.debug("Removing existing thumbnail '%s'", path)
-            idx = self._paths.index(path)
-            del self._paths[idx]  # Remove as the index also changes in the QListWidget
-            if not self.takeItem(idx):
-                _logger.error("Error removing thumbnail for '%s'", path)
+        images = {
+            path: self.item(i).image
+            for i, path in enumerate(self._paths)
+            if path in self._created or path in self._pending
+        }
+        while self.count() > len(paths):
+            self.takeItem(self.count() - 1)
         size_hint = QSize(self.item_size(), self.item_size())
+        for i in range(self.count(), len(paths)):
+            ThumbnailItem(self, i, size_hint=size_hint)
+        marked = set(api.mark.paths)
+        created: Set[str] = set()
+        pending: Set[str] = set()
+        indices: List[int] = []
         for i, path in enumerate(paths):
-            if path not in self._paths:  # Add new path
+            item = self.item(i)
+            item.marked = path in marked  # Ensure correct highlighting
+            item.image = images.get(path, ThumbnailItem.default_image())
+            if path in self._created:
+                created.add(path)
+            else:
                 _logger.debug("Adding new thumbnail '%s'", path)
-                ThumbnailItem(self, i, size_hint=size_hint)
-            self.item(i).marked = path in api.mark.paths  # Ensure correct highlighting
+                pending.add(path)
+                indices.append(i)
+        highlighted = [
+            self._paths[i] for i in self._highlighted if i < len(self._paths)
+        ]
         self._paths = paths
-        self._manager.create_thumbnails_async(paths)
-        _logger.debug("... update completed")
+        self._indices = {path: i for i, path in enumerate(paths)}
+        self._highlighted = {
+            self._indices[path] for path in highlighted if path in self._indices
+        }
+        self._created = created
+        self._pending = pending
+        self.viewport().update()
+        self._manager.create_thumbnails_async(
+            [paths[i] for i in indices], indices=indices
+        )
+        _logger.debug("... update completed, creating %d thumbnails", len(indices))
 
     @utils.slot
-    def _on_thumbnail_created(self, index: int, icon: QIcon):
+    def _on_thumbnail_created(self, index: int, path: str, image: QImage):
         """Insert created thumbnail as soon as manager created it.
 
+        The image is only converted to a pixmap by the delegate once the item is painted.
+
         Args:
             index: Index of the created thumbnail as integer.
-            icon: QIcon to insert.
+            path: Path to the image of the created thumbnail.
+            image: QImage to insert.
         """
+        if index >= len(self._paths) or self._paths[index] != path:
+            try:  # The paths have been updated in the meanwhile
+                index = self._indices[path]
+            except KeyError:  # The path has been removed in the meanwhile
+                return
+        self._pending.discard(path)
+        self._created.add(path)
         item = self.item(index)
-        if item is not None:  # Otherwise it has been deleted in the meanwhile
-            item.setIcon(icon)
+        item.image = image
+        self.viewport().update(self.visualItemRect(item))
 
     @Slot(int, list, api.modes.Mode, bool)
     def _on_new_search(
-        self, index: int, matches: List[str], mode: api.modes.Mode, _incremental: bool
+        self, index: int, matches: List[int], mode: api.modes.Mode, _incremental: bool
     ):
         """Select search result after new search.
 
         Args:
             index: Index to select.
-            matches: List of all matches of the search.
+            matches: List of the indices of all matches of the search.
             mode: Mode for which the search was performed.
             _incremental: True if incremental search was performed.
         """
         if self._paths and mode == api.modes.THUMBNAIL:
             self._select_index(index)
-            for item, path in zip(self, self._paths):
-                item.highlighted = os.path.basename(path) in matches
+            self._highlighted = set(matches)
             self.repaint()
 
     @utils.slot
     def _on_search_cleared(self):
         """Reset highlighted and force repaint when search results cleared."""
-        for item in self:
-            item.highlighted = False
+        self._highlighted = set()
         self.repaint()
 
+    def is_highlighted(self, index: int) -> bool:
+        """Return True if the index is highlighted as search result."""
+        return index in self._highlighted
+
     def _mark_highlight(self, path: str, marked: bool = True):
         """(Un-)Highlight a path if it was (un-)marked.
 
@@ -220,8 +275,8 @@ class ThumbnailView(
             marked: True if it was marked.
         """
         try:
-            index = self._paths.index(path)
-        except ValueError:
+            index = self._indices[path]
+        except KeyError:
             _logger.debug("Ignoring mark as thumbnails have not been created")
             return
         item = self.item(index)
@@ -368,8 +423,8 @@ class ThumbnailView(
     @utils.slot
     def _select_path(self, path: str):
         """Select a specific path by name."""
-        with contextlib.suppress(ValueError):
-            self._select_index(self._paths.index(path), emit=False)
+        with contextlib.suppress(KeyError):
+            self._select_index(self._indices[path], emit=False)
 
     def _select_index(self, index: int, emit: bool = True) -> None:
         """Select specific item in the ListWidget.
@@ -383,6 +438,7 @@ class ThumbnailView(
         _logger.debug("Selecting thumbnail number %d", index)
         index = utils.clamp(index, 0, self.count() - 1)
         self.setCurrentRow(index)
+        api.signals.path_selected.emit(self._paths[index])
         if emit:
             synchronize.signals.new_thumbnail_path_selected.emit(self._paths[index])
 
@@ -390,6 +446,25 @@ class ThumbnailView(
         _logger.debug("Setting size to %d", value)
         self.setIconSize(QSize(value, value))
         self.rescale_items()
+        if self._device_size(value) > self._manager.size:
+            self._recreate_thumbnails(self._device_size(value))
+
+    def _device_size(self, size: int) -> int:
+        """Return the size in device pixels for a size in logical pixels."""
+        return int(size * self.devicePixelRatioF())
+
+    def _recreate_thumbnails(self, size: int) -> None:
+        """Re-create all thumbnails in a larger size.
+
+        The current thumbnails are displayed until they are replaced. Smaller sizes keep
+        using the larger thumbnails.
+        """
+        if not self._manager.set_size(size):
+            return
+        _logger.debug("Re-creating thumbnails in size %d", self._manager.size)
+        self._pending |= self._created
+        self._created = set()
+        self._manager.create_thumbnails_async(self._paths)
 
     def item_size(self):
         """Return the size of one icon including padding."""
@@ -469,14 +544,94 @@ class ThumbnailView(
             self.scroll(argtypes.DirectionWithPage.Left, count=steps_x)
 
 
+class PixmapCache:
+    """Least-recently-used cache of pixmaps converted from thumbnail images.
+
+    Converting a QImage to a QPixmap is only possible in the GUI thread. The conversion
+    is therefore done lazily for the items that are painted and the results are kept
+    within a memory budget. Pixmaps are scaled to the size they are drawn at, so painting
+    does not need to scale them. When the size changes, e.g. by zooming, the cache is
+    emptied and the pixmaps are re-created for the new size once they are painted.
+
+    Class Attributes:
+        MAXBYTES: Maximum size of all cached pixmaps in bytes.
+
+    Attributes:
+        _pixmaps: Ordered dictionary mapping the cache key of the image to the pixmap.
+        _nbytes: Current size of all cached pixmaps in bytes.
+        _size: Size in device pixels the cached pixmaps fit into.
+        _ratio: Device pixel ratio of the cached pixmaps.
+    """
+
+    MAXBYTES = 64 * 1024**2
+
+    def __init__(self) -> None:
+        self._pixmaps: "collections.OrderedDict[int, QPixmap]" = (
+            collections.OrderedDict()
+        )
+        self._nbytes = 0
+        self._size = QSize()
+        self._ratio = 1.0
+
+    def get(self, image: QImage, size: QSize, ratio: float = 1.0) -> QPixmap:
+        """Return the pixmap of image scaled to fit into size.
+
+        Args:
+            image: The thumbnail image to convert.
+            size: Size in logical pixels the pixmap is drawn at.
+            ratio: Device pixel ratio of the widget the pixmap is drawn on.
+        """
+        size = QSize(int(size.width() * ratio), int(size.height() * ratio))
+        if size != self._size or ratio != self._ratio:
+            _logger.debug(
+                "Scaling thumbnail pixmaps to %dx%d", size.width(), size.height()
+            )
+            self.clear()
+            self._size, self._ratio = size, ratio
+        key = image.cacheKey()
+        with contextlib.suppress(KeyError):
+            self._pixmaps.move_to_end(key)
+            return self._pixmaps[key]
+        pixmap = QPixmap.fromImage(
+            image.scaled(
+                size,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation,
+            )
+        )
+        pixmap.setDevicePixelRatio(ratio)
+        self._pixmaps[key] = pixmap
+        self._nbytes += self._sizeof(pixmap)
+        while self._nbytes > self.MAXBYTES and len(self._pixmaps) > 1:
+            _, evicted = self._pixmaps.popitem(last=False)
+            self._nbytes -= self._sizeof(evicted)
+        return pixmap
+
+    def clear(self) -> None:
+        """Remove all cached pixmaps."""
+        self._pixmaps.clear()
+        self._nbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._pixmaps)
+
+    @staticmethod
+    def _sizeof(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+
 class ThumbnailDelegate(QStyledItemDelegate):
     """Delegate used for the thumbnail widget.
 
     The delegate draws the items.
+
+    Attributes:
+        pixmaps: PixmapCache of the pixmaps of the painted items.
     """
 
     def __init__(self, parent):
         super().__init__(parent)
+        self.pixmaps = PixmapCache()
 
         # QColor options for background drawing
         self.bg = QColor(styles.get("thumbnail.bg"))
@@ -495,10 +650,10 @@ class ThumbnailDelegate(QStyledItemDelegate):
             model_index: The QModelIndex.
         """
         item = self.parent().item(model_index.row())
-        self._draw_background(painter, option, item)
+        self._draw_background(painter, option, model_index)
         self._draw_pixmap(painter, option, item)
 
-    def _draw_background(self, painter, option, item):
+    def _draw_background(self, painter, option, model_index):
         """Draw the background rectangle of the thumbnail.
 
         The color depends on whether the item is selected and on whether it is
@@ -507,9 +662,9 @@ class ThumbnailDelegate(QStyledItemDelegate):
         Args:
             painter: The QPainter.
             option: The QStyleOptionViewItem.
-            item: The ThumbnailItem.
+            model_index: The QModelIndex.
         """
-        color = self._get_background_color(item, option.state)
+        color = self._get_background_color(model_index, option.state)
         painter.save()
         painter.setBrush(color)
         painter.setPen(Qt.PenStyle.NoPen)
@@ -528,8 +683,6 @@ class ThumbnailDelegate(QStyledItemDelegate):
             item: The ThumbnailItem.
         """
         painter.save()
-        # Original thumbnail pixmap
-        pixmap = item.icon().pixmap(256)
         # Rectangle that can be filled by the pixmap
         rect = QRect(
             option.rect.x() + self.padding,
@@ -537,6 +690,9 @@ class ThumbnailDelegate(QStyledItemDelegate):
             option.rect.width() - 2 * self.padding,
             option.rect.height() - 2 * self.padding,
         )
+        # Thumbnail pixmap pre-scaled to fit into the rectangle
+        ratio = self.parent().devicePixelRatioF()
+        pixmap = self.pixmaps.get(item.image, rect.size(), ratio)
         # Size the pixmap should take
         size = pixmap.size().scaled(rect.size(), Qt.AspectRatioMode.KeepAspectRatio)
         # Coordinates to center the pixmap
@@ -568,53 +724,51 @@ class ThumbnailDelegate(QStyledItemDelegate):
         painter.drawRect(x - width // 2, y - width // 2, width, width)
         painter.restore()
 
-    def _get_background_color(self, item, state):
+    def _get_background_color(self, model_index, state):
         """Return the background color of an item.
 
         The color depends on selected and highlighted as search result.
 
         Args:
-            item: The ThumbnailItem storing highlight status.
+            model_index: The QModelIndex of the item.
             state: State of the model index indicating selected.
         """
         if state & QStyle.StateFlag.State_Selected:
             if api.modes.current() == api.modes.THUMBNAIL:
                 return self.selection_bg
             return self.selection_bg_unfocus
-        if item.highlighted:
+        if self.parent().is_highlighted(model_index.row()):
             return self.search_bg
         return self.bg
 
 
 class ThumbnailItem(QListWidgetItem):
-    """Item storing a single thumbnail and it's search and mark status."""
+    """Item storing a single thumbnail image and it's mark status."""
 
-    _default_icon = None
+    _default_image = None
 
-    def __init__(self, parent, index, *, size_hint, highlighted=False, marked=False):
-        super().__init__(self.default_icon(), "", parent, index)
-        self.highlighted = highlighted
+    def __init__(self, parent, index, *, size_hint, marked=False):
+        super().__init__("", parent, index)
+        self.image = self.default_image()
         self.marked = marked
         self.setSizeHint(size_hint)
 
     @classmethod
-    def default_icon(cls):
-        """Default icon if the thumbnail has not been created.
+    def default_image(cls):
+        """Default image if the thumbnail has not been created.
 
-        The return value is stored to avoid re-creating the pixmap for every thumbnail.
+        The return value is stored to avoid re-creating the image for every thumbnail.
         """
-        if cls._default_icon is None:
-            cls._default_icon = cls.create_default_icon()
-        return cls._default_icon
+        if cls._default_image is None:
+            cls._default_image = cls.create_default_image()
+        return cls._default_image
 
     @classmethod
-    def create_default_icon(cls):
-        """Create the default icon shown if the thumbnail has not been created."""
-        return QIcon(
-            create_pixmap(
-                color=styles.get("thumbnail.default.bg"),
-                frame_color=styles.get("thumbnail.frame.fg"),
-                size=256,
-                frame_size=10,
-            )
-        )
+    def create_default_image(cls):
+        """Create the default image shown if the thumbnail has not been created."""
+        return create_pixmap(
+            color=styles.get("thumbnail.default.bg"),
+            frame_color=styles.get("thumbnail.frame.fg"),
+            size=256,
+            frame_size=10,
+        ).toImage()
@@ -3,7 +3,6 @@
 """Base class for widgets which provide a gui for more complex transformations."""
 
 import contextlib
-import functools
 from typing import cast
 
 from vimiv.qt.core import Qt, QRect
@@ -21,11 +20,16 @@ class TransformWidget(QWidget):
 
     The child class must implement update_geometry to adapt to a resized image and
     should provide additional keybindings which implement the actual transformation.
+    Accepting applies the transformation in the background by calling _accept, which is
+    to be implemented by the child. The widget is left once the transformation was
+    applied, escape cancels.
 
     Attributes:
         bindings: Dictionary mapping keybindings to the corresponding methods.
         transform: Transform instance to perform the actual transformations.
         previous_matrix: Transformation matrix before starting changes here.
+
+        _accepting: True if waiting for the transformation to be applied.
     """
 
     def __init__(self, image):
@@ -36,12 +40,13 @@ class TransformWidget(QWidget):
 
         self.bindings = {
             ("<escape>",): self.leave,
-            ("<return>",): functools.partial(self.leave, accept=True),
+            ("<return>",): self.accept,
         }
         self.transform = imtransform.Transform.instance
         self.previous_matrix = self.transform.matrix
+        self._accepting = False
 
-        image.transformation_module = self.status_info
+        image.transformation_module = self._status
 
         image.resized.connect(self.update_geometry)
 
@@ -57,13 +62,44 @@ class TransformWidget(QWidget):
         """Can be overridden by the child to display information in the status bar."""
         return ""
 
+    def accept(self):
+        """Apply the transformation in the background and leave once it was applied."""
+        if self.transform.processing:
+            return
+        # Still connected if processing was cancelled as a new image was loaded
+        if not self._accepting:
+            self.transform.processed.connect(self._on_processed)
+            self._accepting = True
+        self._accept()
+        api.status.update("transform widget accepting")
+
+    def _accept(self):
+        """Start applying the transformation to the full-resolution image."""
+        raise NotImplementedError("Must be implemented by the actual transformation")
+
+    def _on_processed(self):
+        """Leave accepting the transformation once it was applied."""
+        self.transform.processed.disconnect(self._on_processed)
+        self._accepting = False
+        self.leave(accept=True)
+
+    def _status(self) -> str:
+        """Information displayed in the status bar including any processing."""
+        if self.transform.processing:
+            return "processing..."
+        return self.status_info()
+
     def leave(self, accept: bool = False):
         """Leave the transform widget for image mode.
 
         Args:
-            accept: If True, keep the straightening as transformation.
+            accept: If True, keep the transformation, otherwise cancel any processing.
         """
         if not accept:
+            if self._accepting:
+                self.transform.processed.disconnect(self._on_processed)
+                self._accepting = False
+            self.transform.cancel()
             self.reset_transformations()
             self.transform.apply()
         self.image.transformation_module = None
@@ -84,6 +120,8 @@ class TransformWidget(QWidget):
         with contextlib.suppress(ValueError, KeyError):
             keysequence = eventhandler.keyevent_to_sequence(event)
             binding = self.bindings[keysequence]
+            if self.transform.processing and binding != self.leave:
+                return
             api.status.clear("transform binding")
             binding()
             api.status.update("transform binding")
@@ -31,17 +31,21 @@ widget has been created, the file handler emits one of:
 * ``svg_loaded`` for vector graphics
 
 The image widget in ``vimiv.gui.image`` connects to these signals and displays
-the appropriate Qt widget.
+the appropriate Qt widget. Transformations such as rotate and flip are only displayed
+using the ``pixmap_transformed`` signal and applied to the pixmap once it is needed.
 """
 
-from vimiv.imutils import metadata
+from vimiv.imutils import metadata, metadata_index
 from vimiv.imutils.edit_handler import EditHandler
 from vimiv.imutils.filelist import current, pathlist
 from vimiv.imutils.filelist import SignalHandler as _FilelistSignalHandler
 from vimiv.imutils._file_handler import ImageFileHandler as _ImageFileHandler
+from vimiv.imutils.batch import BatchProcessor as _BatchProcessor
 
 
 def init():
     """Initialize the classes needed for imutils."""
     _FilelistSignalHandler()
     _ImageFileHandler()
+    _BatchProcessor()
+    metadata_index.index.connect_signals()
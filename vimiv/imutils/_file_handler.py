@@ -2,16 +2,27 @@
 
 """Classes to deal with the actual image file."""
 
+import contextlib
 import os
 import shutil
 import tempfile
-from typing import List
+import threading
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 from vimiv.qt.core import QObject, QCoreApplication
-from vimiv.qt.gui import QPixmap, QImageReader, QMovie
+from vimiv.qt.gui import (
+    QImage,
+    QPixmap,
+    QImageReader,
+    QImageWriter,
+    QImageIOHandler,
+    QMovie,
+    QTransform,
+)
 from vimiv.qt.svg import QtSvg
 
 from vimiv import api, utils, imutils
+from vimiv.imutils import current_pixmap
 from vimiv.utils import files, log, asyncrun, imagereader
 
 
@@ -31,6 +42,7 @@ class ImageFileHandler(QObject):
     Attributes:
         _edit_handler: Handler to interact with any changes to the current image.
         _path: Path to the currently loaded QObject.
+        _write_queue: Queue to write images in the background.
     """
 
     @api.objreg.register
@@ -38,6 +50,7 @@ class ImageFileHandler(QObject):
         super().__init__()
         self._path = ""
         self._edit_handler = imutils.EditHandler()
+        self._write_queue = write_queue
 
         api.signals.new_image_opened.connect(self._on_new_image_opened)
         api.signals.all_images_cleared.connect(self._on_images_cleared)
@@ -72,16 +85,15 @@ class ImageFileHandler(QObject):
         if not self._edit_handler.changed:
             return
         if api.settings.image.autowrite:
-            self.write_pixmap(
-                self._edit_handler.pixmap, path, original_path=path, parallel=parallel
-            )
+            self._write_current(path, original_path=path, parallel=parallel)
         else:
             self._edit_handler.reset()
 
     @utils.slot
     def _on_quit(self):
-        """Possibly write changes to disk on quit."""
-        self._maybe_write(self._path, parallel=False)
+        """Possibly write changes to disk on quit and wait for all pending writes."""
+        self._maybe_write(self._path)
+        self._write_queue.flush()
 
     def _load(self, path: str, keep_zoom: bool):
         """Load proper displayable QWidget for a path.
@@ -129,33 +141,241 @@ class ImageFileHandler(QObject):
             * ``path``: Save to this path instead of the current one.
         """
         assert isinstance(path, list), "Must be list from nargs"
-        self.write_pixmap(
-            pixmap=self._edit_handler.pixmap,
-            path=" ".join(path),
-            original_path=self._path,
-        )
+        self._write_current(path=" ".join(path), original_path=self._path)
+
+    def _write_current(self, path, original_path, parallel=True):
+        """Write the current, possibly edited, image to disk.
+
+        If the image was only rotated and flipped, the untransformed pixmap is passed
+        along with the transformation so only the orientation may have to be written.
+        """
+        transform = self._edit_handler.orientation
+        if transform is None:
+            self.write_pixmap(self._edit_handler.pixmap, path, original_path, parallel)
+        else:
+            self.write_pixmap(
+                self._edit_handler.original,
+                path,
+                original_path,
+                parallel,
+                transform=transform,
+            )
 
-    def write_pixmap(self, pixmap, path=None, original_path=None, parallel=True):
+    def write_pixmap(
+        self, pixmap, path=None, original_path=None, parallel=True, transform=None
+    ):
         """Write a pixmap to disk.
 
+        The pixmap is converted to a QImage here in the gui thread, the encoding and
+        writing is then performed by the write queue.
+
         Args:
             pixmap: The QPixmap to write.
             path: The path to save the pixmap to.
             original_path: Original path of the opened pixmap.
             parallel: Perform operation in parallel.
+            transform: Rotation and flip to apply to the pixmap before writing.
         """
         if not path:
             path = original_path = self._path
         path = os.path.abspath(os.path.expanduser(path))
-        if parallel:
-            asyncrun(write_pixmap, pixmap, path, original_path)
-        else:
-            write_pixmap(pixmap, path, original_path)
+        image = pixmap.toImage() if isinstance(pixmap, QPixmap) else pixmap
+        quality, progressive = EncoderOptions.from_settings().for_path(path)
+        self._write_queue.put(
+            WriteJob(
+                image,
+                path,
+                original_path,
+                transform,
+                quality=quality,
+                progressive=progressive,
+            )
+        )
+        if not parallel:
+            self._write_queue.flush()
         self._edit_handler.reset()
 
 
-def write_pixmap(pixmap, path, original_path):
-    """Write pixmap to file.
+class EncoderOptions(NamedTuple):
+    """Encoder settings to write images with.
+
+    The settings are read once in the gui thread, the options can then be used to
+    write images of any format in worker threads.
+
+    Attributes:
+        quality: Encoder quality from 0 to 100, -1 for the default of the format.
+        qualities: Dictionary mapping file extensions to the quality for this format.
+        progressive: Write jpg images as progressive scan.
+    """
+
+    quality: int
+    qualities: Dict[str, int]
+    progressive: bool
+
+    @classmethod
+    def from_settings(cls, quality: Optional[int] = None) -> "EncoderOptions":
+        """Create the options from the current settings.
+
+        Args:
+            quality: Quality to use for all formats instead of the settings.
+        """
+        if quality is not None:
+            qualities = {}
+        else:
+            quality = api.settings.image.write_quality.value
+            qualities = {
+                ext: setting.value
+                for ext, setting in (
+                    (".jpg", api.settings.image.write_quality_jpg),
+                    (".jpeg", api.settings.image.write_quality_jpg),
+                    (".png", api.settings.image.write_quality_png),
+                    (".webp", api.settings.image.write_quality_webp),
+                )
+                if setting.value != -1
+            }
+        return cls(quality, qualities, api.settings.image.write_progressive.value)
+
+    def for_path(self, path: str) -> Tuple[int, bool]:
+        """Return quality and progressive scan to write path with."""
+        ext = os.path.splitext(path)[1].lower()
+        return self.qualities.get(ext, self.quality), self.progressive
+
+
+class WriteJob(NamedTuple):
+    """Storage class for all information required to write an image.
+
+    Attributes:
+        image: The QImage to write.
+        path: Path to write the image to.
+        original_path: Original path of the opened image to retrieve metadata.
+        transform: Rotation and flip to apply to the image before writing.
+        quality: Encoder quality from 0 to 100, -1 for the default of the format.
+        progressive: Write the image as progressive scan if the format supports it.
+    """
+
+    image: QImage
+    path: str
+    original_path: str
+    transform: Optional[QTransform] = None
+    quality: int = -1
+    progressive: bool = False
+
+
+class WriteQueue:
+    """Queue to encode and write images using a bounded number of threads.
+
+    Writes to the same path are serialized. If a path is written to while a previous
+    write to it is still running, the new job waits until the previous one is done.
+    Any older job for the path that is still waiting is replaced by the new one. Writes
+    outside of the queue, e.g. by batch processing, reserve the path to be serialized
+    with the jobs of the queue.
+
+    Class Attributes:
+        THREADS: Maximum number of images written at the same time.
+
+    Attributes:
+        _pool: Thread pool the images are written in.
+        _lock: Condition to access the jobs and running paths from multiple threads.
+        _jobs: Dictionary mapping paths to the job waiting to be written.
+        _running: Set of paths that are currently being written.
+    """
+
+    THREADS = 2
+
+    def __init__(self):
+        self._pool = utils.Pool.get(globalinstance=False)
+        self._pool.setMaxThreadCount(self.THREADS)
+        self._lock = threading.Condition()
+        self._jobs: Dict[str, WriteJob] = {}
+        self._running: Set[str] = set()
+
+    def put(self, job: WriteJob) -> None:
+        """Add a job to the queue and start writing it in the background."""
+        with self._lock:
+            self._jobs.pop(job.path, None)
+            self._jobs[job.path] = job
+        asyncrun(self._work, pool=self._pool)
+
+    def flush(self) -> None:
+        """Block until all jobs in the queue were written.
+
+        Jobs whose thread was never started, e.g. as the thread pool was cleared on
+        exit, are written directly in the calling thread.
+        """
+        self._pool.waitForDone()
+        self._work()
+
+    @contextlib.contextmanager
+    def reserve(self, path: str) -> Iterator[None]:
+        """Block until path is not being written and reserve it for the calling thread.
+
+        Jobs of the queue for path wait until the reservation is released.
+        """
+        with self._lock:
+            self._lock.wait_for(lambda: path not in self._running)
+            self._running.add(path)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._running.discard(path)
+                self._lock.notify_all()
+                waiting = path in self._jobs
+            if waiting:
+                asyncrun(self._work, pool=self._pool)
+
+    def _work(self) -> None:
+        """Write jobs from the queue until there are none left to write."""
+        job = self._next()
+        while job is not None:
+            try:
+                write_image(*job)
+            finally:
+                with self._lock:
+                    self._running.discard(job.path)
+                    self._lock.notify_all()
+            job = self._next()
+
+    def _next(self) -> Optional[WriteJob]:
+        """Return the next job whose path is not being written, None if there is none."""
+        with self._lock:
+            for path, job in self._jobs.items():
+                if path not in self._running:
+                    del self._jobs[path]
+                    self._running.add(path)
+                    return job
+        return None
+
+
+write_queue = WriteQueue()
+
+
+def write_image(
+    image, path, original_path, transform=None, quality=-1, progressive=False
+):
+    """Write image to file logging the result.
+
+    See save_image for the args description.
+    """
+    try:
+        save_image(image, path, original_path, transform, quality, progressive)
+        log.info("Saved %s", path)
+    except WriteError as e:
+        log.error(str(e))
+    except OSError as e:
+        log.error("Error writing '%s': %s", path, e)
+
+
+def save_image(
+    image,
+    path,
+    original_path,
+    transform=None,
+    quality=-1,
+    progressive=False,
+    store_metadata=True,
+):
+    """Save image to file.
 
     This requires both the path to write to and the original path as Exif data
     may be copied from the original path to the new copy. The procedure is to
@@ -164,29 +384,43 @@ def write_pixmap(pixmap, path, original_path):
     final path. The renaming is done as it is an atomic operation and we may be
     overriding the existing file.
 
+    If the image is only rotated and flipped by transform, only the exif orientation tag
+    of the original file is updated instead of re-encoding the image. The file is
+    changed in place if path is the original path, otherwise it is copied to path.
+
+    As only QImage is used, this is safe to call from any thread.
+
     Args:
-        pixmap: The QPixmap to write.
-        path: Path to write the pixmap to.
-        original_path: Original path of the opened pixmap to retrieve metadata.
+        image: The QImage to write.
+        path: Path to write the image to.
+        original_path: Original path of the opened image to retrieve metadata.
+        transform: Rotation and flip to apply to the image before writing.
+        quality: Encoder quality from 0 to 100, -1 for the default of the format.
+        progressive: Write the image as progressive scan if the format supports it.
+        store_metadata: Add the parsed metadata of original_path to the metadata cache.
+            Batch jobs disable this to keep the metadata of recently viewed images.
+
+    Raises:
+        WriteError if writing the image failed.
     """
-    try:
-        _can_write(pixmap, path)
-        _logger.debug("Image is writable")
-        _write(pixmap, path, original_path)
-        log.info("Saved %s", path)
-    except WriteError as e:
-        log.error(str(e))
+    _can_write(image, path)
+    _logger.debug("Image is writable")
+    if transform is not None:
+        if _write_orientation(path, original_path, transform, store_metadata):
+            return
+        image = current_pixmap.transformed_image(image, transform)
+    _write(image, path, original_path, quality, progressive, store_metadata)
 
 
-def _can_write(pixmap, path):
+def _can_write(image, path):
     """Check if it is possible to save the current path.
 
-    See write_pixmap for the args description.
+    See save_image for the args description.
 
     Raises:
         WriteError if writing is not possible.
     """
-    if not isinstance(pixmap, QPixmap):
+    if not isinstance(image, QImage):
         raise WriteError("Cannot write animations")
     if os.path.exists(path):  # Override current path
         reader = QImageReader(path)
@@ -194,20 +428,28 @@ def _can_write(pixmap, path):
             raise WriteError(f"Path '{path}' exists and is not an image")
 
 
-def _write(pixmap, path, original_path):
-    """Write pixmap to disk.
+def _write(
+    image, path, original_path, quality=-1, progressive=False, store_metadata=True
+):
+    """Encode image and write it to disk.
 
-    See write_pixmap for the args description.
+    See save_image for the args description.
     """
-    # Get pixmap type
+    # Get image type
     _, ext = os.path.splitext(path)
     # First create temporary file and then move it to avoid race conditions
     handle, filename = tempfile.mkstemp(suffix=ext)
     os.close(handle)
-    pixmap.save(filename)
+    writer = QImageWriter(filename)
+    writer.setQuality(quality)
+    writer.setProgressiveScanWrite(progressive)
+    if not writer.write(image):
+        os.remove(filename)
+        raise WriteError(f"Error writing '{path}': {writer.errorString()}")
     # Best-effort copy metadata info from original file to new file
     try:
-        imutils.metadata.MetadataHandler(original_path).copy_metadata(filename)
+        handler = imutils.metadata.MetadataHandler(original_path, store=store_metadata)
+        handler.copy_metadata(filename)
     except imutils.metadata.MetadataError:
         pass
     shutil.move(filename, path)
@@ -219,5 +461,54 @@ def _write(pixmap, path, original_path):
         raise WriteError("No valid image written. Is the extention valid?")
 
 
+def _write_orientation(path, original_path, transform, store_metadata=True):
+    """Write the original file to path updating only its exif orientation tag.
+
+    See save_image for the args description.
+
+    Returns:
+        True if the orientation was written, False if the image must be re-encoded.
+    """
+    _, ext = os.path.splitext(path)
+    if ext.lower() != os.path.splitext(original_path)[1].lower():
+        return False
+    # Transformation from the stored image to the displayed original
+    flags = QImageReader(original_path).transformation()
+    operations = (
+        flags & QImageIOHandler.Transformation.TransformationMirror,
+        flags & QImageIOHandler.Transformation.TransformationFlip,
+        flags & QImageIOHandler.Transformation.TransformationRotate90,
+    )
+    stored = imutils.metadata.ExifOrientation.create_transform(*map(bool, operations))
+    orientation = imutils.metadata.ExifOrientation.from_transform(stored * transform)
+    if orientation is None:
+        return False
+    if os.path.exists(path) and os.path.samefile(path, original_path):
+        # Only the tag is rewritten in place, the cached metadata is outdated by mtime
+        handler = imutils.metadata.MetadataHandler(path, store=store_metadata)
+        written = _set_orientation(handler, orientation)
+    else:  # The original file is copied to the new path first
+        handle, filename = tempfile.mkstemp(suffix=ext)
+        os.close(handle)
+        shutil.copyfile(original_path, filename)
+        handler = imutils.metadata.MetadataHandler(filename, store=False)
+        written = _set_orientation(handler, orientation)
+        if written:
+            shutil.move(filename, path)
+        else:
+            os.remove(filename)
+    if written:
+        _logger.debug("Wrote exif orientation %d to '%s'", orientation, path)
+    return written
+
+
+def _set_orientation(handler, orientation):
+    """Write the exif orientation tag using handler returning True on success."""
+    try:
+        return handler.set_orientation(orientation)
+    except imutils.metadata.MetadataError:
+        return False
+
+
 class WriteError(Exception):
-    """Raised when write_pixmap encounters problems."""
+    """Raised when write_image encounters problems."""
@@ -0,0 +1,267 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+"""Process a batch of images in parallel, e.g. to apply edits or export copies.
+
+Every image is processed by one worker thread in a single pipeline: the image is
+decoded, edited, encoded and written to disk including a copy of its metadata. As each
+worker only holds the image it is currently processing, the number of images in memory
+is bounded by the number of threads instead of the number of images. Writing reserves
+the path in the write queue, so it is serialized with other writes to the same path.
+The metadata copied by the workers is not added to the metadata cache, so a large batch
+keeps the cached metadata of the recently viewed images.
+"""
+
+import os
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from vimiv.qt.core import QObject, Signal
+from vimiv.qt.gui import QImage, QImageWriter, QTransform
+
+from vimiv import api, utils
+from vimiv.imutils import current_pixmap, filelist, _file_handler
+from vimiv.imutils.edit_history import StepT
+from vimiv.utils import imagereader, log
+
+
+_logger = log.module_logger(__name__)
+
+
+class BatchProcessor(QObject):
+    """Process a batch of images in parallel and write the results to disk.
+
+    Class Attributes:
+        pool: QThreadPool the images are processed in.
+        PROGRESS_STEP: Percentage of images after which the progress is reported.
+
+    Attributes:
+        _action: Description of the running batch used in the summary.
+        _total: Number of images in the running batch.
+        _done: Number of processed images of the running batch.
+        _failed: Number of images of the running batch that could not be written.
+        _start: Time at which the running batch was started.
+
+    Signals:
+        processed: Emitted by the worker once an image was processed.
+            arg1: True if the image was written successfully.
+    """
+
+    pool = utils.Pool.get(globalinstance=False)
+
+    PROGRESS_STEP = 10
+
+    processed = Signal(bool)
+
+    @api.objreg.register
+    def __init__(self):
+        super().__init__()
+        self._action = ""
+        self._total = self._done = self._failed = 0
+        self._start = 0.0
+        self.processed.connect(self._on_processed)
+
+    @property
+    def running(self) -> bool:
+        return self._done < self._total
+
+    def edit(self, paths: Sequence[str], steps: List[StepT]) -> None:
+        """Apply edit steps to all paths and write them to disk in place."""
+        self._run(
+            "Applied edits to",
+            paths,
+            edit_path,
+            steps,
+            _file_handler.EncoderOptions.from_settings(),
+        )
+
+    @api.commands.register()
+    def export(
+        self,
+        directory: str,
+        size: Optional[int] = None,
+        format: Optional[str] = None,  # pylint: disable=redefined-builtin
+        quality: Optional[int] = None,
+    ):
+        """Export copies of the marked images or of all images in the filelist.
+
+        **syntax:** ``:export [--size=SIZE] [--format=FORMAT] [--quality=QUALITY] dir``
+
+        Images are decoded at the requested size directly, converted and written in
+        parallel including a copy of their metadata. Copies that would have the same
+        name, e.g. images from different directories, get a numbered suffix.
+
+        positional arguments:
+            * ``directory``: Directory to write the copies to.
+
+        optional arguments:
+            * ``--size``: Scale images down to fit into a square of this size.
+            * ``--format``: Convert images to this format, e.g. jpg or webp.
+            * ``--quality``: Encoder quality from 0 to 100 instead of the one defined by
+              the ``image.write_quality`` settings.
+        """
+        paths = api.mark.paths or filelist.pathlist()
+        if not paths:
+            raise api.commands.CommandError("No images to export")
+        if format is not None:
+            format = format.lower().lstrip(".")
+            if format.encode() not in QImageWriter.supportedImageFormats():
+                raise api.commands.CommandError(f"Unsupported image format '{format}'")
+        if size is not None and size <= 0:
+            raise api.commands.CommandError("Size must be positive")
+        directory = os.path.abspath(os.path.expanduser(directory))
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as e:
+            raise api.commands.CommandError(f"Cannot create '{directory}': {e}")
+        self._run(
+            "Exported",
+            paths,
+            export_path,
+            export_destinations(paths, directory, format),
+            size,
+            _file_handler.EncoderOptions.from_settings(quality),
+        )
+
+    def _run(
+        self, action: str, paths: Sequence[str], function: Callable[..., None], *args
+    ) -> None:
+        """Run function with the path and args for all paths in the thread pool.
+
+        Raises:
+            CommandError if another batch is still running.
+        """
+        if self.running:
+            raise api.commands.CommandError("Already processing images")
+        self._action = action
+        self._total, self._done, self._failed = len(paths), 0, 0
+        self._start = time.perf_counter()
+        threads = api.settings.image.manipulate_threads.value or os.cpu_count() or 1
+        self.pool.setMaxThreadCount(threads)
+        _logger.debug("Batch: processing %d images in %d threads", len(paths), threads)
+        for path in paths:
+            utils.asyncrun(self._process, path, function, *args, pool=self.pool)
+        log.info("Processing %d images", len(paths))
+
+    def _process(self, path: str, function: Callable[..., None], *args) -> None:
+        """Run the complete pipeline for one image in the worker thread."""
+        success = False
+        try:
+            function(path, *args)
+            success = True
+        except (ValueError, OSError, _file_handler.WriteError) as e:
+            log.error("Error processing '%s': %s", path, e)
+        finally:
+            self.processed.emit(success)
+
+    @utils.slot
+    def _on_processed(self, success: bool):
+        """Update the progress and print a summary once all images were processed."""
+        self._done += 1
+        self._failed += not success
+        if self.running:
+            step = max(self._total * self.PROGRESS_STEP // 100, 1)
+            if self._done % step == 0:
+                log.info("Processing: %d/%d images", self._done, self._total)
+            return
+        elapsed = time.perf_counter() - self._start
+        log.info(
+            "%s %d images in %.1fs (%.1f images/s), %d failed",
+            self._action,
+            self._total - self._failed,
+            elapsed,
+            self._total / max(elapsed, 1e-6),
+            self._failed,
+        )
+
+
+def edit_path(
+    path: str, steps: List[StepT], options: _file_handler.EncoderOptions
+) -> None:
+    """Apply edit steps to the image at path and write it back in place."""
+    quality, progressive = options.for_path(path)
+    with _file_handler.write_queue.reserve(os.path.abspath(path)):
+        image = edit_image(imagereader.get_reader(path).get_image(), steps)
+        _file_handler.save_image(
+            image,
+            path,
+            path,
+            quality=quality,
+            progressive=progressive,
+            store_metadata=False,
+        )
+
+
+def export_path(
+    path: str,
+    destinations: Dict[str, str],
+    size: Optional[int],
+    options: _file_handler.EncoderOptions,
+) -> None:
+    """Write a copy of the image at path scaled down to fit size to its destination.
+
+    Args:
+        path: Path to the image to export.
+        destinations: Dictionary mapping paths to the path of their copy.
+        size: Size of the square the copy is scaled down to fit into or None.
+        options: Encoder settings to write the copy with.
+    """
+    dest = destinations[path]
+    if dest == os.path.abspath(path):
+        raise _file_handler.WriteError(f"Not overwriting original image '{path}'")
+    quality, progressive = options.for_path(dest)
+    image = imagereader.get_reader(path).get_image(size, upscale=False)
+    with _file_handler.write_queue.reserve(dest):
+        _file_handler.save_image(
+            image,
+            dest,
+            path,
+            quality=quality,
+            progressive=progressive,
+            store_metadata=False,
+        )
+
+
+def export_destinations(
+    paths: Sequence[str], directory: str, file_format: Optional[str]
+) -> Dict[str, str]:
+    """Return a dictionary mapping paths to a unique path of their copy in directory.
+
+    If the names of copies collide, e.g. as images from different directories or with
+    different extensions converted to the same format share a name, the later ones get
+    a numbered suffix.
+
+    Args:
+        paths: Paths to the images to export.
+        directory: Directory to write the copies to.
+        file_format: Format to convert the copies to or None to keep the format.
+    """
+    destinations: Dict[str, str] = {}
+    taken = set()
+    for path in paths:
+        basename, ext = os.path.splitext(os.path.basename(path))
+        if file_format is not None:
+            ext = f".{file_format}"
+        dest = os.path.join(directory, basename + ext)
+        suffix = 1
+        while os.path.normcase(dest) in taken:
+            dest = os.path.join(directory, f"{basename}_{suffix}{ext}")
+            suffix += 1
+        taken.add(os.path.normcase(dest))
+        destinations[path] = dest
+    return destinations
+
+
+def edit_image(image: QImage, steps: List[StepT]) -> QImage:
+    """Return image with all transformation and manipulation steps applied.
+
+    This only works with QImage and is therefore safe to call from any thread.
+    """
+    for step in steps:
+        if isinstance(step, QTransform):
+            image = current_pixmap.transformed_image(image, step)
+        else:
+            # Manipulation steps only exist once immanipulate was imported
+            from vimiv.imutils import immanipulate
+
+            image = immanipulate.manipulate_image(image, *step)
+    return image
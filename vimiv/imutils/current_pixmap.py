@@ -2,7 +2,10 @@
 
 """Storage class for the current pixmap."""
 
-from vimiv.qt.gui import QPixmap
+from typing import Optional, Tuple
+
+from vimiv.qt.core import Qt, QRectF, QSize
+from vimiv.qt.gui import QImage, QPixmap, QTransform
 
 
 class CurrentPixmap:
@@ -12,14 +15,104 @@ class CurrentPixmap:
     classes that wish to access the pixmap simultaneously. Like this they can all share
     this class and access the pixmap through it.
 
+    The pixmap can also be set as an original pixmap with a pending transformation.
+    The transformation is then only applied once the pixmap is accessed, e.g. for
+    writing or cropping, while the image displays the original transformed by the
+    graphics item.
+
     Attributes:
-        pixmap: The current, possibly edited, pixmap.
+        _pixmap: The current, possibly edited, pixmap or None if it is pending.
+        _original: The original pixmap of the pending transformation.
+        _transform: The pending transformation.
     """
 
     def __init__(self):
-        self.pixmap = QPixmap()
+        self._pixmap: Optional[QPixmap] = QPixmap()
+        self._original = QPixmap()
+        self._transform = QTransform()
+
+    @property
+    def pixmap(self) -> QPixmap:
+        """The current pixmap applying any pending transformation."""
+        if self._pixmap is None:
+            self._pixmap = transformed(self._original, self._transform)
+        return self._pixmap
+
+    @pixmap.setter
+    def pixmap(self, pixmap: QPixmap) -> None:
+        self._pixmap = pixmap
+        self._original = QPixmap()
+
+    def transform(self, original: QPixmap, transform: QTransform) -> None:
+        """Set the pixmap as original with a pending transformation."""
+        self._pixmap = None
+        self._original = original
+        self._transform = QTransform(transform)
+
+    @property
+    def source(self) -> Tuple[QPixmap, QTransform]:
+        """The pixmap and the transformation to create the current pixmap from.
+
+        This allows creating the current pixmap outside of the gui thread.
+        """
+        if self._pixmap is None:
+            return self._original, QTransform(self._transform)
+        return self._pixmap, QTransform()
+
+    @property
+    def size(self) -> QSize:
+        """Size of the current pixmap without applying any pending transformation."""
+        if self._pixmap is None:
+            return transformed_size(self._original, self._transform)
+        return self._pixmap.size()
 
     @property
     def editable(self) -> bool:
         """True if the currently opened image is transformable/manipulatable."""
-        return not self.pixmap.isNull()
+        if self._pixmap is None:
+            return not self._original.isNull()
+        return not self._pixmap.isNull()
+
+
+def transformed(pixmap: QPixmap, transform: QTransform) -> QPixmap:
+    """Return pixmap transformed by transform.
+
+    Rotations by multiples of 90 degrees combined with flips only permute the pixels.
+    These are performed as exact mirror and rotate operations instead of resampling.
+    """
+    if transform.isIdentity():
+        return pixmap
+    return QPixmap.fromImage(transformed_image(pixmap.toImage(), transform))
+
+
+def transformed_image(image: QImage, transform: QTransform) -> QImage:
+    """Return image transformed by transform, safe to use outside of the gui thread.
+
+    See transformed for details.
+    """
+    if transform.isIdentity():
+        return image
+    if not is_permutation(transform):
+        return image.transformed(
+            transform, mode=Qt.TransformationMode.SmoothTransformation
+        )
+    if transform.m12() == 0:  # Only flips, rotation by 180 flips in both directions
+        return image.mirrored(transform.m11() < 0, transform.m22() < 0)
+    # Rotation by 90 degrees, possibly followed by flips
+    image = image.transformed(QTransform().rotate(90))
+    return image.mirrored(transform.m21() > 0, transform.m12() < 0)
+
+
+def transformed_size(pixmap: QPixmap, transform: QTransform) -> QSize:
+    """Return the size of pixmap transformed by transform."""
+    return transform.mapRect(QRectF(pixmap.rect())).size().toSize()
+
+
+def is_permutation(transform: QTransform) -> bool:
+    """True if transform only rotates by multiples of 90 degrees and flips."""
+    elements = transform.m11(), transform.m12(), transform.m21(), transform.m22()
+    return (
+        transform.isAffine()
+        and all(element in (-1, 0, 1) for element in elements)
+        and abs(transform.determinant()) == 1
+    )
@@ -2,11 +2,17 @@
 
 """Handler class as man-in-the-middle between file handler and the edit classes."""
 
-from vimiv.qt.core import QObject
-from vimiv.qt.gui import QPixmap
+from typing import Dict, Optional
+
+from vimiv.qt.core import QObject, Signal
+from vimiv.qt.gui import QPixmap, QTransform
 
 from vimiv import api, utils
-from vimiv.imutils import current_pixmap, imtransform
+from vimiv.imutils import batch, current_pixmap, edit_history, imtransform
+from vimiv.utils import log
+
+
+_logger = log.module_logger(__name__)
 
 
 class EditHandler(QObject):
@@ -17,25 +23,71 @@ class EditHandler(QObject):
         manipulate: Manipulate class for more complex changes such as brightness.
 
         _current_pixmap: Class to access and update the currently displayed pixmap.
+        _history: Undo and redo history of the edits of the current image.
         _manipulated: True if manipulations of the current image have been accepted.
+        _replay_generation: Number of the latest replay to discard outdated results.
+        _replaying: Index of the history that is being replayed or None.
+        _replay_pixmaps: Pixmaps of the running replay by cache key of their image.
+
+    Signals:
+        replayed: Emitted by the worker once the history was replayed.
+            arg1: Generation of the replay.
+            arg2: Number of records applied in the replayed state.
+            arg3: The replayed state holding QImage.
+            arg4: Dictionary of the snapshots created when replaying holding QImage.
     """
 
+    replayed = Signal(int, int, object, object)
+
+    @api.objreg.register
     def __init__(self):
         super().__init__()
         self._current_pixmap = current_pixmap.CurrentPixmap()
+        self._history = edit_history.EditHistory()
         self._manipulated = False
+        self._replay_generation = 0
+        self._replaying: Optional[int] = None
+        self._replay_pixmaps: Dict[int, QPixmap] = {}
 
         self.transform = imtransform.Transform(self._current_pixmap)
         self.manipulate = None
 
         self.transform.transformed.connect(self._change_current)
+        self.transform.composed.connect(self._compose_current)
+        self.transform.previewed.connect(self._preview_current)
+        self.transform.edited.connect(self._on_edited)
         api.modes.MANIPULATE.first_entered.connect(self._init_manipulate)
+        api.modes.MANIPULATE.entered.connect(self._cancel_replay)
+        self.replayed.connect(self._on_replayed)
 
     @property
     def changed(self):
         """True if the current image was edited in any way."""
         return self.transform.changed or self._manipulated
 
+    @property
+    def orientation(self) -> Optional[QTransform]:
+        """Transformation of the loaded image if it was only rotated and flipped.
+
+        This is None if the image was edited in any other way than rotating by
+        multiples of 90 degrees and flipping, e.g. cropped or manipulated.
+        """
+        original = self.transform.original
+        if (
+            self._manipulated
+            or original is None
+            or not current_pixmap.is_permutation(self.transform)
+            or self.transform.size
+            != current_pixmap.transformed_size(original, self.transform)
+        ):
+            return None
+        return QTransform(self.transform)
+
+    @property
+    def original(self) -> QPixmap:
+        """The untransformed pixmap the transformations are applied to."""
+        return self.transform.original
+
     @property
     def pixmap(self):
         """The currently displayed pixmap.
@@ -46,14 +98,160 @@ class EditHandler(QObject):
 
     @pixmap.setter
     def pixmap(self, pixmap):
+        self._cancel_replay()
         self._current_pixmap.pixmap = self.transform.original = pixmap
+        self._history.reset(pixmap)
+
+    @property
+    def _index(self) -> int:
+        """Number of applied records of the history including a running replay."""
+        return self._history.index if self._replaying is None else self._replaying
 
     def reset(self):
+        self._cancel_replay()
         self.transform.reset()
         self._manipulated = False
+        self._history.reset(self.transform.original)
 
     def clear(self):
+        self._cancel_replay()
         self._current_pixmap.pixmap = QPixmap()
+        self._history.reset(QPixmap())
+
+    @api.keybindings.register("u", "undo", mode=api.modes.IMAGE)
+    @api.commands.register(mode=api.modes.IMAGE, edit=True)
+    def undo(self, count: int = 1):
+        """Undo the last edit of the current image.
+
+        Edits are transformations such as rotate or crop and accepted manipulations.
+
+        **count:** Number of edits to undo.
+        """
+        if self._index == 0:
+            raise api.commands.CommandError("Nothing to undo")
+        self._goto(max(self._index - count, 0))
+
+    @api.keybindings.register("<ctrl>r", "redo", mode=api.modes.IMAGE)
+    @api.commands.register(mode=api.modes.IMAGE, edit=True)
+    def redo(self, count: int = 1):
+        """Redo the last undone edit of the current image.
+
+        **count:** Number of edits to redo.
+        """
+        if self._index == len(self._history):
+            raise api.commands.CommandError("Nothing to redo")
+        self._goto(min(self._index + count, len(self._history)))
+
+    @api.commands.register(mode=api.modes.IMAGE)
+    def apply_to_marked(self):
+        """Apply the edits of the current image to all marked images.
+
+        Transformations and accepted manipulations are replayed on every marked image
+        in parallel and the results are written to disk in place. Resizing is applied as
+        relative scale. Crop and straighten depend on the content of the current image
+        and are therefore not supported.
+        """
+        paths = api.mark.paths
+        if not paths:
+            raise api.commands.CommandError("No marked images")
+        try:
+            steps = self._history.steps()
+        except ValueError as e:
+            raise api.commands.CommandError(str(e))
+        if not steps:
+            raise api.commands.CommandError("No edits to apply")
+        batch.BatchProcessor.instance.edit(paths, steps)
+
+    def _goto(self, index: int):
+        """Display the state of the edit history after index records.
+
+        Replaying accepted manipulations is expensive for large images. In this case the
+        records are replayed on QImage in the manipulate thread pool, as when accepting
+        the manipulations, and the state is displayed once the replay is done.
+        """
+        self._cancel_replay()
+        start, state, records = self._history.pending(index)
+        if not any(isinstance(rec, edit_history.ManipulateRecord) for rec in records):
+            replayed = edit_history.replay(start, state, records)
+            self._restore(self._history.goto_replayed(index, *replayed))
+            return
+        from vimiv.imutils import immanipulate
+
+        self._replaying = index
+        utils.asyncrun(
+            self._replay,
+            self._replay_generation,
+            index,
+            start,
+            edit_history.to_images(state, self._replay_pixmaps),
+            records,
+            pool=immanipulate.Manipulator.pool,
+        )
+
+    def _replay(
+        self,
+        generation: int,
+        index: int,
+        start: int,
+        state: edit_history.State,
+        records: list,
+    ) -> None:
+        """Replay the records of the edit history on QImage in the worker thread."""
+        from vimiv.imutils import immanipulate
+
+        try:
+            state, snapshots = edit_history.replay(
+                start,
+                state,
+                records,
+                cancelled=lambda: generation != self._replay_generation,
+            )
+        except immanipulate.ManipulationCancelled:
+            _logger.debug("Edit history: replay %d cancelled", generation)
+            return
+        self.replayed.emit(generation, index, state, snapshots)
+
+    def _on_replayed(
+        self,
+        generation: int,
+        index: int,
+        state: edit_history.State,
+        snapshots: Dict[int, edit_history.State],
+    ):
+        """Display the replayed state unless the replay was cancelled.
+
+        The pixmaps are created here in the gui thread reusing the ones of the state the
+        replay started from for images that were not changed.
+        """
+        if generation == self._replay_generation and self._replaying is not None:
+            pixmaps = self._replay_pixmaps
+            state = edit_history.to_pixmaps(state, pixmaps)
+            snapshots = {
+                i: edit_history.to_pixmaps(snapshot, pixmaps)
+                for i, snapshot in snapshots.items()
+            }
+            self._cancel_replay()  # Done, clear the state of the replay
+            self._restore(self._history.goto_replayed(index, state, snapshots))
+
+    def _cancel_replay(self):
+        """Cancel replaying the edit history by invalidating the running replay."""
+        self._replay_generation += 1
+        self._replaying = None
+        self._replay_pixmaps = {}
+
+    def _restore(self, state: edit_history.State):
+        """Display a state of the edit history."""
+        self.transform.restore(state)
+        self._manipulated = self._history.manipulated
+
+    def _on_edited(self, record):
+        """Add the record of a completed edit to the history."""
+        self._cancel_replay()
+        pixmap = self.pixmap if record.snapshot else None
+        self._history.push(
+            record,
+            edit_history.State(self.transform.original, self.transform.matrix, pixmap),
+        )
 
     @utils.slot
     def _change_current(self, pixmap: QPixmap):
@@ -62,6 +260,17 @@ class EditHandler(QObject):
         reload_only = True
         api.signals.pixmap_loaded.emit(pixmap, reload_only)
 
+    @utils.slot
+    def _compose_current(self, original: QPixmap, transform: QTransform):
+        """Update the pending transformation of the current pixmap and display it."""
+        self._current_pixmap.transform(original, transform)
+        api.signals.pixmap_transformed.emit(original, transform)
+
+    @utils.slot
+    def _preview_current(self, preview: QPixmap, transform: QTransform):
+        """Display a preview of the current pixmap without changing it."""
+        api.signals.pixmap_transformed.emit(preview, transform)
+
     @utils.slot
     def _init_manipulate(self):
         """Initialize the Manipulator widget from the immanipulate module."""
@@ -71,8 +280,13 @@ class EditHandler(QObject):
         self.manipulate.accepted.connect(self._on_manipulate_accepted)
 
     @utils.slot
-    def _on_manipulate_accepted(self, pixmap: QPixmap):
+    def _on_manipulate_accepted(self, pixmap: QPixmap, changes: list):
         """Update pixmaps and store the status when manipulations were accepted."""
         self._change_current(pixmap)
         self._manipulated = True
         self.transform.original = pixmap
+        self._on_edited(
+            edit_history.ManipulateRecord(
+                changes, self.manipulate.manipulations.apply_changes
+            )
+        )
@@ -0,0 +1,357 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+"""Undo and redo history of the edits of the current image.
+
+Every edit is stored as a record of its parameters which replays the edit on the state
+before it. Transformations such as rotate, flip and resize only store the resulting
+transformation matrix and are replayed for free. Crop, straighten and manipulations
+are replayable as well, but replaying them is expensive for large images. Their result
+is therefore kept as snapshot as long as all snapshots fit into the memory budget
+defined by the ``image.undo_memory`` setting. If the budget is exceeded, the oldest
+snapshots are dropped first and the corresponding states are replayed from the nearest
+remaining snapshot, or the loaded image, when they are needed again.
+
+Replaying manipulations is only done on states holding QImage, see :func:`to_images`,
+as QPixmap must not be used outside of the gui thread.
+"""
+
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from vimiv.qt.core import QRect
+from vimiv.qt.gui import QImage, QPixmap, QTransform
+
+from vimiv import api
+from vimiv.imutils import current_pixmap
+from vimiv.utils import log
+
+
+_logger = log.module_logger(__name__)
+
+MatrixT = Tuple[float, ...]
+StepT = Union[QTransform, Tuple]  # Transformation or manipulation changes to apply
+
+IDENTITY: MatrixT = (1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0)
+
+ImageT = Union[QPixmap, QImage]
+
+
+class State(NamedTuple):
+    """Storage class for the state of the edited image.
+
+    The state holds either QPixmap or QImage, the latter when replaying in a worker.
+
+    Attributes:
+        original: The untransformed pixmap the transformation matrix is applied to.
+        matrix: Tuple of matrix elements defining the transformation.
+        pixmap: The displayed pixmap or None if it is the transformed original.
+    """
+
+    original: ImageT
+    matrix: MatrixT
+    pixmap: Optional[ImageT] = None
+
+    def current(self) -> ImageT:
+        """Return the displayed pixmap creating it from the original if needed."""
+        if self.pixmap is not None:
+            return self.pixmap
+        return _transformed(self.original, QTransform(*self.matrix))
+
+    def convert(self, convert: Callable[[ImageT], ImageT]) -> "State":
+        """Return the state with original and pixmap converted by convert."""
+        pixmap = None if self.pixmap is None else convert(self.pixmap)
+        return State(convert(self.original), self.matrix, pixmap)
+
+
+class TransformRecord(NamedTuple):
+    """Record of a transformation such as rotate, flip or resize.
+
+    Attributes:
+        matrix: Transformation matrix after the transformation.
+    """
+
+    matrix: MatrixT
+
+    snapshot = False
+
+    def replay(self, state: State) -> State:
+        return State(state.original, self.matrix)
+
+
+class CropRecord(NamedTuple):
+    """Record of cropping the displayed pixmap.
+
+    Attributes:
+        rect: Rectangle of the displayed pixmap that was kept.
+    """
+
+    rect: QRect
+
+    snapshot = True
+
+    def replay(self, state: State) -> State:
+        return State(state.original, state.matrix, state.current().copy(self.rect))
+
+
+class StraightenRecord(NamedTuple):
+    """Record of straightening the original pixmap.
+
+    Attributes:
+        matrix: Transformation matrix including the straighten rotation.
+        rect: Rectangle of the rotated original that was kept.
+    """
+
+    matrix: MatrixT
+    rect: QRect
+
+    snapshot = True
+
+    def replay(self, state: State) -> State:
+        transform = QTransform(*self.matrix)
+        pixmap = _transformed(state.original, transform).copy(self.rect)
+        return State(state.original, self.matrix, pixmap)
+
+
+class ManipulateRecord(NamedTuple):
+    """Record of accepted manipulations.
+
+    The manipulated image becomes the new original of any following transformation. It
+    is only replayed on states holding QImage.
+
+    Attributes:
+        changes: The accepted manipulation changes in the order they were applied.
+        apply: Function to apply the changes to an image.
+    """
+
+    changes: Sequence
+    apply: Callable[..., QPixmap]
+
+    snapshot = True
+
+    def replay(self, state: State, **kwargs) -> State:
+        """Apply the changes to the state passing kwargs such as cancelled to apply."""
+        image = self.apply(state.current(), *self.changes, **kwargs)
+        return State(image, IDENTITY, image)
+
+
+class EditHistory:
+    """Undo and redo history of the edits of the current image.
+
+    Attributes:
+        _base: State of the loaded image.
+        _records: List of all records, the ones after _index can be redone.
+        _snapshots: Dictionary mapping number of applied records to the stored state.
+        _index: Number of records that are currently applied.
+    """
+
+    def __init__(self) -> None:
+        self._base = State(QPixmap(), IDENTITY)
+        self._records: List = []
+        self._snapshots: Dict[int, State] = {}
+        self._index = 0
+
+    @property
+    def index(self) -> int:
+        """Number of records that are currently applied."""
+        return self._index
+
+    @property
+    def can_undo(self) -> bool:
+        return self._index > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self._index < len(self._records)
+
+    @property
+    def manipulated(self) -> bool:
+        """True if any of the applied records is a manipulation."""
+        return any(
+            isinstance(record, ManipulateRecord)
+            for record in self._records[: self._index]
+        )
+
+    def steps(self) -> List[StepT]:
+        """Return the applied edits as steps that can be replayed on other images.
+
+        Consecutive transformations are combined into a single transformation, accepted
+        manipulations are returned as tuple of the manipulation changes. Resizing is
+        replayed as relative scale.
+
+        Raises:
+            ValueError if an edit depends on the image content such as crop.
+        """
+        steps: List[StepT] = []
+        matrix = IDENTITY
+        for record in self._records[: self._index]:
+            if isinstance(record, TransformRecord):
+                matrix = record.matrix
+            elif isinstance(record, ManipulateRecord):
+                if matrix != IDENTITY:
+                    steps.append(QTransform(*matrix))
+                steps.append(tuple(record.changes))
+                matrix = IDENTITY
+            else:
+                name = record.__class__.__name__.replace("Record", "").lower()
+                raise ValueError(f"Cannot apply {name} to other images")
+        if matrix != IDENTITY:
+            steps.append(QTransform(*matrix))
+        return steps
+
+    def reset(self, pixmap: QPixmap) -> None:
+        """Clear the history starting from the unedited pixmap."""
+        self._base = State(pixmap, IDENTITY, pixmap)
+        self._records.clear()
+        self._snapshots.clear()
+        self._index = 0
+
+    def push(self, record, state: State) -> None:
+        """Add a new record replacing any records that could be redone.
+
+        Args:
+            record: The record of the edit that was performed.
+            state: The state after performing the edit.
+        """
+        del self._records[self._index :]
+        self._snapshots = {i: s for i, s in self._snapshots.items() if i < self._index}
+        self._records.append(record)
+        self._index += 1
+        if record.snapshot:
+            self._snapshots[self._index] = state
+        self._prune()
+        _logger.debug("Edit history: added %s", record.__class__.__qualname__)
+
+    def undo(self, count: int = 1) -> State:
+        """Return the state before the last count applied edits."""
+        return self._goto(max(self._index - count, 0))
+
+    def redo(self, count: int = 1) -> State:
+        """Return the state after the next count undone edits."""
+        return self._goto(min(self._index + count, len(self._records)))
+
+    def pending(self, index: int) -> Tuple[int, State, List]:
+        """Return the nearest snapshot before index and the records to replay on it.
+
+        Replaying the records does not access the history. It can therefore be done
+        using replay in any thread, the result is stored using goto_replayed.
+
+        Returns:
+            The number of records applied in the snapshot, the snapshot and the records.
+        """
+        start = max((i for i in self._snapshots if i <= index), default=0)
+        return start, self._snapshots.get(start, self._base), self._records[start:index]
+
+    def goto_replayed(
+        self, index: int, state: State, snapshots: Dict[int, State]
+    ) -> State:
+        """Move to the state after index records that was replayed from pending.
+
+        Args:
+            index: Number of records applied in state.
+            state: The state returned by replay.
+            snapshots: The snapshots returned by replay.
+        """
+        self._snapshots.update(snapshots)
+        self._index = index
+        self._prune()
+        return state
+
+    def _goto(self, index: int) -> State:
+        """Return the state after index records replaying from the nearest snapshot."""
+        start, state, records = self.pending(index)
+        return self.goto_replayed(index, *replay(start, state, records))
+
+    def _prune(self) -> None:
+        """Drop the oldest snapshots until the remaining ones fit into the budget.
+
+        The snapshot of the current state is never dropped as it is displayed anyway.
+        """
+        budget = api.settings.image.undo_memory.value * 1024**2
+        dropable = sorted(i for i in self._snapshots if i != self._index)
+        while dropable and self._nbytes() > budget:
+            del self._snapshots[dropable.pop(0)]
+
+    def _nbytes(self) -> int:
+        """Memory used by the snapshot pixmaps not shared with the loaded image."""
+        pixmaps = {}
+        for i, state in self._snapshots.items():
+            if i == self._index:
+                continue
+            for pixmap in (state.original, state.pixmap):
+                if pixmap is not None:
+                    pixmaps[pixmap.cacheKey()] = pixmap
+        pixmaps.pop(self._base.original.cacheKey(), None)
+        return sum(
+            pixmap.width() * pixmap.height() * pixmap.depth() // 8
+            for pixmap in pixmaps.values()
+        )
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+def replay(
+    start: int, state: State, records: Sequence, **kwargs
+) -> Tuple[State, Dict[int, State]]:
+    """Replay records on the state after start records.
+
+    States holding QImage can be replayed in any thread.
+
+    Args:
+        start: Number of records applied in state.
+        state: The state to replay the records on.
+        records: The records to replay.
+        kwargs: Keyword arguments passed to the replay of manipulations.
+    Returns:
+        The state after all records and the snapshots of the expensive records.
+    """
+    _logger.debug("Edit history: replaying %d records", len(records))
+    snapshots = {}
+    for i, record in enumerate(records, start=start + 1):
+        if isinstance(record, ManipulateRecord):
+            state = record.replay(state, **kwargs)
+        else:
+            state = record.replay(state)
+        if record.snapshot:
+            snapshots[i] = state
+    return state, snapshots
+
+
+def to_images(state: State, pixmaps: Dict[int, QPixmap]) -> State:
+    """Return state holding QImage instead of QPixmap to replay it in a worker.
+
+    Must be called from the gui thread. The pixmaps are added to pixmaps by the cache
+    key of their image so to_pixmaps reuses them for images that were not changed.
+    """
+    images: Dict[int, QImage] = {}
+
+    def convert(pixmap: QPixmap) -> QImage:
+        key = pixmap.cacheKey()
+        if key not in images:
+            images[key] = pixmap.toImage()
+            pixmaps[images[key].cacheKey()] = pixmap
+        return images[key]
+
+    return state.convert(convert)
+
+
+def to_pixmaps(state: State, pixmaps: Dict[int, QPixmap]) -> State:
+    """Return state holding QPixmap created from its QImage in the gui thread.
+
+    Each image is converted only once, the pixmaps are looked up and stored in pixmaps
+    by the cache key of the image.
+    """
+
+    def convert(image: QImage) -> QPixmap:
+        key = image.cacheKey()
+        if key not in pixmaps:
+            pixmaps[key] = QPixmap.fromImage(image)
+        return pixmaps[key]
+
+    return state.convert(convert)
+
+
+def _transformed(original: ImageT, transform: QTransform) -> ImageT:
+    """Return the pixmap or image original transformed by transform."""
+    if isinstance(original, QImage):
+        return current_pixmap.transformed_image(original, transform)
+    return current_pixmap.transformed(original, transform)
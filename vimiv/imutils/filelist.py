@@ -86,7 +86,12 @@ def goto(index: Optional[int], count: Optional[int] = None) -> None:
     _set_index(index)
 
 
-@api.status.module("{abspath}")
+# Signals after which status modules of the current image must be evaluated again
+_PATHS_CHANGED = api.signals.new_images_opened, api.signals.all_images_cleared
+_CURRENT_CHANGED = (api.signals.new_image_opened, *_PATHS_CHANGED)
+
+
+@api.status.module("{abspath}", invalidated_by=_CURRENT_CHANGED)
 def current() -> str:
     """Absolute path to the current image."""
     if _paths:
@@ -94,20 +99,20 @@ def current() -> str:
     return ""
 
 
-@api.status.module("{basename}")
+@api.status.module("{basename}", invalidated_by=_CURRENT_CHANGED)
 def basename() -> str:
     """Basename of the current image."""
     return os.path.basename(current())
 
 
-@api.status.module("{name}")
+@api.status.module("{name}", invalidated_by=_CURRENT_CHANGED)
 def name() -> str:
     """Name without extension of the current image."""
     filename, _ = os.path.splitext(basename())
     return filename
 
 
-@api.status.module("{extension}")
+@api.status.module("{extension}", invalidated_by=_CURRENT_CHANGED)
 def extension() -> str:
     """File extension of the current image."""
     _, fileextension = os.path.splitext(basename())
@@ -122,13 +127,15 @@ def get_index() -> str:  # Needs to be called get as we use index as variable of
     return "0"
 
 
-@api.status.module("{total}")
+@api.status.module("{total}", invalidated_by=_PATHS_CHANGED)
 def total() -> str:
     """Total amount of images."""
     return str(len(_paths))
 
 
-@api.status.module("{exif-date-time}")
+@api.status.module(
+    "{exif-date-time}", invalidated_by=(*_CURRENT_CHANGED, api.signals.image_changed)
+)
 def exif_date_time() -> str:
     """Exif creation date and time of the current image.
 
@@ -15,12 +15,18 @@ includes components of the previous class in the hierarchy.
 .. _adding_new_manipulation:
 
 Adding new manipulations is done by implementing a new :class:`ManipulationGroup` and
-adding it to the ``Manipulations``.
+adding it to the ``Manipulations``. Manipulations that map each R/G/B value
+independently, such as gamma, levels or curves, should implement a :class:`LUTGroup`
+instead. These only compute a lookup table of 256 values and consecutive lookup tables
+are combined into a single pass over the image data.
 """
 
 import abc
-import copy
-from typing import Optional, NamedTuple, List
+import functools
+import itertools
+import os
+import time
+from typing import Callable, Optional, NamedTuple, List, Sequence, Tuple, TypeVar, Union
 
 from vimiv.qt.core import QObject, Signal, Qt, QSignalBlocker, QTimer
 from vimiv.qt.gui import QPixmap, QImage
@@ -36,6 +42,10 @@ from vimiv.imutils import _c_manipulate  # type: ignore
 _logger = utils.log.module_logger(__name__)
 
 
+class ManipulationCancelled(Exception):
+    """Raised when applying manipulations was cancelled before it was done."""
+
+
 class Limits(NamedTuple):
     """Storage class for manipulation value limits."""
 
@@ -100,6 +110,11 @@ class Manipulation(QObject):
     def value(self, value: int) -> None:
         self.slider.setValue(value)
 
+    @property
+    def init_value(self) -> int:
+        """Initial value of the manipulation which does not change the image."""
+        return self._init_value
+
     @property
     def changed(self) -> bool:
         """True if the manipulation was changed."""
@@ -125,8 +140,9 @@ class Manipulation(QObject):
     def __repr__(self) -> str:
         return f"{self.__class__.__qualname__}(name={self.name}, value={self.value})"
 
-    def __copy__(self) -> "Manipulation":
-        return Manipulation(self.name, self.value, *self.limits)
+
+# Name and value of each manipulation of a group
+ParametersT = Tuple[Tuple[str, int], ...]
 
 
 class ManipulationGroup(abc.ABC):
@@ -141,6 +157,10 @@ class ManipulationGroup(abc.ABC):
     * Define the :func:`title` property
     * Implement the abstract method :func:`_apply`
 
+    Changes are applied using parameters, the plain values of the manipulations, which
+    are taken with :func:`snapshot` in the gui thread. Applying them never accesses the
+    manipulations and their widgets, so this is safe in any thread.
+
     Attributes:
         manipulations: Tuple of individual manipulations.
     """
@@ -151,11 +171,6 @@ class ManipulationGroup(abc.ABC):
     def __iter__(self):
         yield from self.manipulations
 
-    def __copy__(self):
-        """Copy manipulations to keep the current values upon copy."""
-        manipulations = (copy.copy(manipulation) for manipulation in self.manipulations)
-        return type(self)(*manipulations)
-
     def __repr__(self):
         return f"{self.__class__.__qualname__}(title={self.title})"
 
@@ -164,14 +179,21 @@ class ManipulationGroup(abc.ABC):
         """True if any manipulation has been changed."""
         return any(manipulation.changed for manipulation in self.manipulations)
 
-    def apply(self, data: bytes) -> bytes:
-        """Apply manipulation function to image data if any manipulation changed.
+    def snapshot(self) -> "ChangeT":
+        """Return the group with the current parameters to apply them later on."""
+        parameters = tuple((m.name, m.value) for m in self.manipulations)
+        return self, parameters
 
-        Wraps the abstract :func:`_apply` with a common setup and finalize part.
-        """
-        if not self.changed:
-            return data
-        return self._apply(data, *self.manipulations)
+    def is_identity(self, parameters: ParametersT) -> bool:
+        """True if applying parameters does not change the image."""
+        return all(
+            value == manipulation.init_value
+            for manipulation, (_, value) in zip(self.manipulations, parameters)
+        )
+
+    def apply(self, data: memoryview, parameters: ParametersT) -> None:
+        """Apply manipulation function in place to image data using parameters."""
+        self._apply(data, *(value for _, value in parameters))
 
     @property
     @abc.abstractmethod
@@ -182,78 +204,89 @@ class ManipulationGroup(abc.ABC):
         """
 
     @abc.abstractmethod
-    def _apply(self, data: bytes, *manipulations: Manipulation) -> bytes:
+    def _apply(self, data: memoryview, *values: int) -> None:
         """Apply all manipulations of this group.
 
-        Takes the image data as raw bytes, applies the changes according the current
-        manipulation values and returns the updated bytes. In general this is associated
-        with a call to a function implemented in the C-extension which manipulates the
-        raw data.
+        Takes a writable buffer of the raw image data and applies the changes according
+        to the manipulation values in place. In general this is associated with a call
+        to a function implemented in the C-extension which manipulates the raw data.
 
         Must be implemented by the child class.
 
         Args:
-            data: The raw image data in bytes to manipulate.
+            data: Writable buffer of the raw image data to manipulate.
+            values: Value of each manipulation in the order of the manipulations.
+        """
+
+
+class LUTGroup(ManipulationGroup):
+    """Base class for a group of manipulations that map each R/G/B value independently.
+
+    Instead of manipulating the image data directly, the group creates a lookup table
+    with the new value for each of the 256 possible values. Consecutive lookup tables are
+    combined by :class:`Manipulations` and applied to the image in a single pass.
+
+    To implement a new lookup table group, implement the abstract method :func:`_lut`
+    instead of :func:`_apply`.
+    """
+
+    def lut(self, parameters: ParametersT) -> bytes:
+        """Return the lookup table of the manipulation values in parameters."""
+        return self._lut(*(value for _, value in parameters))
+
+    def _apply(self, data, *values):
+        _c_manipulate.lut(data, self._lut(*values))
+
+    @abc.abstractmethod
+    def _lut(self, *values: int) -> bytes:
+        """Create the lookup table according to the manipulation values.
+
+        Must be implemented by the child class.
+
         Returns:
-            The updated raw image data in bytes.
+            Bytes with the new value for each of the 256 possible R/G/B values.
         """
 
 
-class BriConGroup(ManipulationGroup):
+class BriConGroup(LUTGroup):
     """Manipulation group for brightness and contrast."""
 
-    def __init__(self, *manipulations: Manipulation):
-        if manipulations:  # For copy construction
-            super().__init__(*manipulations)
-        else:  # Default constructor
-            super().__init__(Manipulation("brightness"), Manipulation("contrast"))
+    def __init__(self):
+        super().__init__(Manipulation("brightness"), Manipulation("contrast"))
 
     @property
     def title(self):
         return "Bri | Con"
 
-    def _apply(self, data, brightness, contrast):
-        return _c_manipulate.brightness_contrast(
-            data, brightness.value / 255, contrast.value / 255
-        )
+    def _lut(self, brightness, contrast):
+        return _c_manipulate.brightness_contrast_lut(brightness / 255, contrast / 255)
 
 
 class HSLGroup(ManipulationGroup):
     """Manipulation group for hue, saturation and lightness."""
 
-    def __init__(self, *manipulations):
-        if manipulations:  # For copy construction
-            super().__init__(*manipulations)
-        else:  # Default constructor
-            super().__init__(
-                Manipulation("hue", lower=-180, upper=180),
-                Manipulation("saturation", lower=-100, upper=100),
-                Manipulation("lightness", lower=-100, upper=100),
-            )
+    LIMIT = 100  # Of saturation and lightness
+
+    def __init__(self):
+        super().__init__(
+            Manipulation("hue", lower=-180, upper=180),
+            Manipulation("saturation", lower=-self.LIMIT, upper=self.LIMIT),
+            Manipulation("lightness", lower=-self.LIMIT, upper=self.LIMIT),
+        )
 
     @property
     def title(self):
         return "Hue | Sat | Light"
 
     def _apply(self, data, hue, saturation, lightness):
-        return _c_manipulate.hue_saturation_lightness(
-            data,
-            hue.value,
-            saturation.value / saturation.limits.upper,
-            lightness.value / lightness.limits.upper,
+        _c_manipulate.hue_saturation_lightness(
+            data, hue, saturation / self.LIMIT, lightness / self.LIMIT
         )
 
 
-class ManipulationChange(NamedTuple):
-    """Storage class for a manipulation change.
-
-    Attributes:
-        pixmap: The manipulated pixmap.
-        manipulations: The manipulation group associated to these changes.
-    """
-
-    pixmap: QPixmap
-    manipulations: ManipulationGroup
+# Group and the parameters to apply, manipulated pixmaps are created on demand
+ChangeT = Tuple[ManipulationGroup, ParametersT]
+StepT = Union[bytes, ChangeT]  # Fused lookup table or change to apply
 
 
 class Manipulations(list):
@@ -264,12 +297,24 @@ class Manipulations(list):
     manipulations.
 
     Applying manipulations can be done for a single manipulation using apply and for
-    multiple groups using apply_groups.
+    multiple changes using apply_changes. The image is split into bands of rows which are
+    manipulated in parallel, the number of threads is defined by the
+    ``image.manipulate_threads`` setting.
+
+    Class Attributes:
+        pool: QThreadPool to manipulate bands of the image in parallel.
+        BANDS_PER_THREAD: Number of bands per thread for load balancing and progress.
+        MIN_BAND_ROWS: Minimum number of rows in one band.
 
     Attributes:
         groups: Tuple of all manipulation groups.
     """
 
+    pool = utils.Pool.get(globalinstance=False)
+
+    BANDS_PER_THREAD = 4
+    MIN_BAND_ROWS = 64
+
     def __init__(self):
         self.groups = (BriConGroup(), HSLGroup())
         super().__init__(utils.flatten([group.manipulations for group in self.groups]))
@@ -281,46 +326,153 @@ class Manipulations(list):
                 return group
         raise KeyError(f"Unknown manipulation {manipulation}")
 
-    def apply_groups(self, pixmap: QPixmap, *groups: ManipulationGroup) -> QPixmap:
-        """Manipulate pixmap according all manipulations in groups.
+    def apply_changes(
+        self,
+        image: QImage,
+        *changes: Optional[ChangeT],
+        progress: Optional[Callable[[int], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+    ) -> QImage:
+        """Return a copy of image manipulated according to all changes.
+
+        Only QImage is involved, this is therefore safe to call from any thread.
 
         Args:
-            pixmap: The QPixmap to manipulate.
-            groups: Manipulation groups containing all manipulations to apply in series.
+            image: The QImage to manipulate.
+            changes: Groups with the parameters to apply in series.
+            progress: Function called with the percentage of processed bands.
+            cancelled: Function returning True if the manipulation should be cancelled.
         Returns:
-            The manipulated pixmap.
+            The manipulated image.
+        Raises:
+            ManipulationCancelled: If cancelled returned True before all bands were done.
         """
-        _logger.debug("Manipulate: applying %d groups", len(groups))
-        image = pixmap.toImage()
-        bits = image.constBits()
-        # Convert original pixmap to python bytes
-        if qt.USE_PYSIDE6:
-            data = bits.tobytes()
-        elif qt.USE_PYQT6:
-            bits.setsize(image.sizeInBytes())
-            data = bits.asstring()
-        else:
-            bits.setsize(image.byteCount())
-            data = bits.asstring()
-        # Apply changes on the byte-level
-        for group in groups:
-            data = self._apply_group(group, data)
-        # Convert updated bytes back to pixmap
-        image = QImage(
-            data, image.width(), image.height(), image.bytesPerLine(), image.format()
+        _logger.debug("Manipulate: applying %d changes", len(changes))
+        steps = _compile(changes)
+        if not steps:  # Nothing changed
+            return image
+        # Same format returns a shallow copy which is detached when accessing the data
+        image = image.convertToFormat(
+            image.format()
+            if image.format() in _PIXEL_FORMATS
+            else QImage.Format.Format_ARGB32
+        )
+        data = _image_buffer(image)
+        threads = _thread_count()
+        n_bands = min(
+            threads * self.BANDS_PER_THREAD, image.height() // self.MIN_BAND_ROWS
         )
-        return QPixmap(image.copy())  # copy ensures correct data storage via Qt
+        bands = _split_bands(data, image.height(), image.bytesPerLine(), n_bands)
+        processed = itertools.count(1)
+
+        def apply_band(band: memoryview) -> None:
+            if cancelled is None or not cancelled():
+                _apply_steps(band, steps)
+                if progress is not None:
+                    progress(100 * next(processed) // len(bands))
+
+        # Apply changes in place on the byte-level, all changes share the same buffer
+        # The calling thread works on the first band while the pool takes the others
+        self.pool.setMaxThreadCount(max(threads - 1, 1))
+        for band in bands[1:]:
+            utils.asyncrun(apply_band, band, pool=self.pool)
+        apply_band(bands[0])
+        self.pool.waitForDone()
+        for band in bands:
+            band.release()
+        data.release()
+        if cancelled is not None and cancelled():
+            raise ManipulationCancelled()
+        return image
+
+    def apply(self, image: QImage, manipulation: Manipulation) -> QImage:
+        """Return a copy of image manipulated according to single manipulation."""
+        return self.apply_changes(image, self.group(manipulation).snapshot())
+
+
+def manipulate_image(image: QImage, *changes: Optional[ChangeT]) -> QImage:
+    """Return image manipulated according to all changes.
+
+    In contrast to :meth:`Manipulations.apply_changes` the image is manipulated in place
+    in the calling thread only. This is used to manipulate many images in parallel, one
+    per thread.
+    """
+    steps = _compile(changes)
+    if not steps:  # Nothing changed
+        return image
+    if image.format() not in _PIXEL_FORMATS:
+        image = image.convertToFormat(QImage.Format.Format_ARGB32)
+    data = _image_buffer(image)
+    _apply_steps(data, steps)
+    data.release()
+    return image
+
+
+# 32 bit formats the manipulations can work on directly
+_PIXEL_FORMATS = (
+    QImage.Format.Format_RGB32,
+    QImage.Format.Format_ARGB32,
+    QImage.Format.Format_ARGB32_Premultiplied,
+)
+
+
+def _compile(changes: Sequence[Optional[ChangeT]]) -> List[StepT]:
+    """Compile the changes into steps that are applied to the image in series.
+
+    Consecutive lookup table changes are fused into a single lookup table, all other
+    changes are applied as they are.
+    """
+    steps: List[StepT] = []
+    for change in changes:
+        if change is None or change[0].is_identity(change[1]):
+            continue
+        group, parameters = change
+        _logger.debug("Manipulate: compiling %r with %s", group, parameters)
+        if not isinstance(group, LUTGroup):
+            steps.append(change)
+        elif steps and isinstance(steps[-1], bytes):
+            # Map through both tables
+            steps[-1] = steps[-1].translate(group.lut(parameters))
+        else:
+            steps.append(group.lut(parameters))
+    return steps
+
 
-    def apply(self, pixmap: QPixmap, manipulation: Manipulation) -> QPixmap:
-        """Manipulate pixmap according to single manipulation."""
-        return self.apply_groups(pixmap, self.group(manipulation))
+def _apply_steps(data: memoryview, steps: Sequence[StepT]) -> None:
+    """Apply the compiled steps in series to image data in place."""
+    for step in steps:
+        if isinstance(step, bytes):
+            _c_manipulate.lut(data, step)
+        else:
+            group, parameters = step
+            group.apply(data, parameters)
 
-    def _apply_group(self, group: Optional[ManipulationGroup], data: bytes) -> bytes:
-        """Apply manipulations of a single group to image."""
-        if group is None:
-            return data
-        _logger.debug("Manipulate: applying group %r", group)
-        return group.apply(data)
+
+def _image_buffer(image: QImage) -> memoryview:
+    """Return a writable memoryview of the pixel data of image without copying it."""
+    bits = image.bits()  # Non-const access detaches the image data from the pixmap
+    if qt.USE_PYSIDE6:
+        return memoryview(bits)
+    if qt.USE_PYQT6:
+        bits.setsize(image.sizeInBytes())
+    else:
+        bits.setsize(image.byteCount())
+    return memoryview(bits)
+
+
+def _thread_count() -> int:
+    """Return the number of threads to manipulate with according to the setting."""
+    return api.settings.image.manipulate_threads.value or os.cpu_count() or 1
+
+
+def _split_bands(
+    data: memoryview, height: int, bytes_per_line: int, n_bands: int
+) -> List[memoryview]:
+    """Split image data into at most n_bands bands of complete rows."""
+    n_bands = max(min(n_bands, height), 1)
+    rows = max(-(-height // n_bands), 1)  # Ceil division to cover all rows
+    step = rows * bytes_per_line
+    return [data[start : start + step] for start in range(0, len(data), step)]
 
 
 class Manipulator(QObject):
@@ -329,30 +481,62 @@ class Manipulator(QObject):
     Provides commands for more complex manipulations like brightness and
     contrast. Acts as binding link between the manipulations and the gui interface.
 
+    The preview is created progressively. Changes are first applied to a small proxy
+    of the screen-sized image for instant feedback and refined on the screen-sized
+    image once no further change happened for the refine delay. The delay adapts to
+    the time taken by the last refined preview.
+
     Class Attributes:
         pool: QThreadPool to apply manipulations in parallel.
+        PROXY_SCALE: Factor by which the proxy is smaller than the screen-sized pixmap.
+        REFINE_FACTOR: Multiple of the last refine time used as refine delay.
+        REFINE_DELAY_MS: Lower and upper limit of the refine delay in ms.
 
     Attributes:
         manipulations: Manipulations class storing all manipulations.
 
-        _changes: List of applied ManipulationChanges.
+        _changes: List of applied changes, groups with the parameters to apply.
         _current_manipulation: Currently edited/focused manipulation.
         _current_pixmap: Class to access the currently displayed pixmap.
-        _pixmap: Pixmap to apply current manipulation to.
-        _manipulated: Pixmap after applying current manipulation.
+        _image: Screen-sized unmanipulated QImage the preview is created from.
+        _proxy: Small proxy of _image for instant previews.
+        _generation: Number of the latest accept run to discard outdated results.
+        _progress: Percentage of the running accept or None if not accepting.
+        _preview_generation: Number of the latest change to discard outdated previews.
+        _refine_delay: Current refine delay in ms.
+        _refine_timer: Single-shot QTimer to refine the preview once input settled.
 
     Signals:
         accepted: Emitted when the applied manipulations where accepted.
             arg1: The manipulated pixmap with the accepted changes.
+            arg2: List of the accepted changes in the order applied.
         updated: Emitted when the manipulated pixmap was changed.
             arg1: The new manipulated QPixmap.
+        progressed: Emitted by the worker when accepting made progress.
+            arg1: Generation of the accept run.
+            arg2: Percentage of the full-scale image that was processed.
+        processed: Emitted by the worker when the full-scale image was processed.
+            arg1: Generation of the accept run.
+            arg2: The manipulated full-scale QImage.
+            arg3: List of the changes applied to the image.
+        previewed: Emitted by the worker when a preview was manipulated.
+            arg1: Generation of the change the preview belongs to.
+            arg2: True if the screen-sized preview was refined, False for the proxy.
+            arg3: The manipulated QImage.
     """
 
     pool = utils.Pool.get(globalinstance=False)
     pool.setMaxThreadCount(1)  # Only one manipulation is run in parallel
 
-    accepted = Signal(QPixmap)
+    PROXY_SCALE = 8
+    REFINE_FACTOR = 2
+    REFINE_DELAY_MS = 50, 300
+
+    accepted = Signal(QPixmap, list)
     updated = Signal(QPixmap)
+    progressed = Signal(int, int)
+    processed = Signal(int, QImage, list)
+    previewed = Signal(int, bool, QImage)
 
     @api.objreg.register
     def __init__(self, current_pixmap: QPixmap):
@@ -360,15 +544,25 @@ class Manipulator(QObject):
 
         self.manipulations = Manipulations()
 
-        self._changes: List[ManipulationChange] = []
+        self._changes: List[ChangeT] = []
         self._current_manipulation = self.manipulations[0]  # Default manipulation
         self._current_manipulation.focus()
         self._current_pixmap = current_pixmap
-        self._pixmap = self._manipulated = None
+        self._image: Optional[QImage] = None
+        self._proxy: Optional[QImage] = None
+        self._generation = 0
+        self._progress: Optional[int] = None
+        self._preview_generation = 0
+        self._refine_delay = self.REFINE_DELAY_MS[0]
+        self._refine_timer = QTimer(self)
+        self._refine_timer.setSingleShot(True)
 
         api.modes.MANIPULATE.entered.connect(self._enter)
         api.modes.MANIPULATE.closed.connect(self._reset)
-        self.updated.connect(self._on_updated)
+        self._refine_timer.timeout.connect(self._refine_preview)
+        self.previewed.connect(self._on_previewed)
+        self.progressed.connect(self._on_progressed)
+        self.processed.connect(self._on_processed)
         for manipulation in self.manipulations:
             manipulation.updated.connect(self._apply_manipulation)
 
@@ -380,20 +574,73 @@ class Manipulator(QObject):
     @api.keybindings.register("<return>", "accept", mode=api.modes.MANIPULATE)
     @api.commands.register(mode=api.modes.MANIPULATE)
     def accept(self):
-        """Leave manipulate accepting the applied changes."""
-        if self._changed:  # Only run the expensive part when needed
-            self._save_changes()  # For the current manipulation
-            pixmap = self.manipulations.apply_groups(
-                self._current_pixmap.pixmap,
-                *[change.manipulations for change in self._changes],
-            )  # Apply all changes to the full-scale pixmap
-            self.accepted.emit(pixmap)
-        api.modes.MANIPULATE.close()
+        """Leave manipulate accepting the applied changes.
+
+        The changes are applied to the full-scale image in the background while the
+        preview remains displayed. Use ``:discard`` to cancel.
+        """
+        # The worker only gets the QImage, QPixmap must stay in the gui thread
+        if self._progress is not None:  # Already accepting
+            return
+        if not self._changed and not self._changes:  # Nothing to apply
+            api.modes.MANIPULATE.close()
+            return
+        self._save_changes()  # For the current manipulation
+        self._generation += 1
+        self._progress = 0
+        utils.asyncrun(
+            self._apply_changes,
+            self._generation,
+            self._current_pixmap.pixmap.toImage(),
+            list(self._changes),
+            pool=self.pool,
+        )
+        api.status.update("manipulate accept started")
+
+    def _apply_changes(
+        self, generation: int, image: QImage, changes: List[ChangeT]
+    ) -> None:
+        """Apply the accepted changes to the full-scale image in the worker thread."""
+        try:
+            image = self.manipulations.apply_changes(
+                image,
+                *changes,
+                progress=functools.partial(self.progressed.emit, generation),
+                cancelled=lambda: generation != self._generation,
+            )
+        except ManipulationCancelled:
+            _logger.debug("Manipulate: accepting %d cancelled", generation)
+            return
+        self.processed.emit(generation, image, changes)
+
+    @utils.slot
+    def _on_progressed(self, generation: int, progress: int):
+        if generation == self._generation and self._progress is not None:
+            self._progress = progress
+            api.status.update("manipulate accept progressed")
+
+    @utils.slot
+    def _on_processed(self, generation: int, image: QImage, changes: list):
+        """Swap in the manipulated full-scale image unless accepting was cancelled.
+
+        The changes are the ones the image was manipulated with when accepting.
+        """
+        if generation == self._generation and self._progress is not None:
+            self.accepted.emit(QPixmap.fromImage(image), changes)
+            api.modes.MANIPULATE.close()
 
     @api.keybindings.register("<escape>", "discard", mode=api.modes.MANIPULATE)
     @api.commands.register(mode=api.modes.MANIPULATE)
     def discard(self):
-        """Discard any changes and leave manipulate."""
+        """Discard any changes and leave manipulate.
+
+        If the changes are currently being accepted, only cancel accepting them.
+        """
+        if self._progress is not None:
+            _logger.debug("Manipulate: cancelling accept %d", self._generation)
+            self._cancel_accept()
+            api.status.update("manipulate accept cancelled")
+            return
         api.modes.MANIPULATE.close()
         self._reset()
 
@@ -427,8 +674,16 @@ class Manipulator(QObject):
         """Reset manipulations to default."""
         for manipulation in self.manipulations:
             manipulation.reset()
-        self._pixmap = self._manipulated = None
+        self._image = self._proxy = None
         self._changes.clear()
+        self._refine_timer.stop()
+        self._preview_generation += 1
+        self._cancel_accept()
+
+    def _cancel_accept(self):
+        """Cancel accepting changes by invalidating the running accept."""
+        self._generation += 1
+        self._progress = None
 
     @api.keybindings.register(("K", "L"), "increase 10", mode=api.modes.MANIPULATE)
     @api.keybindings.register(("k", "l"), "increase 1", mode=api.modes.MANIPULATE)
@@ -476,24 +731,81 @@ class Manipulator(QObject):
         self._current_manipulation.value = count if count is not None else value
 
     def _apply_manipulation(self, manipulation: Manipulation):
-        """Apply changes to displayed image according to an updated manipulation."""
+        """Apply changes to displayed image according to an updated manipulation.
+
+        The proxy is manipulated right away for instant feedback. The screen-sized
+        preview is refined once no further change happened for the refine delay.
+        """
         self._focus(manipulation)
-        self.pool.clear()
-        self._run_manipulation_thread(manipulation)
+        self._update_preview()
         api.status.update("manipulate processing")
 
-    @utils.throttled(delay_ms=300)
-    @utils.asyncfunc(pool=pool)
-    def _run_manipulation_thread(self, manipulation):
-        """Run manipulation in the thread pool.
+    def _update_preview(self):
+        """Manipulate the proxy right away and schedule refining the preview."""
+        if self._progress is None:  # Do not drop the pending accept
+            self.pool.clear()
+        self._preview_generation += 1
+        if self._proxy is not None:
+            utils.asyncrun(
+                self._run_preview,
+                self._preview_generation,
+                self._proxy,
+                self._preview_changes(),
+                False,
+                pool=self.pool,
+            )
+        self._refine_timer.start(self._refine_delay)
+
+    def _preview_changes(self) -> List[ChangeT]:
+        """Return all stored changes followed by the change of the current group.
+
+        The parameters are taken in the gui thread, the worker never reads the sliders.
+        """
+        current_group = self.manipulations.group(self._current_manipulation)
+        return self._changes + [current_group.snapshot()]
+
+    def _refine_preview(self):
+        """Manipulate the screen-sized preview in the worker once input settled."""
+        # self._image is None if manipulate mode has been left
+        if self._image is not None:
+            utils.asyncrun(
+                self._run_preview,
+                self._preview_generation,
+                self._image,
+                self._preview_changes(),
+                True,
+                pool=self.pool,
+            )
 
-        The function is throttled to keep the number of manipulations done reasonable in
-        case of dragging the slider or keeping a key repeat.
+    def _run_preview(
+        self,
+        generation: int,
+        image: QImage,
+        changes: List[ChangeT],
+        refined: bool,
+    ) -> None:
+        """Manipulate the proxy or the screen-sized preview in the worker thread.
+
+        The time taken for the screen-sized preview defines the refine delay. Slow
+        manipulations are refined less eagerly to keep the worker free for the proxy.
         """
-        # self._pixmap is None if manipulate mode has been left
-        if self._pixmap is not None:
-            pixmap = self.manipulations.apply(self._pixmap, manipulation)
-            self.updated.emit(pixmap)
+        if generation != self._preview_generation:  # Outdated by a newer change
+            return
+        start = time.perf_counter()
+        image = self.manipulations.apply_changes(image, *changes)
+        if refined:
+            elapsed_ms = int((time.perf_counter() - start) * 1000)
+            self._refine_delay = utils.clamp(
+                self.REFINE_FACTOR * elapsed_ms, *self.REFINE_DELAY_MS
+            )
+        self.previewed.emit(generation, refined, image)
+
+    @utils.slot
+    def _on_previewed(self, generation: int, refined: bool, image: QImage):
+        """Display the manipulated preview unless it is outdated."""
+        if generation == self._preview_generation and self._image is not None:
+            self.updated.emit(QPixmap.fromImage(image))
+        api.status.update("manipulate pixmap updated")
 
     @utils.slot
     def focus_group_index(self, index: int):
@@ -512,7 +824,12 @@ class Manipulator(QObject):
 
     @api.status.module("{processing}")
     def _processing_indicator(self):
-        """Print ``processing...`` if manipulations are running."""
+        """Print ``processing...`` if manipulations are running.
+
+        While the changes are accepted, the processed percentage is added.
+        """
+        if self._progress is not None:
+            return f"processing... {self._progress}%"
         if self.pool.activeThreadCount():
             return "processing..."
         return ""
@@ -522,7 +839,8 @@ class Manipulator(QObject):
 
         As the pixmap is only displayed in the bottom right, scaling it to be half the
         total screen width / height is always sufficiently large. This avoids working
-        with the large original when it is not needed.
+        with the large original when it is not needed. The preview is manipulated in
+        the worker, the images are therefore created here in the gui thread.
         """
         if not self._current_pixmap.editable:
             api.modes.MANIPULATE.close()
@@ -531,41 +849,46 @@ class Manipulator(QObject):
             )
             return
         screen_geometry = QApplication.primaryScreen().geometry()
-        # Workaround for different keyword naming in PySide6
-        if qt.USE_PYSIDE6:
-            self._pixmap = self._current_pixmap.pixmap.scaled(
-                screen_geometry.width(),
-                screen_geometry.height(),
-                aspectMode=Qt.AspectRatioMode.KeepAspectRatio,
-                mode=Qt.TransformationMode.SmoothTransformation,
-            )
-        else:
-            self._pixmap = self._current_pixmap.pixmap.scaled(
-                screen_geometry.width(),
-                screen_geometry.height(),
-                aspectRatioMode=Qt.AspectRatioMode.KeepAspectRatio,
-                transformMode=Qt.TransformationMode.SmoothTransformation,
-            )
-        self.updated.emit(self._pixmap)
-
-    def _on_updated(self, pixmap):
-        """Set manipulated and update status when pixmap was updated.
-
-        This is done with signal handling as the ManipulateRunner runs in another
-        thread and finally emits the signal.
-        """
-        self._manipulated = pixmap
-        api.status.update("manipulate pixmap updated")
+        pixmap = _scale(
+            self._current_pixmap.pixmap,
+            screen_geometry.width(),
+            screen_geometry.height(),
+        )
+        self._image = pixmap.toImage()
+        self._proxy = _scale(
+            self._image,
+            max(pixmap.width() // self.PROXY_SCALE, 1),
+            max(pixmap.height() // self.PROXY_SCALE, 1),
+        )
+        self.updated.emit(pixmap)
 
     def _save_changes(self):
         """Save changes according to the current manipulation."""
-        if self._manipulated is None:  # Nothing changed
-            return
         current_group = self.manipulations.group(self._current_manipulation)
-        self._changes.append(
-            ManipulationChange(self._manipulated, copy.copy(current_group))
-        )
+        if self._image is None or not current_group.changed:  # Nothing changed
+            return
+        self._changes.append(current_group.snapshot())
         # Reset to avoid double application of the changes
         for manipulation in current_group:
             manipulation.reset()
-        self._pixmap, self._manipulated = self._manipulated, None
+
+
+ScalableT = TypeVar("ScalableT", QImage, QPixmap)
+
+
+def _scale(pixmap: ScalableT, width: int, height: int) -> ScalableT:
+    """Return pixmap or image smoothly scaled to fit into width and height."""
+    # Workaround for different keyword naming in PySide6
+    if qt.USE_PYSIDE6:
+        return pixmap.scaled(
+            width,
+            height,
+            aspectMode=Qt.AspectRatioMode.KeepAspectRatio,
+            mode=Qt.TransformationMode.SmoothTransformation,
+        )
+    return pixmap.scaled(
+        width,
+        height,
+        aspectRatioMode=Qt.AspectRatioMode.KeepAspectRatio,
+        transformMode=Qt.TransformationMode.SmoothTransformation,
+    )
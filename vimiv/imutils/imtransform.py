@@ -6,10 +6,12 @@ import functools
 import math
 from typing import Optional
 
-from vimiv.qt.core import Qt, QRect, QSize, QObject, Signal
-from vimiv.qt.gui import QTransform, QPixmap
+from vimiv.qt.core import Qt, QRect, QRectF, QSize, QObject, Signal
+from vimiv.qt.gui import QImage, QTransform, QPixmap
+from vimiv.qt.widgets import QApplication
 
-from vimiv import api
+from vimiv import api, utils
+from vimiv.imutils import current_pixmap, edit_history
 from vimiv.utils import log
 
 
@@ -27,6 +29,7 @@ def register_transform_command(**kwargs):
             self._ensure_editable()
             func(self, *args, **kwargs)
             self.apply()
+            self.edited.emit(edit_history.TransformRecord(self.matrix))
 
         return api.commands.register(mode=api.modes.IMAGE, edit=True, **kwargs)(inner)
 
@@ -37,29 +40,70 @@ class Transform(QTransform):
     """Apply transformations to an image.
 
     Provides the commands related to transformation such as rotate and flip and is used
-    to apply these transformations to the pixmap given by the handler.
+    to apply these transformations to the pixmap given by the handler. Transformations
+    are accumulated in the matrix and only displayed. The transformed pixmap is created
+    once it is needed, e.g. for writing or cropping.
+
+    Interactive straightening is previewed on a proxy of the original that fits onto
+    the screen. Straighten and crop are applied to the full-resolution image in the
+    background once they are accepted.
+
+    Class Attributes:
+        pool: QThreadPool to apply straighten and crop in.
 
     Attributes:
         _current: Class to access the currently displayed pixmap.
+        _generation: Number of the latest transformation applied in the background.
+            It is increased when the transformation is cancelled or reset.
         _original: The original, untransformed, pixmap.
+        _proxy: Proxy of the original used to preview straightening.
+        _proxy_key: Cache key of the original the proxy was created from.
+        _record: Record of the transformation applied in the background.
+        _straightened: Rectangle kept by the last straighten or None.
 
     Signals:
         transformed: Emitted with the transformed pixmap upon changes.
+        composed: Emitted when the transformation matrix changed.
+            arg1: The original pixmap.
+            arg2: The transformation to apply to the original.
+        previewed: Emitted with a preview of the transformation to display.
+            arg1: The preview pixmap.
+            arg2: The transformation scaling the preview to the full-resolution size.
+        edited: Emitted with the edit history record of a completed transformation.
+        processed: Emitted once a transformation was applied in the background.
     """
 
     class Signals(QObject):
         """Signals for transformed required as QTransform is not a QObject."""
 
         transformed = Signal(QPixmap)
+        composed = Signal(QPixmap, QTransform)
+        previewed = Signal(QPixmap, QTransform)
+        edited = Signal(object)
+        processed = Signal()
+        _processed_image = Signal(int, QImage)
 
     _signals = Signals()
     transformed = _signals.transformed
+    composed = _signals.composed
+    previewed = _signals.previewed
+    edited = _signals.edited
+    processed = _signals.processed
+
+    pool = utils.Pool.get(globalinstance=False)
 
     @api.objreg.register
     def __init__(self, current_pixmap):
         super().__init__()
         self._current = current_pixmap
+        self._generation = 0
         self._original = None
+        self._proxy = QPixmap()
+        self._proxy_key = 0
+        self._record = None
+        self._straightened: Optional[QRect] = None
+
+        self._signals._processed_image.connect(self._on_processed)
 
     @property
     def current(self):
@@ -93,8 +137,9 @@ class Transform(QTransform):
 
         **count:** multiplier
         """
-        angle = 90 * count
-        self.rotate(-angle if counter_clockwise else angle)
+        # QTransform is only exact for 90, 180 and 270 as required by is_permutation
+        angle = (-90 if counter_clockwise else 90) * count
+        self.rotate(angle % 360)
 
     @api.keybindings.register("_", "flip --vertical", mode=api.modes.IMAGE)
     @api.keybindings.register("|", "flip", mode=api.modes.IMAGE)
@@ -126,8 +171,8 @@ class Transform(QTransform):
             * ``height``: Height in pixels to resize the image to. If not given, the
               aspectratio is preserved.
         """
-        dx = width / self.current.width()
-        dy = dx if height is None else height / self.current.height()
+        dx = width / self.size.width()
+        dy = dx if height is None else height / self.size.height()
         self.scale(dx, dy)
 
     @register_transform_command()
@@ -145,34 +190,168 @@ class Transform(QTransform):
         self.scale(dx, dy)
 
     def apply(self):
-        """Apply all transformations to the original pixmap."""
-        self._apply(
-            self.original.transformed(
-                self, mode=Qt.TransformationMode.SmoothTransformation
+        """Apply all transformations to the original pixmap.
+
+        The transformations are only displayed, the transformed pixmap is created once
+        it is accessed.
+        """
+        self._straightened = None
+        if current_pixmap.transformed_size(self.original, self).isEmpty():
+            raise api.commands.CommandError(
+                "Error transforming image, ignoring transformation.\n"
+                "Is the resulting image too large? Zero?."
             )
-        )
+        self.composed.emit(self.original, QTransform(self))
 
     def straighten(self, *, angle: int, original_size: QSize):
         """Straighten the original image.
 
         This rotates the image by the total angle and crops the valid, axis-aligned
-        rectangle from the rotated image.
+        rectangle from the rotated image. The result is only previewed, it is applied
+        to the full-resolution image by accept_straighten.
 
         Args:
             angle: Rotation angle to straighten the original image by.
             original_size: Size of the original unstraightened image.
         """
         self.rotate(angle)
-        transformed = self.original.transformed(
-            self, mode=Qt.TransformationMode.SmoothTransformation
-        )
         rect = self.largest_rect_in_rotated(
-            original=original_size, rotated=transformed.size(), angle=angle
+            original=original_size,
+            rotated=current_pixmap.transformed_size(self.original, self),
+            angle=angle,
         )
-        self._apply(transformed.copy(rect))
+        self._straightened = rect
+        self._preview(rect)
+
+    def accept_straighten(self):
+        """Apply the last straighten in the background and add it to the history.
+
+        The processed signal is emitted once the straightened image is displayed.
+        """
+        if self._straightened is None:
+            self.processed.emit()
+            return
+        record = edit_history.StraightenRecord(self.matrix, self._straightened)
+        self._process(self.original, QTransform(self), self._straightened, record)
 
     def crop(self, rect):
-        self._apply(self.current.copy(rect))
+        """Crop the current image in the background.
+
+        The processed signal is emitted once the cropped image is displayed.
+        """
+        pixmap, transform = self._current.source
+        self._process(pixmap, transform, rect, edit_history.CropRecord(rect))
+
+    def cancel(self):
+        """Cancel any transformation that is being applied in the background."""
+        self._generation += 1
+        self._record = self._straightened = None
+
+    def reset(self):
+        """Reset the transformation matrix and cancel any background transformation.
+
+        This happens when a new original is loaded, results of the previous one must
+        not be applied to it.
+        """
+        self.cancel()
+        super().reset()
+
+    @property
+    def processing(self) -> bool:
+        """True if a transformation is being applied in the background."""
+        return self._record is not None
+
+    def _preview(self, rect: QRect):
+        """Display the transformed original cropped to rect using the proxy.
+
+        The proxy is transformed in its own coordinates and then scaled to the size of
+        the full-resolution result by the image widget.
+        """
+        proxy = self._get_proxy()
+        scale = QTransform.fromScale(
+            proxy.width() / self.original.width(),
+            proxy.height() / self.original.height(),
+        )
+        transform = scale.inverted()[0] * self * scale
+        preview = current_pixmap.transformed(proxy, transform)
+        preview = preview.copy(scale.mapRect(QRectF(rect)).toRect() & preview.rect())
+        if preview.isNull():
+            raise api.commands.CommandError(
+                "Error transforming image, ignoring transformation.\n"
+                "Is the resulting image too large? Zero?."
+            )
+        self.previewed.emit(
+            preview,
+            QTransform.fromScale(
+                rect.width() / preview.width(), rect.height() / preview.height()
+            ),
+        )
+
+    def _get_proxy(self) -> QPixmap:
+        """Return the original scaled to fit onto the screen, created once per original."""
+        if self._proxy_key != self.original.cacheKey():
+            size = QApplication.primaryScreen().geometry().size()
+            if (
+                self.original.width() > size.width()
+                or self.original.height() > size.height()
+            ):
+                proxy = self.original.scaled(
+                    size,
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation,
+                )
+            else:
+                proxy = self.original
+            self._proxy = proxy
+            self._proxy_key = self.original.cacheKey()
+        return self._proxy
+
+    def _process(
+        self, pixmap: QPixmap, transform: QTransform, rect: QRect, record
+    ) -> None:
+        """Transform pixmap and crop it to rect in the background."""
+        self._generation += 1
+        self._record = record
+        _logger.debug("Transform: processing %s", record.__class__.__qualname__)
+        utils.asyncrun(
+            self._process_image,
+            self._generation,
+            pixmap.toImage(),
+            transform,
+            rect,
+            pool=self.pool,
+        )
+
+    def _process_image(
+        self, generation: int, image: QImage, transform: QTransform, rect: QRect
+    ) -> None:
+        """Create the transformed image in the worker thread."""
+        image = current_pixmap.transformed_image(image, transform).copy(rect)
+        self._signals._processed_image.emit(generation, image)
+
+    def _on_processed(self, generation: int, image: QImage):
+        """Display the transformed image unless processing was cancelled."""
+        if generation != self._generation:
+            return
+        record, self._record = self._record, None
+        self._straightened = None
+        try:
+            self._apply(QPixmap.fromImage(image))
+        except api.commands.CommandError as e:
+            log.error(str(e))
+        else:
+            self.edited.emit(record)
+        self.processed.emit()
+
+    def restore(self, state: edit_history.State):
+        """Restore a state of the edit history without adding a new record."""
+        self.cancel()
+        self._original = state.original
+        self.setMatrix(*state.matrix)
+        if state.pixmap is None:
+            self.apply()
+        else:
+            self._apply(state.pixmap)
 
     def _apply(self, transformed):
         """Check the transformed pixmap for validity and apply it to the handler."""
@@ -190,12 +369,12 @@ class Transform(QTransform):
     @property
     def changed(self):
         """True if transformations have been applied."""
-        if self.current.rect().isNull():
+        if self.size.isEmpty():
             return False
         transformed = not self.isIdentity()
         if self._original is None:
             return transformed
-        cropped = self.current.rect() != self._original.rect()
+        cropped = self.size != self._original.size()
         return transformed or cropped
 
     @property
@@ -212,7 +391,7 @@ class Transform(QTransform):
     @property
     def size(self) -> QSize:
         """Size of the transformed image."""
-        return self.current.size()
+        return self._current.size
 
     @register_transform_command()
     def undo_transformations(self):
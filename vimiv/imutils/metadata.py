@@ -8,14 +8,25 @@ relies on the functionality provided by optionally loaded metadata plugins. Such
 plugins implements the `MetadataPlugin` abstract class and registers that class
 using the `register` function.
 
+Parsing the metadata of a file is expensive. Therefore the initialized plugins are
+stored in a least-recently-used cache keyed by path, modification time and size of the
+file. Every version of a file is thus only parsed once, no matter how often its metadata
+is queried.
+
 Module Attributes:
     _registry: List of registered `MetadataPlugin` implementations.
+    _cache: `MetadataCache` storing the initialized plugins for each file version.
 """
 
 import abc
+import collections
 import contextlib
 import itertools
-from typing import Dict, Tuple, NoReturn, Sequence, Iterable, Type, List
+import os
+import threading
+from typing import Dict, Tuple, NoReturn, Optional, Sequence, Iterable, Type, List
+
+from vimiv.qt.gui import QTransform
 
 from vimiv.utils import log
 
@@ -24,6 +35,8 @@ _logger = log.module_logger(__name__)
 # Type returned by `MetadataHandler.get_metadata`.
 # Key is the metadata key. Value is a tuple of descriptive name and value for that key.
 MetadataDictT = Dict[str, Tuple[str, str]]
+# Version of a file used as cache key. Tuple of path, modification time in ns and size.
+VersionT = Tuple[str, int, int]
 
 
 class MetadataPlugin(abc.ABC):
@@ -31,7 +44,8 @@ class MetadataPlugin(abc.ABC):
 
     Implementations of this class are required to overwrite `__init__`, `name`,
     `version`, `get_metadata` and `get_keys`.
-    The implementation of `copy_metadata` and `get_date_time` is optional.
+    The implementation of `copy_metadata`, `set_orientation` and `get_date_time` is
+    optional.
     """
 
     @abc.abstractmethod
@@ -87,6 +101,17 @@ class MetadataPlugin(abc.ABC):
         """
         raise NotImplementedError
 
+    def set_orientation(self, _orientation: int) -> bool:
+        """Write the exif orientation tag of the current image in place.
+
+        Args:
+            _orientation: New value of the orientation tag as in `ExifOrientation`.
+
+        Returns:
+            Flag indicating if writing was successful.
+        """
+        raise NotImplementedError
+
     def get_date_time(self) -> str:
         """Get creation date and time of the current image as formatted string."""
         raise NotImplementedError
@@ -105,21 +130,124 @@ def has_metadata_support() -> bool:
     return bool(_registry)
 
 
+class MetadataCache:
+    """Least-recently-used cache of initialized metadata plugins.
+
+    Plugins parse the metadata of the file in their constructor. The cache stores the
+    initialized plugins of every registered implementation for each file version,
+    identified by path, modification time and size. Older versions of a path are
+    dropped once a new version is parsed. The cache may be accessed from worker
+    threads.
+
+    Class Attributes:
+        MAXSIZE: Maximum number of file versions to keep.
+
+    Attributes:
+        _entries: Ordered dictionary mapping file version to the plugins.
+        _versions: Dictionary mapping path to the currently cached file version.
+        _lock: Lock protecting the dictionaries.
+    """
+
+    MAXSIZE = 64
+
+    def __init__(self) -> None:
+        self._entries: "collections.OrderedDict[VersionT, List[MetadataPlugin]]" = (
+            collections.OrderedDict()
+        )
+        self._versions: Dict[str, VersionT] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str, store: bool = True) -> List[MetadataPlugin]:
+        """Return the initialized plugins for the current version of path.
+
+        Args:
+            path: Path to the file to retrieve the plugins for.
+            store: Add the plugins to the cache if this version was not cached yet.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:  # Nothing to cache, let the plugins deal with the error
+            return [backend(path) for backend in _registry]
+        version = (path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            with contextlib.suppress(KeyError):
+                self._entries.move_to_end(version)
+                return self._entries[version]
+        _logger.debug("Parsing metadata of '%s'", path)
+        backends = [backend(path) for backend in _registry]
+        if not store:
+            return backends
+        with self._lock:
+            outdated = self._versions.pop(path, None)
+            if outdated is not None:
+                self._entries.pop(outdated, None)
+            self._entries[version] = backends
+            self._versions[path] = version
+            while len(self._entries) > self.MAXSIZE:
+                evicted, _ = self._entries.popitem(last=False)
+                del self._versions[evicted[0]]
+        return backends
+
+    def __contains__(self, path: str) -> bool:
+        """True if the current version of path has been parsed already."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        with self._lock:
+            return (path, stat.st_mtime_ns, stat.st_size) in self._entries
+
+    def clear(self) -> None:
+        """Remove all cached plugins."""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_cache = MetadataCache()
+
+
 class MetadataHandler:
     """Handle metadata related functionalities of images.
 
+    The plugins are retrieved from the module cache, so creating a handler is cheap and
+    the file is only parsed if this version of it has not been parsed before.
+
     Attributes:
         _path: Path to current image.
+        _store: Add newly parsed metadata to the cache. Bulk reads disable this to keep
+            the cached metadata of recently viewed images.
     """
 
-    def __init__(self, path: str):
+    def __init__(self, path: str, store: bool = True):
         self._path = path
+        self._store = store
+
+    @property
+    def _backends(self) -> List[MetadataPlugin]:
+        """Initialized plugins for the current version of the image."""
+        return _cache.get(self._path, store=self._store)
+
+    @property
+    def parsed(self) -> bool:
+        """True if the metadata of the current version of the image was parsed."""
+        return self._path in _cache
 
     @property
     def has_copy_metadata(self) -> bool:
         """True if `MetadataHandler` has an implementation for `copy_metadata`."""
         return any(e.copy_metadata != MetadataPlugin.copy_metadata for e in _registry)
 
+    @property
+    def has_set_orientation(self) -> bool:
+        """True if `MetadataHandler` has an implementation for `set_orientation`."""
+        return any(
+            e.set_orientation != MetadataPlugin.set_orientation for e in _registry
+        )
+
     @property
     def has_get_date_time(self) -> bool:
         """True if `MetadataHandler` has an implementation for `get_date_time`."""
@@ -145,9 +273,9 @@ class MetadataHandler:
 
         out: MetadataDictT = {}
 
-        for backend in _registry:
+        for backend in self._backends:
             # TODO: from 3.9 on use: c = a | b
-            out = {**backend(self._path).get_metadata(keys), **out}
+            out = {**backend.get_metadata(keys), **out}
 
         return out
 
@@ -165,8 +293,8 @@ class MetadataHandler:
 
         out: Iterable[str] = iter([])
 
-        for backend in _registry:
-            out = itertools.chain(out, backend(self._path).get_keys())
+        for backend in self._backends:
+            out = itertools.chain(out, backend.get_keys())
 
         return out
 
@@ -187,11 +315,10 @@ class MetadataHandler:
 
         failed = []
 
-        for backend in _registry:
+        for backend in self._backends:
             with contextlib.suppress(NotImplementedError):
-                be = backend(self._path)
-                if not be.copy_metadata(dest, reset_orientation):
-                    failed.append(be.name())
+                if not backend.copy_metadata(dest, reset_orientation):
+                    failed.append(backend.name())
 
         if failed:
             _logger.warning(
@@ -200,6 +327,29 @@ class MetadataHandler:
                 f"Some metadata may be missing in the destination image {dest}."
             )
 
+    def set_orientation(self, orientation: int) -> bool:
+        """Write the exif orientation tag of the current image in place.
+
+        Uses the first registered metadata implementation that succeeds.
+
+        Args:
+            orientation: New value of the orientation tag as in `ExifOrientation`.
+
+        Returns:
+            True if the orientation was written.
+
+        Raises:
+            MetadataError
+        """
+        if not has_metadata_support() or not self.has_set_orientation:
+            MetadataHandler.raise_exception("set_orientation")
+
+        for backend in self._backends:
+            with contextlib.suppress(NotImplementedError):
+                if backend.set_orientation(orientation):
+                    return True
+        return False
+
     def get_date_time(self) -> str:
         """Get creation date and time as formatted string.
 
@@ -211,9 +361,9 @@ class MetadataHandler:
         if not has_metadata_support() or not self.has_get_date_time:
             MetadataHandler.raise_exception("get_date_time")
 
-        for backend in _registry:
+        for backend in self._backends:
             with contextlib.suppress(NotImplementedError):
-                out = backend(self._path).get_date_time()
+                out = backend.get_date_time()
                 # If we get an empty string, continue. We may get something better.
                 if out:
                     return out
@@ -249,6 +399,19 @@ def register(plugin: Type[MetadataPlugin]) -> None:
         return
 
     _registry.append(plugin)
+    _cache.clear()  # Cached entries lack the new plugin
+
+
+def prefetch(*paths: str) -> None:
+    """Parse the metadata of paths into the cache.
+
+    This is meant to be run in a worker thread, so later requests for the metadata of
+    these paths do not have to parse the files.
+    """
+    if not has_metadata_support():
+        return
+    for path in paths:
+        _cache.get(path)
 
 
 def get_registrations() -> List[Tuple[str, str]]:
@@ -275,3 +438,43 @@ class ExifOrientation:
     Rotation90 = 6
     Rotation90VerticalFlip = 7
     Rotation270 = 8
+
+    # Flip horizontally, flip vertically and rotate by 90 degrees, applied in this order
+    # to transform the stored image into the displayed image
+    OPERATIONS = {
+        Normal: (False, False, False),
+        HorizontalFlip: (True, False, False),
+        Rotation180: (True, True, False),
+        VerticalFlip: (False, True, False),
+        Rotation90HorizontalFlip: (False, True, True),
+        Rotation90: (False, False, True),
+        Rotation90VerticalFlip: (True, False, True),
+        Rotation270: (True, True, True),
+    }
+
+    @staticmethod
+    def create_transform(horizontal: bool, vertical: bool, rotate: bool) -> QTransform:
+        """Return the transformation performing the operations in order."""
+        transform = QTransform().scale(-1 if horizontal else 1, -1 if vertical else 1)
+        if rotate:
+            transform *= QTransform().rotate(90)
+        return transform
+
+    @classmethod
+    def transform(cls, orientation: int) -> QTransform:
+        """Return the transformation from the stored to the displayed image."""
+        operations = cls.OPERATIONS.get(orientation, (False, False, False))
+        return cls.create_transform(*operations)
+
+    @classmethod
+    def from_transform(cls, transform: QTransform) -> Optional[int]:
+        """Return the orientation of a transformation or None if there is none."""
+        for orientation in cls.OPERATIONS:
+            if _elements(cls.transform(orientation)) == _elements(transform):
+                return orientation
+        return None
+
+
+def _elements(transform: QTransform) -> Tuple[float, float, float, float]:
+    """Return the rotation and scaling elements of the transformation matrix."""
+    return transform.m11(), transform.m12(), transform.m21(), transform.m22()
@@ -0,0 +1,322 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+"""Index of the metadata of all images in the working directory.
+
+The index extracts the keys defined by the ``metadata.index_keys`` setting for every
+image in the working directory in a worker thread using the registered metadata plugins.
+It is stored in the vimiv cache directory, one file per directory, so only new or
+modified images have to be parsed when the directory is opened again. When images are
+added to the working directory, only these are indexed.
+
+The index provides the ``exif-date`` ordering for the ``sort.image_order`` setting and
+the values for searching by metadata. Both only look up values in the index and never
+read metadata themselves.
+
+Module Attributes:
+    index: The `MetadataIndex` instance of the working directory.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, List, Optional, Pattern, Sequence, Tuple
+
+from vimiv.qt.core import QObject, Signal
+
+from vimiv import api, utils
+from vimiv.imutils import metadata
+from vimiv.utils import log, xdg
+
+_logger = log.module_logger(__name__)
+
+ValuesT = Dict[str, str]
+EntryT = Tuple[int, int, ValuesT]  # Modification time in ns, size, indexed values
+
+DATE_KEYS = "Exif.Photo.DateTimeOriginal", "Exif.Image.DateTime"
+
+
+class MetadataIndex(QObject):
+    """Index of the metadata of all images in the working directory.
+
+    Class Attributes:
+        pool: QThreadPool to index images in.
+        CHUNK_SIZE: Number of newly indexed images after which results are published.
+        VERSION: Version of the format of the stored index files.
+
+    Attributes:
+        _entries: Dictionary mapping image path to its index entry.
+        _generation: Number of the latest indexing run to discard outdated results.
+
+    Signals:
+        indexed: Emitted by the worker with new index entries.
+            arg1: Generation of the indexing run.
+            arg2: Dictionary mapping image path to its index entry.
+            arg3: True if these are the last entries of the indexing run.
+        finished: Emitted when all entries of an indexing run were added to the index.
+    """
+
+    pool = utils.Pool.get(globalinstance=False)
+    pool.setMaxThreadCount(1)  # Outdated runs are cancelled anyway
+
+    CHUNK_SIZE = 500
+    VERSION = 1
+
+    indexed = Signal(int, dict, bool)
+    finished = Signal()
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._entries: Dict[str, EntryT] = {}
+        self._generation = 0
+        self.indexed.connect(self._on_indexed)
+
+    def connect_signals(self) -> None:
+        """Connect working directory related signals.
+
+        Cannot be done in the constructor, as the handler is not initialized by then.
+        """
+        handler = api.working_directory.handler
+        handler.loaded.connect(self._on_directory_loaded)
+        handler.images_changed.connect(self._on_images_changed)
+        api.settings.metadata.index_keys.changed.connect(self._on_keys_changed)
+        self.finished.connect(self._on_finished)
+
+    @property
+    def keys(self) -> List[str]:
+        """List of metadata keys to index."""
+        keys = api.settings.metadata.index_keys.value.split(",")
+        return [key.strip() for key in keys if key.strip()]
+
+    def values(self, path: str) -> ValuesT:
+        """Return the indexed metadata values of path."""
+        entry = self._entries.get(path)
+        return entry[2] if entry is not None else {}
+
+    def date(self, path: str) -> str:
+        """Return the indexed capture date of path or an empty string if unknown."""
+        values = self.values(path)
+        for key in DATE_KEYS:
+            if values.get(key):
+                return values[key]
+        return ""
+
+    def date_order(self, path: str) -> Tuple[bool, str, str]:
+        """Ordering function by capture date, images without date come last."""
+        date = self.date(path)
+        return not date, date, os.path.basename(path)
+
+    def resolve_key(self, key: str) -> Optional[str]:
+        """Return the indexed key matching key or None if it is not indexed.
+
+        Besides the full key, e.g. ``Exif.Image.Model``, the last part, e.g. ``Model``,
+        is accepted. Case is ignored.
+        """
+        key = key.lower()
+        for indexed in self.keys:
+            if key in (indexed.lower(), indexed.rpartition(".")[2].lower()):
+                return indexed
+        return None
+
+    def matches(
+        self, paths: Sequence[str], key: str, pattern: Pattern, casefold: bool = False
+    ) -> List[int]:
+        """Return the indices of paths for which the value of key matches pattern.
+
+        Args:
+            paths: List of paths to search.
+            key: Indexed metadata key to search the values of.
+            pattern: Compiled search pattern.
+            casefold: Case-fold the values as the pattern was created case-folded.
+        """
+        matches = []
+        for i, path in enumerate(paths):
+            value = self.values(path).get(key)
+            if value is None:
+                continue
+            if casefold:
+                value = value.casefold()
+            if pattern.search(value) is not None:
+                matches.append(i)
+        return matches
+
+    def update(self, images: List[str], reload: bool = False) -> None:
+        """Index all images that are not indexed yet in the worker thread.
+
+        Args:
+            images: List of all images in the working directory.
+            reload: Start from the index stored on disk instead of the current one.
+        """
+        self._generation += 1
+        if reload:
+            self._entries = {}
+        if not images or not metadata.has_metadata_support():
+            return
+        entries = None if reload else dict(self._entries)
+        directory = os.path.dirname(images[0])
+        self.pool.clear()
+        utils.asyncrun(
+            self._index,
+            self._generation,
+            directory,
+            images,
+            self.keys,
+            entries,
+            pool=self.pool,
+        )
+
+    def _index(
+        self,
+        generation: int,
+        directory: str,
+        images: List[str],
+        keys: List[str],
+        entries: Optional[Dict[str, EntryT]],
+    ) -> None:
+        """Index images in the worker thread and store the index once done.
+
+        Args:
+            generation: Generation of this indexing run.
+            directory: Directory containing the images.
+            images: List of all images in the directory.
+            keys: Metadata keys to index.
+            entries: Current index entries or None to read them from disk.
+        """
+        read_from_disk = entries is None
+        if entries is None:
+            entries = _read(directory, keys)
+        valid, outdated = _validate(images, entries)
+        if read_from_disk and valid:
+            self.indexed.emit(generation, valid, False)
+        _logger.debug("Indexing metadata of %d images", len(outdated))
+        new: Dict[str, EntryT] = {}
+        chunk: Dict[str, EntryT] = {}
+        for path, mtime, size in outdated:
+            if generation != self._generation:
+                _logger.debug("Indexing %d cancelled", generation)
+                return
+            data = metadata.MetadataHandler(path, store=False).get_metadata(keys)
+            entry = mtime, size, {key: value for key, (_, value) in data.items()}
+            new[path] = chunk[path] = entry
+            if len(chunk) == self.CHUNK_SIZE:
+                self.indexed.emit(generation, chunk, False)
+                chunk = {}
+        self.indexed.emit(generation, chunk, True)
+        if new or len(valid) != len(entries):
+            _write(directory, keys, {**valid, **new})
+
+    @utils.slot
+    def _on_indexed(self, generation: int, entries: dict, last: bool):
+        """Add new entries to the index unless the run was superseded."""
+        if generation == self._generation:
+            self._entries.update(entries)
+            if last:
+                self.finished.emit()
+
+    @utils.slot
+    def _on_finished(self):
+        """Reorder the working directory once if ordering by capture date."""
+        if api.settings.sort.image_order.value == "exif-date":
+            api.working_directory.handler.reorder()
+
+    def _on_directory_loaded(self, images: List[str], _directories: List[str]):
+        self.update(images, reload=True)
+
+    def _on_images_changed(
+        self, images: List[str], added: List[str], removed: List[str]
+    ):
+        for path in removed:
+            self._entries.pop(path, None)
+        if added or removed:
+            self.update(images)
+
+    def _on_keys_changed(self):
+        self.update(api.working_directory.handler.images, reload=True)
+
+
+def _validate(
+    images: List[str], entries: Dict[str, EntryT]
+) -> Tuple[Dict[str, EntryT], List[Tuple[str, int, int]]]:
+    """Split images into those with an up-to-date entry and those to index.
+
+    Returns:
+        valid: Dictionary of the up-to-date entries.
+        outdated: List of path, modification time and size of the images to index.
+    """
+    valid = {}
+    outdated = []
+    for path in images:
+        try:
+            stat = os.stat(path)
+        except OSError:  # Removed in the meantime
+            continue
+        entry = entries.get(path)
+        if entry is not None and (entry[0], entry[1]) == (
+            stat.st_mtime_ns,
+            stat.st_size,
+        ):
+            valid[path] = entry
+        else:
+            outdated.append((path, stat.st_mtime_ns, stat.st_size))
+    return valid, outdated
+
+
+def _index_file(directory: str) -> str:
+    """Return the path to the stored index of directory."""
+    name = hashlib.md5(directory.encode()).hexdigest()
+    return xdg.vimiv_cache_dir("metadata", f"{name}.json")
+
+
+def _read(directory: str, keys: List[str]) -> Dict[str, EntryT]:
+    """Read the stored index of directory if it exists and was created for keys."""
+    try:
+        with open(_index_file(directory), "r", encoding="utf-8") as f:
+            content = json.load(f)
+        if (
+            content["version"] != MetadataIndex.VERSION
+            or content["directory"] != directory
+            or content["keys"] != keys
+        ):
+            return {}
+        return {
+            os.path.join(directory, name): (mtime, size, values)
+            for name, (mtime, size, values) in content["entries"].items()
+        }
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        _logger.debug("Cannot read metadata index of '%s': %s", directory, e)
+        return {}
+
+
+def _write(directory: str, keys: List[str], entries: Dict[str, EntryT]) -> None:
+    """Store the index of directory atomically in the cache directory."""
+    content = {
+        "version": MetadataIndex.VERSION,
+        "directory": directory,
+        "keys": keys,
+        "entries": {os.path.basename(path): entry for path, entry in entries.items()},
+    }
+    filename = _index_file(directory)
+    try:
+        xdg.makedirs(os.path.dirname(filename))
+        handle, tmpfile = tempfile.mkstemp(dir=os.path.dirname(filename))
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as f:
+                json.dump(content, f)
+            os.replace(tmpfile, filename)
+        except BaseException:
+            os.remove(tmpfile)
+            raise
+        _logger.debug("Stored metadata index of '%s' in '%s'", directory, filename)
+    except OSError as e:
+        _logger.debug("Cannot store metadata index of '%s': %s", directory, e)
+
+
+def add_order_types() -> None:
+    """Add the orderings provided by the index to the sort settings.
+
+    Must be called before the configuration is read so it may select them.
+    """
+    api.settings.sort.image_order.add_order_type("exif-date", index.date_order)
+
+
+index = MetadataIndex()
@@ -23,7 +23,8 @@ _logger = log.module_logger(__name__)
 class MetadataPiexif(metadata.MetadataPlugin):
     """Provided metadata support based on piexif.
 
-    Implements `get_metadata`, `get_keys`, `copy_metadata`, and `get_date_time`.
+    Implements `get_metadata`, `get_keys`, `copy_metadata`, `set_orientation` and
+    `get_date_time`.
     """
 
     def __init__(self, path: str) -> None:
@@ -122,17 +123,35 @@ class MetadataPiexif(metadata.MetadataPlugin):
             return False
 
         try:
+            exif = self._metadata
             if reset_orientation:
                 with contextlib.suppress(KeyError):
-                    self._metadata["0th"][
-                        piexif.ImageIFD.Orientation
-                    ] = metadata.ExifOrientation.Normal
-            exif_bytes = piexif.dump(self._metadata)
+                    # Update a copy as the parsed metadata is cached for reuse
+                    zeroth = {
+                        **exif["0th"],
+                        piexif.ImageIFD.Orientation: metadata.ExifOrientation.Normal,
+                    }
+                    exif = {**exif, "0th": zeroth}
+            exif_bytes = piexif.dump(exif)
             piexif.insert(exif_bytes, dest)
             return True
         except ValueError:
             return False
 
+    def set_orientation(self, orientation: int) -> bool:
+        """Write the exif orientation tag of the current image in place."""
+        if self._metadata is None:
+            return False
+
+        try:
+            # Update a copy as the parsed metadata is cached for reuse
+            zeroth = {**self._metadata["0th"], piexif.ImageIFD.Orientation: orientation}
+            piexif.insert(piexif.dump({**self._metadata, "0th": zeroth}), self._path)
+            return True
+        except (KeyError, ValueError) as e:
+            _logger.debug("Failed to write orientation of '%s': '%s'", self._path, e)
+            return False
+
     def get_date_time(self) -> str:
         """Get creation date and time of the current image as formatted string."""
         if self._metadata is None:
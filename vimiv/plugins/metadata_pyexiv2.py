@@ -90,12 +90,6 @@ class MetadataPyexiv2(metadata.MetadataPlugin):
         if self._metadata is None:
             return False
 
-        if reset_orientation:
-            with contextlib.suppress(KeyError):
-                self._metadata["Exif.Image.Orientation"] = (
-                    metadata.ExifOrientation.Normal
-                )
-
         try:
             dest_image = pyexiv2.ImageMetadata(dest)
             dest_image.read()
@@ -106,6 +100,10 @@ class MetadataPyexiv2(metadata.MetadataPlugin):
                 with contextlib.suppress(ValueError):
                     self._metadata.copy(dest_image, *copy_args)
 
+            # Update the copy as the parsed metadata is cached for reuse
+            if reset_orientation and "Exif.Image.Orientation" in dest_image.exif_keys:
+                dest_image["Exif.Image.Orientation"] = metadata.ExifOrientation.Normal
+
             dest_image.write()
             return True
         except FileNotFoundError:
@@ -114,6 +112,22 @@ class MetadataPyexiv2(metadata.MetadataPlugin):
             _logger.debug("Failed to write metadata for '%s': '%s'", dest, str(e))
         return False
 
+    def set_orientation(self, orientation: int) -> bool:
+        """Write the exif orientation tag of the current image in place."""
+        if self._metadata is None:
+            return False
+
+        try:
+            # Update a fresh copy as the parsed metadata is cached for reuse
+            image = pyexiv2.ImageMetadata(self._path)
+            image.read()
+            image["Exif.Image.Orientation"] = orientation
+            image.write()
+            return True
+        except (OSError, ValueError) as e:
+            _logger.debug("Failed to write orientation of '%s': '%s'", self._path, e)
+        return False
+
     def get_date_time(self) -> str:
         """Get creation date and time of the current image as formatted string."""
         if self._metadata is None:
@@ -6,7 +6,7 @@ import abc
 from typing import Optional, Any, Union
 
 from vimiv.qt.core import QObject, Qt, QSize, BoundSignal
-from vimiv.qt.gui import QPixmap, QMovie, QPainter
+from vimiv.qt.gui import QPixmap, QMovie, QPainter, QTransform
 from vimiv.qt.printsupport import (
     QPrintDialog,
     QPrintPreviewDialog,
@@ -40,6 +40,7 @@ class PrintHandler(QObject):
         self._widget: Optional[PrintWidget] = None
 
         api.signals.pixmap_loaded.connect(self._on_pixmap_loaded)
+        api.signals.pixmap_transformed.connect(self._on_pixmap_transformed)
         api.signals.movie_loaded.connect(self._on_movie_loaded)
         api.signals.svg_loaded.connect(self._on_svg_loaded)
 
@@ -83,6 +84,10 @@ class PrintHandler(QObject):
     def _on_pixmap_loaded(self, pixmap: QPixmap) -> None:
         self._widget = PrintPixmap(pixmap)
 
+    @slot
+    def _on_pixmap_transformed(self, pixmap: QPixmap, transform: QTransform) -> None:
+        self._widget = PrintPixmap(pixmap, transform)
+
     @slot
     def _on_svg_loaded(self, path: str) -> None:
         self._widget = PrintSvg(QtSvg.QSvgWidget(path))
@@ -119,24 +124,33 @@ class PrintWidget(abc.ABC):
 
 
 class PrintPixmap(PrintWidget):
-    """Print class for pixmap images."""
+    """Print class for pixmap images.
+
+    The pixmap may be displayed with a transformation that is only applied for printing.
+    """
 
-    def __init__(self, pixmap: QPixmap):
+    def __init__(self, pixmap: QPixmap, transform: Optional[QTransform] = None):
         self._widget = pixmap
+        self._transform = transform
 
     def paint(self, printer: QPrinter) -> None:
         """Scale pixmap to match printer page and paint using painter."""
         _logger.debug("Painting pixmap for print")
         painter = QPainter(printer)
         page_size = printer.pageRect(printer.Unit.DevicePixel).toRect().size()
-        scaled_pixmap = self._widget.scaled(
-            page_size, Qt.AspectRatioMode.KeepAspectRatio
-        )
+        pixmap = self._widget
+        if self._transform is not None:
+            pixmap = pixmap.transformed(
+                self._transform, mode=Qt.TransformationMode.SmoothTransformation
+            )
+        scaled_pixmap = pixmap.scaled(page_size, Qt.AspectRatioMode.KeepAspectRatio)
         painter.drawPixmap(0, 0, scaled_pixmap)
         painter.end()
 
     @property
     def size(self) -> QSize:
+        if self._transform is not None:
+            return self._transform.mapRect(self._widget.rect()).size()
         return self._widget.size()
 
 
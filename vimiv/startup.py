@@ -69,6 +69,7 @@ def setup_pre_app(argv: List[str]) -> argparse.Namespace:
     init_directories(args)
     log.setup_logging(args.log_level, *args.debug)
     _logger.debug("Start: vimiv %s", " ".join(argv))
+    imutils.metadata_index.add_order_types()
     update_settings(args)
     trash_manager.init()
     return args
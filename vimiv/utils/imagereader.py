@@ -1,16 +1,22 @@
 # vim: ft=python fileencoding=utf-8 sw=4 et sts=4
 
-"""Image reader classes to read images from file to Qt objects."""
+"""Image reader classes to read images from file to Qt objects.
+
+QPixmap must only be used in the GUI thread. Retrieving a QImage using
+:meth:`BaseReader.get_image` is safe in any thread if the reader is threadsafe. Readers
+of external formats that only provide a QPixmap must be used in the GUI thread.
+"""
 
 import abc
-from typing import Dict, Callable
+from typing import Dict, Callable, Optional
 
-from vimiv.qt.core import Qt
+from vimiv.qt.core import Qt, QCoreApplication, QThread
 from vimiv.qt.gui import QImageReader, QPixmap, QImage
 
 from vimiv.utils import imageheader
 
 external_handler: Dict[str, Callable[[str], QPixmap]] = {}
+external_image_handler: Dict[str, Callable[[str], QImage]] = {}
 
 
 class BaseReader(abc.ABC):
@@ -19,8 +25,10 @@ class BaseReader(abc.ABC):
     Provides the basic interface. Child classes must implement the get_pixmap method
     which reads the file from disk and returns a QPixmap. In addition, the classmethod
     supports must be implemented to define the supported image formats. For
-    optimization, the get_image method can also be provided. This method is called when
-    retrieving thumbnails.
+    optimization, the get_image method can also be provided. If it does not create any
+    QPixmap, the reader is threadsafe and get_image is called in worker threads when
+    retrieving thumbnails and when processing images in the background. By default,
+    the QPixmap is converted to a QImage which is only possible in the GUI thread.
     """
 
     def __init__(self, path: str, file_format: str):
@@ -35,16 +43,26 @@ class BaseReader(abc.ABC):
     def is_animation(self) -> bool:
         return False
 
+    @property
+    def threadsafe(self) -> bool:
+        """True if get_image may be called outside of the GUI thread."""
+        return False
+
     @abc.abstractmethod
     def get_pixmap(self) -> QPixmap:
         """Read self.path from disk and return a QPixmap."""
 
-    def get_image(self, size: int) -> QImage:
-        """Read self.path from disk and return a scaled QImage."""
-        pixmap = self.get_pixmap().scaled(
-            size, size, Qt.AspectRatioMode.KeepAspectRatio
-        )
-        return pixmap.toImage()
+    def get_image(self, size: Optional[int] = None, *, upscale: bool = True) -> QImage:
+        """Read self.path from disk and return a QImage scaled to size if given.
+
+        If upscale is False, images smaller than size are not scaled up.
+
+        Raises:
+            ValueError if the reader is not threadsafe and called from another thread.
+        """
+        if not self.threadsafe and not _in_gui_thread():
+            raise ValueError(f"'{self.path}' can only be read in the GUI thread")
+        return _scaled(self.get_pixmap().toImage(), size, upscale)
 
     @classmethod
     @abc.abstractmethod
@@ -70,6 +88,10 @@ class QtReader(BaseReader):
     def is_animation(self) -> bool:
         return self._handler.supportsAnimation()
 
+    @property
+    def threadsafe(self) -> bool:
+        return True
+
     def get_pixmap(self) -> QPixmap:
         """Retrieve the pixmap directly from the image reader."""
         pixmap = QPixmap.fromImageReader(self._handler)
@@ -79,12 +101,22 @@ class QtReader(BaseReader):
             )
         return pixmap
 
-    def get_image(self, size: int) -> QImage:
-        """Retrieve the down-scaled image directly from the image reader."""
+    def get_image(self, size: Optional[int] = None, *, upscale: bool = True) -> QImage:
+        """Retrieve the possibly scaled image directly from the image reader.
+
+        The image is decoded at the scaled size which is much faster than decoding the
+        full image and scaling it afterwards for formats such as jpg.
+        """
         qsize = self._handler.size()
-        qsize.scale(size, size, Qt.AspectRatioMode.KeepAspectRatio)
-        self._handler.setScaledSize(qsize)
-        return self._handler.read()
+        if size is not None and (upscale or max(qsize.width(), qsize.height()) > size):
+            qsize.scale(size, size, Qt.AspectRatioMode.KeepAspectRatio)
+            self._handler.setScaledSize(qsize)
+        image = self._handler.read()
+        if image.isNull():
+            raise ValueError(
+                f"Error reading image '{self.path}': {self._handler.errorString()}"
+            )
+        return image
 
 
 class ExternalReader(BaseReader):
@@ -94,10 +126,44 @@ class ExternalReader(BaseReader):
     def supports(cls, file_format: str) -> bool:
         return file_format in external_handler
 
+    @property
+    def threadsafe(self) -> bool:
+        """True if the format provides a handler to load QImage directly."""
+        return self.file_format in external_image_handler
+
     def get_pixmap(self) -> QPixmap:
         handler = external_handler[self.file_format]
         return handler(self.path)
 
+    def get_image(self, size: Optional[int] = None, *, upscale: bool = True) -> QImage:
+        """Retrieve the image from the image handler of the format if there is one.
+
+        Otherwise the pixmap is loaded and converted to an image in the GUI thread.
+        """
+        handler = external_image_handler.get(self.file_format)
+        if handler is None:
+            return super().get_image(size, upscale=upscale)
+        image = handler(self.path)
+        if image.isNull():
+            raise ValueError(f"Error reading image '{self.path}'")
+        return _scaled(image, size, upscale)
+
+
+def _scaled(image: QImage, size: Optional[int], upscale: bool) -> QImage:
+    """Return image scaled to fit into size if given.
+
+    If upscale is False, images smaller than size are not scaled up.
+    """
+    if size is not None and (upscale or max(image.width(), image.height()) > size):
+        return image.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio)
+    return image
+
+
+def _in_gui_thread() -> bool:
+    """True if called from the thread of the application."""
+    app = QCoreApplication.instance()
+    return app is not None and QThread.currentThread() is app.thread()
+
 
 def get_reader(path: str) -> BaseReader:
     """Retrieve the appropriate image reader class for path."""
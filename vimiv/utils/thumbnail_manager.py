@@ -4,22 +4,37 @@
 
 The ThumbnailManager class uses the Creator classes to create thumbnails for a
 list of paths. When one thumbnail was created, the 'created' signal is emitted
-with the index and the QPixmap of the generated thumbnail for the thumbnail
-widget to update.
+with the index, the path and the QImage of the generated thumbnail for the thumbnail
+widget to update. Only QImage is used by the worker threads, converting to QPixmap for
+display is left to the GUI thread.
+
+Thumbnails are created in the smallest freedesktop size that fits the requested size.
+If the image has a valid thumbnail of a larger size in the cache, the thumbnail is
+scaled down from it instead of reading the image.
+
+Thumbnails of directories that were opened before are read from the memory-mapped
+thumbnail pack of the directory if it is up-to-date, new thumbnails are added to the
+pack once all thumbnails were created.
+
+Images of external formats that can only be read in the GUI thread are read there
+without blocking the worker, the thumbnail is then created from the read image.
+
+Module Attributes:
+    FLAVORS: Dictionary mapping freedesktop size name to the size in ascending order.
 """
 
 import contextlib
 import hashlib
 import os
 import tempfile
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from vimiv.qt.core import QRunnable, Signal, QObject
-from vimiv.qt.gui import QIcon, QPixmap, QImage
+from vimiv.qt.core import Qt, QRunnable, Signal, QObject, QTimer
+from vimiv.qt.gui import QImage
 
 import vimiv
-from vimiv import api
-from vimiv.utils import xdg, imagereader, Pool
+from vimiv import api, utils
+from vimiv.utils import xdg, imagereader, thumbnail_pack, Pool
 
 
 KEY_URI = "Thumb::URI"
@@ -29,6 +44,11 @@ KEY_WIDTH = "Thumb::Image::Width"
 KEY_HEIGHT = "Thumb::Image::Height"
 KEY_SOFTWARE = "Software"
 
+FLAVORS = {"normal": 128, "large": 256, "x-large": 512, "xx-large": 1024}
+
+
+PackedT = Tuple[thumbnail_pack.SourceT, QImage]
+
 
 class ThumbnailManager(QObject):
     """Manager to create thumbnails for the thumbnail widgets asynchronously.
@@ -36,47 +56,156 @@ class ThumbnailManager(QObject):
     Starts the ThumbnailsAsyncCreator class for a list of paths in an extra
     thread.
 
+    Class Attributes:
+        pool: QThreadPool to create thumbnails in.
+        pack_pool: QThreadPool to write thumbnail packs in one after the other.
+        PACK_DELAY: Time in ms to wait for further thumbnails before writing packs.
+
     Attributes:
+        cache_directory: Base directory of the freedesktop thumbnail cache.
         directory: Directory to store generated thumbnails in.
         fail_directory: Directory to store information on failed thumbnails in.
-        fail_pixmap: QPixmap to display when thumbnail generation failed.
+        fail_image: QImage to display when thumbnail generation failed.
+        flavor: Freedesktop name of the size of the created thumbnails.
+        size: Size of the created thumbnails.
 
-        _large: Create large thumbnails.
+        _packs: Dictionary mapping directory to its opened thumbnail pack.
+        _unpacked: Dictionary mapping directory to the thumbnails that are not packed.
+        _pack_timer: QTimer to write the packs once all thumbnails were created.
 
     Signals:
-        created: Emitted with index and pixmap when a thumbnail was created.
+        created: Emitted with index, path and image when a thumbnail was created.
+        stored: Emitted with path, source information and image when a thumbnail was
+            created from the freedesktop cache instead of the thumbnail pack.
+        deferred: Emitted with index, path and thumbnail pack when the image can only
+            be read in the GUI thread.
     """
 
-    created = Signal(int, QIcon)
+    created = Signal(int, str, QImage)
+    stored = Signal(str, object, QImage)
+    deferred = Signal(int, str, object)
     pool = Pool.get(globalinstance=False)
+    pack_pool = Pool.get(globalinstance=False)
+    pack_pool.setMaxThreadCount(1)
+
+    PACK_DELAY = 1000
 
-    def __init__(self, fail_pixmap: QPixmap, large: bool = True):
+    def __init__(self, fail_image: QImage, size: int = FLAVORS["large"]):
         super().__init__()
-        self.large = large
         # Thumbnail creation should take no longer than 1 s
         self.pool.setExpiryTimeout(1000)
 
-        directory = os.path.join(xdg.user_cache_dir(), "thumbnails")
-        self.directory = (
-            os.path.join(directory, "large")
-            if large
-            else os.path.join(directory, "normal")
-        )
+        self.cache_directory = os.path.join(xdg.user_cache_dir(), "thumbnails")
         self.fail_directory = os.path.join(
-            directory, "fail", f"vimiv-{vimiv.__version__}"
+            self.cache_directory, "fail", f"vimiv-{vimiv.__version__}"
         )
-        xdg.makedirs(self.directory, self.fail_directory)
-        self.fail_pixmap = fail_pixmap
+        xdg.makedirs(self.fail_directory)
+        self.fail_image = fail_image
+        self.flavor = self.directory = ""
+        self.size = 0
+        self._packs: Dict[str, thumbnail_pack.ThumbnailPack] = {}
+        self._unpacked: Dict[str, Dict[str, PackedT]] = {}
+        self.set_size(size)
+
+        self._pack_timer = QTimer(self)
+        self._pack_timer.setSingleShot(True)
+        self._pack_timer.setInterval(self.PACK_DELAY)
+        self._pack_timer.timeout.connect(self.write_packs)
+        self.stored.connect(self._on_stored)
+        self.deferred.connect(self._on_deferred)
+
+    def set_size(self, size: int) -> bool:
+        """Create thumbnails in the smallest freedesktop size that fits size.
 
-    def create_thumbnails_async(self, paths: List[str]) -> None:
+        Args:
+            size: Size in device pixels the thumbnails are displayed at.
+        Returns:
+            True if the size of the created thumbnails changed.
+        """
+        flavor = next(
+            (name for name, value in FLAVORS.items() if value >= size), "xx-large"
+        )
+        if flavor == self.flavor:
+            return False
+        self.flavor, self.size = flavor, FLAVORS[flavor]
+        self.directory = os.path.join(self.cache_directory, flavor)
+        xdg.makedirs(self.directory)
+        self._packs = {}
+        self._unpacked = {}
+        return True
+
+    def create_thumbnails_async(
+        self, paths: List[str], indices: Optional[Sequence[int]] = None
+    ) -> None:
         """Start ThumbnailsCreator for each path to create thumbnails.
 
+        Any thumbnails that are still queued from a previous call are discarded.
+
         Args:
             paths: Paths to create thumbnails for.
+            indices: Index of each path in the thumbnail widget. Defaults to the
+                position of the path in paths.
         """
         self.pool.clear()
-        for i, path in enumerate(paths):
-            self.pool.start(ThumbnailCreator(i, path, self))
+        if indices is None:
+            indices = range(len(paths))
+        packs: Dict[str, Optional[thumbnail_pack.ThumbnailPack]] = {}
+        for i, path in zip(indices, paths):
+            directory = os.path.dirname(path)
+            if directory not in packs:
+                packs[directory] = self._get_pack(directory)
+            self.pool.start(ThumbnailCreator(i, path, self, packs[directory]))
+
+    def write_packs(self) -> None:
+        """Add all created thumbnails to the packs of their directory in the background.
+
+        Writing is postponed while thumbnails are still being created.
+        """
+        if self.pool.activeThreadCount():
+            self._pack_timer.start()
+            return
+        for directory, thumbnails in self._unpacked.items():
+            utils.asyncrun(
+                thumbnail_pack.write,
+                directory,
+                self.flavor,
+                thumbnails,
+                pool=self.pack_pool,
+            )
+        self._unpacked = {}
+
+    def _get_pack(self, directory: str) -> Optional[thumbnail_pack.ThumbnailPack]:
+        """Return the up-to-date thumbnail pack of directory if thumbnails are saved."""
+        if not api.settings.thumbnail.save:
+            return None
+        pack = self._packs.get(directory)
+        if pack is None or pack.outdated:
+            pack = self._packs[directory] = thumbnail_pack.ThumbnailPack(
+                directory, self.flavor
+            )
+        return pack
+
+    @utils.slot
+    def _on_stored(self, path: str, source: tuple, image: QImage):
+        """Remember a thumbnail that is not packed and write the packs once done."""
+        if os.path.dirname(source[2]) != self.directory:  # Created in another size
+            return
+        directory = os.path.dirname(path)
+        self._unpacked.setdefault(directory, {})[path] = (source, image)
+        self._pack_timer.start()
+
+    def _on_deferred(self, index: int, path: str, pack):
+        """Read an image in the GUI thread and create its thumbnail in the pool."""
+        try:
+            image = imagereader.get_reader(path).get_image(self.size)
+        except ValueError:
+            self.created.emit(index, path, self.fail_image)
+            return
+        self.pool.start(ThumbnailCreator(index, path, self, pack, image))
+
+
+class _ReadInGuiThread(Exception):
+    """Raised by the worker if the image can only be read in the GUI thread."""
 
 
 class ThumbnailCreator(QRunnable):
@@ -89,28 +218,53 @@ class ThumbnailCreator(QRunnable):
         _index: Index of the thumbnail in the thumbnail widget.
         _path: Path to the original image.
         _manager: The ThumbnailManager object used for callback.
+        _pack: The thumbnail pack of the directory of path if any.
+        _image: The scaled image if it was read in the GUI thread before.
     """
 
-    def __init__(self, index: int, path: str, manager: ThumbnailManager):
+    def __init__(
+        self,
+        index: int,
+        path: str,
+        manager: ThumbnailManager,
+        pack: Optional[thumbnail_pack.ThumbnailPack] = None,
+        image: Optional[QImage] = None,
+    ):
         super().__init__()
         self._index = index
         self._path = path
         self._manager = manager
+        self._pack = pack
+        self._image = image
 
     def run(self) -> None:
         """Create thumbnail and emit the managers created signal."""
         # Do not create thumbnails for thumbnails
-        if os.path.dirname(self._path) == self._manager.directory:
-            self._manager.created.emit(self._index, QIcon(self._path))
+        thumbnail_directory, flavor = os.path.split(os.path.dirname(self._path))
+        if thumbnail_directory == self._manager.cache_directory and flavor in FLAVORS:
+            self._manager.created.emit(self._index, self._path, QImage(self._path))
         else:
             thumbnail_path = self._get_thumbnail_path(self._path)
             with contextlib.suppress(FileNotFoundError):
-                pixmap = (
-                    self._maybe_recreate_thumbnail(self._path, thumbnail_path)
-                    if os.path.exists(thumbnail_path)
-                    else self._create_thumbnail(self._path, thumbnail_path)
-                )
-                self._manager.created.emit(self._index, QIcon(pixmap))
+                stat = os.stat(self._path)
+                if self._pack is not None:
+                    image = self._pack.get(self._path, stat)
+                    if image is not None:
+                        self._manager.created.emit(self._index, self._path, image)
+                        return
+                try:
+                    image = (
+                        self._maybe_recreate_thumbnail(self._path, thumbnail_path)
+                        if os.path.exists(thumbnail_path)
+                        else self._create_thumbnail(self._path, thumbnail_path)
+                    )
+                except _ReadInGuiThread:
+                    self._manager.deferred.emit(self._index, self._path, self._pack)
+                    return
+                self._manager.created.emit(self._index, self._path, image)
+                if self._pack is not None and image is not self._manager.fail_image:
+                    source = (stat.st_mtime_ns, stat.st_size, thumbnail_path)
+                    self._manager.stored.emit(self._path, source, image)
 
     def _get_thumbnail_path(self, path: str) -> str:
         filename = self._get_thumbnail_filename(path)
@@ -146,31 +300,79 @@ class ThumbnailCreator(QRunnable):
         image.save(tmp_filename, format="png")
         os.replace(tmp_filename, thumbnail_path)
 
-    def _create_thumbnail(self, path: str, thumbnail_path: str) -> QPixmap:
+    def _create_thumbnail(self, path: str, thumbnail_path: str) -> QImage:
         """Create thumbnail for an image.
 
         Args:
             path: Path to the image for which the thumbnail is created.
             thumbnail_path: Path to which the thumbnail is stored.
         Returns:
-            The created QPixmap.
+            The created QImage.
+        Raises:
+            _ReadInGuiThread if the image must be read in the GUI thread first.
         """
-        size = 256 if self._manager.large else 128
-        try:
-            reader = imagereader.get_reader(path)
-            image = reader.get_image(size)
-        except ValueError:
-            return self._manager.fail_pixmap
-        # Image was deleted in the time between reader.read() and now
-        try:
-            attributes = self._get_thumbnail_attributes(path, image)
-        except FileNotFoundError:
-            return self._manager.fail_pixmap
-        for key, value in attributes.items():
-            image.setText(key, value)
+        image = self._derive_thumbnail(path)
+        if image is None:
+            try:
+                image = self._read_image(path)
+            except ValueError:
+                return self._manager.fail_image
+            # Image was deleted in the time between reader.read() and now
+            try:
+                attributes = self._get_thumbnail_attributes(path, image)
+            except FileNotFoundError:
+                return self._manager.fail_image
+            for key, value in attributes.items():
+                image.setText(key, value)
         if api.settings.thumbnail.save:
             self._save_thumbnail(image, thumbnail_path)
-        return QPixmap(image)
+        return image
+
+    def _read_image(self, path: str) -> QImage:
+        """Return the image at path scaled to the thumbnail size.
+
+        Raises:
+            _ReadInGuiThread if the image must be read in the GUI thread first.
+        """
+        if self._image is not None:
+            return self._image
+        reader = imagereader.get_reader(path)
+        if not reader.threadsafe:
+            raise _ReadInGuiThread()
+        return reader.get_image(self._manager.size)
+
+    def _derive_thumbnail(self, path: str) -> Optional[QImage]:
+        """Scale a valid thumbnail of a larger size in the cache if there is one.
+
+        As when reading the image, the thumbnail is scaled to fit the size exactly.
+
+        Args:
+            path: Path to the image for which the thumbnail is created.
+        Returns:
+            The scaled QImage or None if there is no valid larger thumbnail.
+        """
+        path_mtime = str(self._get_source_mtime(path))
+        filename = self._get_thumbnail_filename(path)
+        size = self._manager.size
+        for flavor in (name for name, value in FLAVORS.items() if value > size):
+            thumbnail_path = os.path.join(
+                self._manager.cache_directory, flavor, filename
+            )
+            larger = QImage(thumbnail_path)
+            if larger.isNull() or larger.text(KEY_MTIME) != path_mtime:
+                continue
+            image = larger
+            if max(larger.width(), larger.height()) != size:
+                image = larger.scaled(
+                    size,
+                    size,
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation,
+                )
+            for key in larger.textKeys():
+                image.setText(key, larger.text(key))
+            return image
+        return None
 
     def _get_thumbnail_attributes(self, path: str, image: QImage) -> Dict[str, str]:
         """Return a dictionary filled with thumbnail attributes.
@@ -190,18 +392,18 @@ class ThumbnailCreator(QRunnable):
             KEY_SOFTWARE: f"vimiv-{vimiv.__version__}",
         }
 
-    def _maybe_recreate_thumbnail(self, path: str, thumbnail_path: str) -> QPixmap:
+    def _maybe_recreate_thumbnail(self, path: str, thumbnail_path: str) -> QImage:
         """Recreate thumbnail if image has been changed since creation.
 
         Args:
             path: Path to the image for which the thumbnail is created.
             thumbnail_path: Path to which the thumbnail is stored.
         Returns:
-            The created QPixmap.
+            The created QImage.
         """
         path_mtime = str(int(os.path.getmtime(path)))
         image = QImage(thumbnail_path)
         thumb_mtime = image.text(KEY_MTIME)
         if path_mtime == thumb_mtime:
-            return QPixmap(image)
+            return image
         return self._create_thumbnail(path, thumbnail_path)
@@ -0,0 +1,240 @@
+# vim: ft=python fileencoding=utf-8 sw=4 et sts=4
+
+"""Memory-mapped pack of the decoded thumbnails of one directory.
+
+Reading and decoding the png files of the freedesktop thumbnail cache dominates the time
+to display the thumbnails of a large directory that was opened before. The pack stores
+the decoded pixels of all thumbnails of one directory in a single file in the vimiv
+cache directory. The file is memory-mapped when it is opened, so loading a thumbnail only
+copies its pixel data.
+
+The freedesktop cache remains the source of truth. Thumbnails are only packed once they
+are stored in the freedesktop cache and an entry is only used if the image did not change
+since the entry was packed. Validating an entry therefore only requires the stat of the
+image, the freedesktop thumbnail is not touched. Outdated entries are dropped when the
+pack is written again.
+
+The file starts with a header packed as ``HEADER``, containing magic, version and length
+of the index. The index is a json object mapping the basename of every image to its
+entry, the pixel data of all entries follows the index.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from typing import BinaryIO, Dict, Iterator, Optional, Tuple
+
+from vimiv import qt
+from vimiv.qt.gui import QImage
+
+from vimiv.utils import log, xdg
+
+
+_logger = log.module_logger(__name__)
+
+# Modification time in ns and size of the image, offset of the pixel data, width, height,
+# bytes per line, format
+EntryT = Tuple[int, int, int, int, int, int, int]
+# Modification time in ns and size of the image, path to the freedesktop thumbnail
+SourceT = Tuple[int, int, str]
+
+MAGIC = b"VIMIVTPK"
+VERSION = 2
+HEADER = struct.Struct("<8sII")
+
+_FORMATS = (
+    QImage.Format.Format_RGB32,
+    QImage.Format.Format_ARGB32,
+    QImage.Format.Format_ARGB32_Premultiplied,
+)
+
+
+class ThumbnailPack:
+    """Memory-mapped pack of the decoded thumbnails of one directory.
+
+    The pack is only read after it was opened, so entries may be retrieved from any
+    thread.
+
+    Attributes:
+        directory: The directory the thumbnails belong to.
+        filename: Path to the pack file in the vimiv cache directory.
+
+        _data: Memory map of the pack file.
+        _entries: Dictionary mapping basename of the image to its entry.
+        _offset: Offset of the pixel data in the pack file.
+        _version: Modification time in ns and size of the pack file when it was opened.
+    """
+
+    def __init__(self, directory: str, flavor: str):
+        self.directory = directory
+        self.filename = pack_file(directory, flavor)
+        self._data: Optional[mmap.mmap] = None
+        self._entries: Dict[str, EntryT] = {}
+        self._offset = 0
+        self._version: Optional[Tuple[int, int]] = None
+        try:
+            self._open()
+        except (OSError, ValueError, KeyError, TypeError, struct.error) as e:
+            _logger.debug("Cannot open thumbnail pack of '%s': %s", directory, e)
+            self._data, self._entries = None, {}
+
+    @property
+    def outdated(self) -> bool:
+        """True if the pack file was written since this pack was opened."""
+        return _stat(self.filename) != self._version
+
+    def get(self, path: str, stat: os.stat_result) -> Optional[QImage]:
+        """Return the packed thumbnail of path or None if it is not packed or outdated.
+
+        Args:
+            path: Path to the original image.
+            stat: Result of stat on the original image.
+        """
+        entry = self._entries.get(os.path.basename(path))
+        if entry is None or self._data is None:
+            return None
+        mtime, size, offset, width, height, bytes_per_line, fmt = entry
+        if (mtime, size) != (stat.st_mtime_ns, stat.st_size):
+            return None
+        start = self._offset + offset
+        with memoryview(self._data)[start : start + bytes_per_line * height] as data:
+            return QImage(data, width, height, bytes_per_line, _FORMATS[fmt]).copy()
+
+    def _open(self) -> None:
+        """Memory-map the pack file and read the index."""
+        self._version = _stat(self.filename)
+        with open(self.filename, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, length = HEADER.unpack_from(self._data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"unsupported pack version {version}")
+        index = json.loads(self._data[HEADER.size : HEADER.size + length])
+        if index["directory"] != self.directory:
+            raise ValueError(f"pack belongs to '{index['directory']}'")
+        self._offset = HEADER.size + length
+        self._entries = {name: tuple(entry) for name, entry in index["entries"].items()}
+        for name, entry in self._entries.items():
+            _validate(name, entry, len(self._data) - self._offset)
+        _logger.debug("Opened %d packed thumbnails of '%s'", len(self), self.directory)
+
+    def items(self) -> Iterator[Tuple[str, EntryT]]:
+        """Iterate over basename and entry of all packed thumbnails."""
+        yield from self._entries.items()
+
+    def copy_data(self, entry: EntryT, f: BinaryIO) -> None:
+        """Write the pixel data of entry to the file object f without copying it."""
+        assert self._data is not None, "Entries require an opened pack"
+        start = self._offset + entry[2]
+        with memoryview(self._data)[start : start + entry[4] * entry[5]] as data:
+            f.write(data)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def write(
+    directory: str, flavor: str, thumbnails: Dict[str, Tuple[SourceT, QImage]]
+) -> None:
+    """Write the pack file of a directory atomically.
+
+    The pack contains all entries of the current pack file whose image did not change
+    and all new thumbnails that are stored in the freedesktop cache. The index is
+    computed first, the pixel data of the current entries is then streamed from the
+    memory map to the new file so it is never held in memory.
+
+    Args:
+        directory: The directory the thumbnails belong to.
+        flavor: Freedesktop size name of the thumbnails, e.g. large.
+        thumbnails: Dictionary mapping path to the source information and the image of
+            new thumbnails.
+    """
+    pack = ThumbnailPack(directory, flavor)
+    entries: Dict[str, EntryT] = {}
+    kept: Dict[str, EntryT] = {}
+    images: Dict[str, QImage] = {}
+    offset = 0
+    for name, entry in pack.items():
+        path = os.path.join(pack.directory, name)
+        if path not in thumbnails and _stat(path) == entry[:2]:
+            kept[name] = entry
+            entries[name] = (*entry[:2], offset, *entry[3:])
+            offset += entry[4] * entry[5]
+    for path, ((mtime, size, thumbnail_path), image) in thumbnails.items():
+        if _stat(path) != (mtime, size) or _stat(thumbnail_path) is None:
+            continue  # Changed in the meantime or not in the freedesktop cache
+        if image.format() not in _FORMATS:
+            image = image.convertToFormat(QImage.Format.Format_ARGB32)
+        name = os.path.basename(path)
+        images[name] = image
+        entries[name] = (
+            mtime,
+            size,
+            offset,
+            image.width(),
+            image.height(),
+            image.bytesPerLine(),
+            _FORMATS.index(image.format()),
+        )
+        offset += image.bytesPerLine() * image.height()
+    index = json.dumps({"directory": pack.directory, "entries": entries}).encode()
+    try:
+        xdg.makedirs(os.path.dirname(pack.filename))
+        handle, tmpfile = tempfile.mkstemp(dir=os.path.dirname(pack.filename))
+        with os.fdopen(handle, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(index)))
+            f.write(index)
+            for name in entries:
+                if name in images:
+                    f.write(_image_bytes(images[name]))
+                else:
+                    pack.copy_data(kept[name], f)
+        os.replace(tmpfile, pack.filename)
+        _logger.debug("Packed %d thumbnails of '%s'", len(entries), pack.directory)
+    except OSError as e:
+        _logger.debug("Cannot store thumbnail pack of '%s': %s", pack.directory, e)
+
+
+def _validate(name: str, entry: EntryT, size: int) -> None:
+    """Raise ValueError if entry does not describe valid pixel data within size bytes."""
+    if len(entry) != 7 or not all(isinstance(value, int) for value in entry):
+        raise ValueError(f"invalid entry for '{name}'")
+    _, _, offset, width, height, bytes_per_line, fmt = entry
+    if (
+        not 0 <= fmt < len(_FORMATS)
+        or width <= 0
+        or height <= 0
+        or bytes_per_line < width * 4
+        or offset < 0
+        or offset + bytes_per_line * height > size
+    ):
+        raise ValueError(f"invalid entry for '{name}'")
+
+
+def pack_file(directory: str, flavor: str) -> str:
+    """Return the path to the pack file of the thumbnails of directory in flavor."""
+    name = hashlib.md5(directory.encode()).hexdigest()
+    return xdg.vimiv_cache_dir("thumbnails", f"{name}-{flavor}.pack")
+
+
+def _stat(path: str) -> Optional[Tuple[int, int]]:
+    """Return modification time in ns and size of path or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _image_bytes(image: QImage) -> bytes:
+    """Return a copy of the pixel data of image."""
+    bits = image.constBits()
+    if qt.USE_PYSIDE6:
+        return bytes(bits)
+    if qt.USE_PYQT6:
+        bits.setsize(image.sizeInBytes())
+    else:
+        bits.setsize(image.byteCount())
+    return bits.asstring()